@@ -52,6 +52,8 @@ INSTALLED_APPS = [
     "reviews",
     "site_settings",
     "payments",
+    "uploads",
+    "notifications",
 ]
     
 
@@ -92,10 +94,37 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # SQLite row lock (select_for_update) nahi deta: transaction shuru hote hi write lock lein,
+        # warna do bookings ek saath padh kar likhne par 'database is locked' deti hain.
+        # Postgres par yeh option nahi chahiye - wahan booking property row lock karti hai.
+        "OPTIONS": {"transaction_mode": "IMMEDIATE"},
     }
 }
 
 
+# Cache (reference data jaise categories/destinations isi mein rehte hain)
+# Production mein kai workers hon to REDIS_URL dein (shared cache, 'redis' package chahiye),
+# warna har process ka apna local-memory cache hota hai
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Image derivatives (thumbnails/WebP) banane wale background threads (properties/imaging.py)
+IMAGE_DERIVATIVE_WORKERS = config('IMAGE_DERIVATIVE_WORKERS', default=2, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -152,13 +181,21 @@ REST_FRAMEWORK = {
 
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-EMAIL_HOST = 'smtp.gmail.com'
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
+# Local SMTP stand-in ke liye: EMAIL_HOST=127.0.0.1 EMAIL_PORT=1025 EMAIL_USE_TLS=False (run_smtp_sink)
+EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
+EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 
 DEFAULT_FROM_EMAIL = 'no-reply@farmstay.com'
+# Emails 'send_outbox' worker bhejta hai (request nahi) - atka SMTP worker ko bhi hamesha na roke
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=30, cast=int)
+
+# Pending booking ka hold (minutes): itni der mein online payment / cash booking par vendor ka
+# confirm na aaye to 'expire_booking_holds' booking cancel karke raatein khol deta hai
+BOOKING_HOLD_MINUTES_ONLINE = config('BOOKING_HOLD_MINUTES_ONLINE', default=30, cast=int)
+BOOKING_HOLD_MINUTES_CASH = config('BOOKING_HOLD_MINUTES_CASH', default=48 * 60, cast=int)
 
 # --- SIMPLE JWT Custom Settings ---
 SIMPLE_JWT = {
@@ -173,6 +210,11 @@ SIMPLE_JWT = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Resumable uploads (uploads app): adhoori files yahaan banti hain (MEDIA_ROOT ke bahar,
+# taaki serve na hon) aur har chunk itne bytes ka hota hai (aakhri chhota ho sakta hai)
+UPLOAD_TEMP_DIR = config('UPLOAD_TEMP_DIR', default=str(BASE_DIR / 'upload_parts'))
+UPLOAD_CHUNK_SIZE = config('UPLOAD_CHUNK_SIZE', default=4 * 1024 * 1024, cast=int)
+
 
 '''
     # Razorpay Keys
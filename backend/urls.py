@@ -54,6 +54,9 @@ urlpatterns = [
 
     path('payments/', include('payments.urls')),
 
+    # Resumable (chunked) file uploads
+    path('uploads/', include('uploads.urls')),
+
     # --- SWAGGER URLs ---
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     # Swagger UI:
@@ -11,7 +11,8 @@ class BookingAdmin(admin.ModelAdmin):
         'check_in_date', 
         'check_out_date', 
         'status', 
-        'total_price'
+        'total_price',
+        'hold_expires_at'
     )
     
     # For Filter
@@ -0,0 +1,93 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from payments.models import Payment
+from properties import availability
+from .models import Booking, BookedNight
+
+# Pending booking ka hold: booking bante hi hold_expires_at lagta hai (online payment ka
+# intezaar ya cash booking par vendor ka confirm). Waqt nikal gaya aur booking abhi bhi
+# pending hai to 'expire_booking_holds' use bulk mein cancel karta hai.
+# Sweeper per-row save() nahi karta: (status, hold_expires_at) index par range se ek batch
+# ki ids, fir usi transaction mein teen bulk statements - bookings cancel, unki BookedNight
+# rows delete (raatein dobara bookable), pending payments cancel. queryset.update()
+# Booking.save() aur signals ko bypass karta hai, isliye raatein aur calendar versions
+# (properties/availability.py) yahin khud sambhale jate hain.
+# Hold field aane se pehle ki (ya admin ki wapas pending ki hui) bookings ka hold NULL hai -
+# har sweep pehle unhe booked_at + hold_duration se bhar deta hai, fir wahi niyam lagta hai.
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def hold_duration(payment_method):
+    if payment_method == Booking.PaymentMethod.ONLINE:
+        return timedelta(minutes=settings.BOOKING_HOLD_MINUTES_ONLINE)
+    return timedelta(minutes=settings.BOOKING_HOLD_MINUTES_CASH)
+
+
+def hold_expiry(payment_method, now=None):
+    return (now or timezone.now()) + hold_duration(payment_method)
+
+
+def backfill_holds():
+    """
+    Pending bookings jinka hold NULL hai -> booked_at + hold_duration (payment method ke hisaab se).
+    Return bhari gayi rows.
+    """
+    filled = 0
+    pending = Booking.objects.filter(status=Booking.BookingStatus.PENDING, hold_expires_at__isnull=True)
+    for payment_method in Booking.PaymentMethod.values:
+        filled += pending.filter(payment_method=payment_method).update(
+            hold_expires_at=F('booked_at') + hold_duration(payment_method),
+        )
+    return filled
+
+
+def expire_batch(now, batch_size=BATCH_SIZE):
+    """
+    Sabse purane (batch_size tak) expired holds cancel. Return (bookings, payments).
+    """
+    with transaction.atomic():
+        # skip_locked: jis booking ko abhi koi aur (jaise vendor confirm) badal raha hai use chhod dein
+        rows = list(
+            Booking.objects.select_for_update(skip_locked=True)
+            .filter(status=Booking.BookingStatus.PENDING, hold_expires_at__lte=now)
+            .order_by('hold_expires_at')
+            .values_list('pk', 'property_id')[:batch_size]
+        )
+        if not rows:
+            return 0, 0
+        ids = [pk for pk, _ in rows]
+        bookings = Booking.objects.filter(pk__in=ids, status=Booking.BookingStatus.PENDING).update(
+            status=Booking.BookingStatus.CANCELLED,
+        )
+        BookedNight.objects.filter(booking_id__in=ids).delete()
+        payments = Payment.objects.filter(booking_id__in=ids, status=Payment.PaymentStatus.PENDING).update(
+            status=Payment.PaymentStatus.CANCELLED, updated_at=timezone.now(),
+        )
+        availability.bump_versions([property_id for _, property_id in rows])
+    return bookings, payments
+
+
+def expire_holds(now=None, batch_size=BATCH_SIZE):
+    """
+    Saare expired holds, batch-dar-batch (har batch alag chhota transaction).
+    Return (bookings cancelled, payments cancelled).
+    """
+    now = now or timezone.now()
+    backfill_holds()
+    total_bookings = total_payments = 0
+    while True:
+        bookings, payments = expire_batch(now, batch_size)
+        if not bookings:
+            break
+        total_bookings += bookings
+        total_payments += payments
+    if total_bookings:
+        logger.info('Expired %s booking holds (%s pending payments cancelled)', total_bookings, total_payments)
+    return total_bookings, total_payments
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from bookings.holds import BATCH_SIZE, expire_holds
+
+
+class Command(BaseCommand):
+    """
+    Jin pending bookings ka hold (hold_expires_at) nikal gaya unhe cancel karta hai - raatein
+    khul jati hain aur pending payments cancel. Cron se har minute chalayein.
+    Usage: python manage.py expire_booking_holds [--batch-size 500]
+    """
+    help = "Cancel pending bookings whose hold has expired and release their nights."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        bookings, payments = expire_holds(batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {bookings} booking holds, cancelled {payments} pending payments."
+        ))
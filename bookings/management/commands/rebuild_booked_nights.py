@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from bookings.models import Booking
+from bookings.nights import rebuild_booked_nights
+
+
+class Command(BaseCommand):
+    """
+    BookedNight (occupancy index) ko bookings table se dobara banata hai. Aapas mein takraati
+    active bookings (purana data) index se bahar rehti hain aur unki list print hoti hai.
+    Usage: python manage.py rebuild_booked_nights [--property <property-slug> ...]
+    """
+    help = "Rebuild the per-night occupancy index from pending and confirmed bookings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--property',
+            action='append',
+            dest='slugs',
+            help='Sirf in properties ki bookings (kai baar de sakte hain).',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Booking.objects.all()
+        if options['slugs']:
+            queryset = queryset.filter(property__slug__in=options['slugs'])
+
+        written, conflicts = rebuild_booked_nights(queryset)
+        for booking_id, other_id, night in conflicts:
+            self.stdout.write(self.style.WARNING(
+                f"  booking {booking_id} skipped: {night} is already taken by booking {other_id}"
+            ))
+        self.stdout.write(self.style.SUCCESS(f"Occupancy index rebuilt: {written} booked nights."))
+        if conflicts:
+            self.stdout.write(self.style.ERROR(
+                f"{len(conflicts)} overlapping active bookings were left out of the index - "
+                f"cancel or move them and run this command again."
+            ))
@@ -0,0 +1,153 @@
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+from types import SimpleNamespace
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from bookings.models import Booking
+from bookings.nights import ACTIVE_STATUSES
+from bookings.serializers import BookingCreateSerializer
+from properties.models import Property
+from users.models import CustomUser
+
+
+class StressBookingCreateSerializer(BookingCreateSerializer):
+    """
+    Asli create path, bas admin/vendor notifications nahi - test bookings ke emails/digests
+    outbox mein jaate to worker asli vendors ko hat chuki bookings ke baare mein likhta.
+    """
+    def queue_notifications(self, booking, user):
+        pass
+
+
+class Command(BaseCommand):
+    """
+    Kai threads ek saath ek hi (ya kuch) properties ki milti-julti raatein book karte hain -
+    asli BookingCreateSerializer path se (notifications ke bina) - aur aakhir mein jaanchta hai ki koi raat do
+    active bookings mein na ho. Test/staging DB par chalayein: temporary guest users banata
+    hai aur end mein unhe (unki bookings samet) hata deta hai, '--keep' na ho to.
+    Usage: python manage.py stress_test_bookings --property <slug> [--property <slug> ...]
+           [--threads 16] [--requests 400] [--start 2027-01-01] [--days 30]
+    """
+    help = "Fire concurrent booking requests at properties and verify no night is double booked."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--property', action='append', dest='slugs', required=True,
+                            help='Approved property ka slug (kai baar de sakte hain).')
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=400, help='Kul booking requests (sab threads milakar).')
+        parser.add_argument('--start', help='Window ki pehli raat (YYYY-MM-DD); default ek saal baad.')
+        parser.add_argument('--days', type=int, default=30, help='Window kitni raaton ki (chhoti = zyada takraav).')
+        parser.add_argument('--keep', action='store_true', help='Bani bookings aur test users na hatayein.')
+
+    def handle(self, *args, **options):
+        properties = list(Property.objects.filter(
+            slug__in=options['slugs'], status=Property.PropertyStatus.APPROVED,
+        ).values('slug', 'max_guests'))
+        if len(properties) != len(set(options['slugs'])):
+            raise CommandError('Every --property must be the slug of an approved property.')
+
+        start = parse_date(options['start']) if options['start'] else timezone.localdate() + timedelta(days=365)
+        if start is None:
+            raise CommandError('--start must be YYYY-MM-DD.')
+        threads = max(1, options['threads'])
+        window = max(1, options['days'])
+
+        run = uuid.uuid4().hex[:8]
+        guests = [
+            CustomUser.objects.create_user(
+                f'stress-{run}-{number}@example.invalid', None,
+                first_name='Stress', last_name=str(number),
+                phone_number=f'stress-{run}-{number}', role='guest', status='active',
+            )
+            for number in range(threads)
+        ]
+
+        outcomes = Counter()
+        errors = Counter()
+        lock = threading.Lock()
+        barrier = threading.Barrier(threads)
+        per_thread = [options['requests'] // threads + (number < options['requests'] % threads) for number in range(threads)]
+
+        def worker(guest, count):
+            request = SimpleNamespace(user=guest)
+            rng = random.Random()
+            try:
+                barrier.wait()
+                for _ in range(count):
+                    target = rng.choice(properties)
+                    check_in = start + timedelta(days=rng.randrange(window))
+                    data = {
+                        'property_slug': str(target['slug']),
+                        'check_in_date': check_in,
+                        'check_out_date': check_in + timedelta(days=rng.randint(1, 4)),
+                        'guests_count': 1,
+                        'payment_method': Booking.PaymentMethod.AT_PROPERTY,
+                    }
+                    serializer = StressBookingCreateSerializer(data=data, context={'request': request})
+                    try:
+                        serializer.is_valid(raise_exception=True)
+                        serializer.save()
+                        result = 'created'
+                    except ValidationError:
+                        result = 'rejected'
+                    except Exception as error:
+                        result = 'error'
+                        with lock:
+                            errors[f'{type(error).__name__}: {error}'] += 1
+                    with lock:
+                        outcomes[result] += 1
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker, args=(guest, count)) for guest, count in zip(guests, per_thread)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        overlaps = self.find_overlaps([item['slug'] for item in properties], start, start + timedelta(days=window + 5))
+
+        self.stdout.write(
+            f"{sum(outcomes.values())} requests in {elapsed:.2f}s ({sum(outcomes.values()) / elapsed:.0f}/s) "
+            f"from {threads} threads: {outcomes['created']} created, {outcomes['rejected']} rejected (dates taken), "
+            f"{outcomes['error']} errors."
+        )
+        for message, count in errors.most_common(5):
+            self.stdout.write(self.style.WARNING(f"  {count} x {message}"))
+
+        if not options['keep']:
+            # Users ke saath unki bookings, payments aur booked nights bhi CASCADE se
+            CustomUser.objects.filter(pk__in=[guest.pk for guest in guests]).delete()
+
+        if overlaps:
+            for booking, other in overlaps[:10]:
+                self.stdout.write(self.style.ERROR(f"  overlap: {booking} <-> {other}"))
+            raise CommandError(f"{len(overlaps)} overlapping active bookings found.")
+        self.stdout.write(self.style.SUCCESS("No night is booked twice."))
+
+    def find_overlaps(self, slugs, start, end):
+        """
+        Har property ki active bookings check_in ke kram mein - agli booking pichhli ke
+        check_out se pehle shuru ho to overlap.
+        """
+        overlaps = []
+        bookings = Booking.objects.filter(
+            property__slug__in=slugs, status__in=ACTIVE_STATUSES,
+            check_in_date__lt=end, check_out_date__gt=start,
+        ).order_by('property_id', 'check_in_date').values_list('property_id', 'check_in_date', 'check_out_date')
+        previous = None
+        for row in bookings:
+            if previous is not None and previous[0] == row[0] and row[1] < previous[2]:
+                overlaps.append((previous, row))
+            if previous is None or previous[0] != row[0] or row[2] > previous[2]:
+                previous = row
+        return overlaps
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings # For CustomUser
 from properties.models import Property # To link to the Property model
 import uuid
@@ -64,9 +64,85 @@ class Booking(models.Model):
     # --- Timestamp ---
     booked_at = models.DateTimeField(auto_now_add=True)
 
+    # Pending booking raatein sirf is waqt tak rokti hai - payment/confirm na hua to
+    # 'expire_booking_holds' ise cancel karke raatein chhod deta hai (bookings/holds.py)
+    hold_expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # Sweeper ki query: status='pending' AND hold_expires_at <= now
+        indexes = [
+            models.Index(fields=['status', 'hold_expires_at'], name='booking_hold_expiry_idx'),
+        ]
+
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Load hui state yaad rakhein, taaki save par nights sirf badlaav hone par hi dobara likhein (bookings/nights.py)
+        instance._loaded_nights_state = instance.nights_state()
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Booking aur uski raatein (BookedNight) ek hi transaction mein likhi jati hain.
+        Koi raat pehle se kisi aur active booking ki ho to BookedNight ka unique constraint
+        IntegrityError deta hai aur booking ka badlaav bhi wapas ho jata hai.
+        """
+        # nights.py is module ko import karta hai, isliye yahaan andar import
+        from .nights import sync_booking_nights
+
+        state = self.nights_state()
+        changed = self._state.adding or getattr(self, '_loaded_nights_state', None) != state
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if changed:
+                sync_booking_nights(self)
+        # Agli baar save hone par yahi 'purani' state hogi
+        self._loaded_nights_state = state
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        # DB se nayi state aayi - save() ka farq isi se nikalna hai
+        self._loaded_nights_state = self.nights_state()
+
+    def nights_state(self):
+        """
+        Woh fields jinse booking ki occupied nights tay hoti hain.
+        """
+        return (self.property_id, self.check_in_date, self.check_out_date, self.status)
+
+    def __str__(self):
+        return f"Booking for {self.property.title} by {self.user.email}"
+
+
+# Model 2: BOOKED NIGHT
+# Occupancy index: har pending/confirmed booking ki har raat ki ek row (check_out wali raat nahi).
+# (property, date) unique hai - ek raat do active bookings mein ho hi nahi sakti, chahe
+# application ka check kuch bhi chook jaye. Booking create ka conflict check, search ka
+# availability filter aur calendar isi table par (property, date) lookups karte hain.
+# Yeh rows Booking.save() likhta hai, haath se edit na karein
+# ('rebuild_booked_nights' command inhe dobara bana deta hai).
+class BookedNight(models.Model):
+    booking = models.ForeignKey(
+        Booking,
+        on_delete=models.CASCADE,
+        related_name='nights'
+    )
+    property = models.ForeignKey(
+        Property,
+        on_delete=models.CASCADE,
+        related_name='booked_nights'
+    )
+    date = models.DateField()
+
     class Meta:
-        # Prevents a user from double-booking the same property on the same dates
-        unique_together = ('property', 'check_in_date', 'check_out_date')
+        constraints = [
+            models.UniqueConstraint(fields=['property', 'date'], name='booked_night_unique_night'),
+        ]
+        # 'is date range mein kaun si properties booked hain' - date se range seek, property index mein hi
+        indexes = [
+            models.Index(fields=['date', 'property'], name='booked_night_date_idx'),
+        ]
 
     def __str__(self):
-        return f"Booking for {self.property.title} by {self.user.email}"
\ No newline at end of file
+        return f"{self.property_id} booked on {self.date}"
\ No newline at end of file
@@ -0,0 +1,97 @@
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Case, When
+from .models import Booking, BookedNight
+
+# Booking -> BookedNight (occupancy index) sync.
+# Sirf pending/confirmed bookings raatein gherti hain; cancel/complete hote hi
+# unki rows hat jati hain. Booking.save() isey apne transaction ke andar call karta hai.
+
+ACTIVE_STATUSES = (Booking.BookingStatus.PENDING, Booking.BookingStatus.CONFIRMED)
+
+
+def stay_nights(check_in, check_out):
+    """
+    check_in se check_out se pehle tak ki har raat (check_out wali raat shaamil nahi).
+    """
+    for offset in range((check_out - check_in).days):
+        yield check_in + timedelta(days=offset)
+
+
+def nights_taken(property_id, check_in, check_out):
+    """
+    [check_in, check_out) ki koi raat kisi active booking ki hai? (property, date) unique index
+    par seedha lookup - utni hi rows jitni raatein, poori bookings table nahi.
+    """
+    return BookedNight.objects.filter(property_id=property_id, date__gte=check_in, date__lt=check_out).exists()
+
+
+def booking_nights(booking):
+    if booking.status not in ACTIVE_STATUSES:
+        return []
+    return [
+        BookedNight(booking=booking, property_id=booking.property_id, date=night)
+        for night in stay_nights(booking.check_in_date, booking.check_out_date)
+    ]
+
+
+def sync_booking_nights(booking):
+    """
+    Ek booking ki nights dobara likhta hai (purani rows delete, nayi bulk insert).
+    """
+    with transaction.atomic():
+        BookedNight.objects.filter(booking=booking).delete()
+        BookedNight.objects.bulk_create(booking_nights(booking))
+
+
+def rebuild_booked_nights(queryset=None):
+    """
+    Poora index (ya diye gaye bookings ka) shuru se banata hai.
+    Purane data mein do active bookings ek raat share kar sakti hain (pehle wala overlap check
+    chook jata tha) - unique constraint par poora rebuild rollback na ho, isliye insert se
+    pehle har property ki raatein yahin baant di jati hain: confirmed pehle, fir jo pehle
+    book hui. Jis booking ki koi raat pehle hi kisi aur ki ho, uski koi raat nahi likhi jati
+    aur woh conflicts mein lautti hai (admin use cancel/shift kare, fir dobara rebuild).
+    Return (likhi gayi raatein, [(booking id, takraane wali booking id, date), ...]).
+    """
+    if queryset is None:
+        queryset = Booking.objects.all()
+
+    written = 0
+    conflicts = []
+    with transaction.atomic():
+        # Cancelled/completed bookings ki bachi hui rows bhi hat jayein
+        BookedNight.objects.filter(booking__in=queryset.values('pk')).delete()
+
+        # Queryset ke bahar ki bookings ki raatein (partial rebuild) pehle se li hui hain
+        taken = {}
+        for booking_id, property_id, night in BookedNight.objects.filter(
+            property_id__in=queryset.values('property_id')
+        ).values_list('booking_id', 'property_id', 'date').iterator():
+            taken.setdefault(property_id, {})[night] = booking_id
+
+        active = (
+            queryset.filter(status__in=ACTIVE_STATUSES)
+            .annotate(confirmed_first=Case(When(status=Booking.BookingStatus.CONFIRMED, then=0), default=1))
+            .order_by('property_id', 'confirmed_first', 'booked_at', 'pk')
+            .only('pk', 'property_id', 'check_in_date', 'check_out_date', 'status')
+        )
+        batch = []
+        current_property, claimed = None, {}
+        for booking in active.iterator():
+            if booking.property_id != current_property:
+                # Ek waqt mein ek hi property ki raatein memory mein
+                current_property = booking.property_id
+                claimed = taken.pop(current_property, {})
+            nights = booking_nights(booking)
+            clash = next((night for night in nights if night.date in claimed), None)
+            if clash is not None:
+                conflicts.append((booking.pk, claimed[clash.date], clash.date))
+                continue
+            claimed.update((night.date, booking.pk) for night in nights)
+            batch.extend(nights)
+            if len(batch) >= 1000:
+                written += len(BookedNight.objects.bulk_create(batch))
+                batch = []
+        written += len(BookedNight.objects.bulk_create(batch))
+    return written, conflicts
@@ -1,9 +1,16 @@
+from decouple import config
+from django.db import IntegrityError, transaction
 from rest_framework import serializers, filters
 from .models import Booking
+from . import holds
+from .nights import nights_taken
+from properties import pricing
 from properties.models import Property
 from properties.serializers import PropertyListSerializer
 from users.serializers import UserProfileSerializer
 from payments.models import Payment
+from notifications import digests, outbox
+from site_settings.models import SiteSettings
 
 class BookingCreateSerializer(serializers.ModelSerializer):
     ''' 
@@ -36,80 +43,110 @@ class BookingCreateSerializer(serializers.ModelSerializer):
         if data['check_in_date'] >= data['check_out_date']:
             raise serializers.ValidationError("check-out date must be after check-in date.") 
         
-        # 3. Checking for Availabilty avoid two booking for same property
-        existing_bookings = Booking.objects.filter(
-            property=property_obj,
-            status__in= ['pending','confirmed'],
-            check_in_date__lt=data['check_out_date'],
-            check_out_date__gt=data['check_out_date']        
-            ).exists()
-        
-        if existing_bookings:
-            raise serializers.ValidationError("These dates are not available for this property.")
-        
-        # 4. Cheacking for BlackOut dates 
-        blackout = property_obj.blackout_dates.filter(
-            date__range=[data['check_in_date'], data['check_out_date']]
-        ).exists()
-            
-        if blackout:
-            raise serializers.ValidationError("Booking is not avalibale for the Selected Dates ")
+        # 3. Raatein khaali hain ya nahi - yeh check 'create' mein property ke lock ke andar hota hai,
+        #    warna do requests ek saath check pass karke same raatein book kar leti hain
 
-        total_nights = (data['check_out_date'] - data['check_in_date']).days
-        base_price = property_obj.base_price * total_nights
-        cleaning_fee = property_obj.cleaning_fee or 0
-        service_fee_percent = property_obj.service_fee_percent or 0
-        service_fee = (base_price * service_fee_percent) / 100
-        total_price = base_price+cleaning_fee+service_fee
+        # 4. Daam - wahi engine jo quote endpoint chalata hai (weekend raatein, extra guests, fees)
+        try:
+            quote = pricing.quote(
+                pricing.Rates.from_values(property_obj),
+                data['check_in_date'], data['check_out_date'], data['guests_count'],
+            )
+        except pricing.PricingError as error:
+            raise serializers.ValidationError(str(error))
 
         # Data ko 'create' method ke liye save karein
         data['property'] = property_obj
-        data['total_nights'] = total_nights
-        data['price_per_night'] = property_obj.base_price
-        data['cleaning_fee'] = cleaning_fee
-        data['service_fee'] = service_fee
-        data['total_price'] = total_price
+        data['total_nights'] = quote['nights']
+        # Raaton ke daam alag ho sakte hain - yahan average (total mein poora hisaab hai)
+        data['price_per_night'] = quote['average_nightly']
+        data['cleaning_fee'] = quote['cleaning_fee']
+        data['service_fee'] = quote['service_fee']
+        data['total_price'] = quote['total']
         
         return data
     
+    def check_available(self, property_obj, check_in, check_out):
+        """
+        Pending/confirmed bookings aur blackout dates se takraav. 'create' ke lock ke andar bulayein.
+        """
+        if nights_taken(property_obj.pk, check_in, check_out):
+            raise serializers.ValidationError("These dates are not available for this property.")
+
+        # check_out wali raat guest rukta nahi, isliye woh blackout ho to bhi chalega
+        if property_obj.blackout_dates.filter(date__gte=check_in, date__lt=check_out).exists():
+            raise serializers.ValidationError("Booking is not avalibale for the Selected Dates ")
+
+    def queue_notifications(self, booking, user):
+        property_obj = booking.property
+        vendor = property_obj.owner
+
+        # --- 1. Admin ko notification ---
+        settings_obj = SiteSettings.objects.first()
+        if settings_obj and settings_obj.notify_new_booking:
+            admin_email = config('ADMIN_EMAIL', default=None)
+            if admin_email:
+                outbox.enqueue(
+                    f"New Booking Received: {property_obj.title}",
+                    f"A new booking has been made by {user.full_name} for {property_obj.title} from {booking.check_in_date} to {booking.check_out_date}.",
+                    [admin_email],
+                )
+
+        # --- 2. Vendor ko notification ---
+        # (vendor ne digest mode chuna ho to email turant nahi, hourly/daily digest mein)
+        if vendor.notify_new_bookings:
+            if vendor.new_booking_email_mode == 'instant':
+                outbox.enqueue(
+                    f"You have a new booking for {property_obj.title}!",
+                    f"Hi {vendor.first_name},\n\nA new booking has been made for your property, {property_obj.title}.\nGuest: {user.full_name}\nDates: {booking.check_in_date} to {booking.check_out_date}\nEarnings: ~₹{booking.total_price}",
+                    [vendor.email],
+                )
+            else:
+                digests.add(
+                    vendor,
+                    f"New booking for {property_obj.title}",
+                    f"Guest: {user.full_name}\nDates: {booking.check_in_date} to {booking.check_out_date}\nEarnings: ~₹{booking.total_price}",
+                )
+
     def create(self, validated_data):
         # removing th property_slug because it is not in booking model 
         validated_data.pop('property_slug',None)
 
         user = self.context['request'].user   #taking usr from request
-        booking = Booking.objects.create(user=user, **validated_data)
-
-        # Jaise hi booking bani, ek 'Pending' payment banayein
-        Payment.objects.create(
-            booking=booking,
-            amount=booking.total_price,
-            payment_method=booking.payment_method,
-            status=Payment.PaymentStatus.PENDING # Default 'Pending'
-        )
-
-        # notification logic for admin and vendor
 
         try:
-            property_obj = booking.property
-            vendor = property_obj.owner
-            
-            # --- 1. Admin ko notification bhejein ---
-            settings_obj = SiteSettings.objects.first()
-            if settings_obj and settings_obj.notify_new_booking:
-                admin_subject = f"New Booking Received: {property_obj.title}"
-                admin_message = f"A new booking has been made by {user.full_name} for {property_obj.title} from {booking.check_in_date} to {booking.check_out_date}."
-                admin_email = config('ADMIN_EMAIL', default=None)
-                if admin_email:
-                    send_mail(admin_subject, admin_message, settings.DEFAULT_FROM_EMAIL, [admin_email])
-            
-            # --- 2. Vendor ko notification bhejein ---
-            if vendor.notify_new_bookings:
-                vendor_subject = f"You have a new booking for {property_obj.title}!"
-                vendor_message = f"Hi {vendor.first_name},\n\nA new booking has been made for your property, {property_obj.title}.\nGuest: {user.full_name}\nDates: {booking.check_in_date} to {booking.check_out_date}\nEarnings: ~₹{booking.total_price}"
-                send_mail(vendor_subject, vendor_message, settings.DEFAULT_FROM_EMAIL, [vendor.email])
-                
-        except Exception as e:
-            print(f"Error sending booking notification email: {e}")
+            with transaction.atomic():
+                # Property row par lock: isi property ki doosri booking yahin ruk kar pehli ke commit
+                # ka intezaar karti hai, fir check mein use pehli booking dikhti hai.
+                # Doosri properties ki bookings is lock se nahi rukti.
+                property_obj = (
+                    Property.objects.select_for_update()
+                    .filter(pk=validated_data['property'].pk, status=Property.PropertyStatus.APPROVED)
+                    .first()
+                )
+                if property_obj is None:
+                    raise serializers.ValidationError("Approved Property with this slug doesnot exist")
+                self.check_available(property_obj, validated_data['check_in_date'], validated_data['check_out_date'])
+
+                booking = Booking.objects.create(
+                    user=user, hold_expires_at=holds.hold_expiry(validated_data['payment_method']), **validated_data
+                )
+
+                # Jaise hi booking bani, ek 'Pending' payment banayein
+                Payment.objects.create(
+                    booking=booking,
+                    amount=booking.total_price,
+                    payment_method=booking.payment_method,
+                    status=Payment.PaymentStatus.PENDING # Default 'Pending'
+                )
+
+                # Admin aur vendor ke notifications - outbox mein, isi transaction ke saath
+                # ('send_outbox' worker bhejta hai; request SMTP ka intezaar nahi karti)
+                self.queue_notifications(booking, user)
+        except IntegrityError:
+            # Lock ke bawajood koi raat beech mein book ho gayi (jaise cancelled booking dobara
+            # confirm hui) - BookedNight ke unique constraint ne pakad liya
+            raise serializers.ValidationError("These dates are not available for this property.")
 
         return booking
 
@@ -138,7 +175,7 @@ class BookingDetailSerializer(BookingListSerializer):
     class Meta(BookingListSerializer.Meta):
         fields = BookingListSerializer.Meta.fields + [
             'price_per_night', 'cleaning_fee', 'service_fee',
-            'total_nights', 'payment_method', 'booked_at',
+            'total_nights', 'payment_method', 'booked_at', 'hold_expires_at',
             'price_breakdown'
         ]
         
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from properties import availability
+from .models import Booking
+
+
+@receiver(post_save, sender=Booking)
+def bump_calendar_on_save(sender, instance, created, **kwargs):
+    """
+    Booking bani, cancel hui, confirm hui ya dates badlin -> property ka availability calendar
+    (properties/availability.py) dobara bane. Raatein (BookedNight) Booking.save() khud likhta hai.
+    """
+    # Booking.save() '_loaded_nights_state' signal ke baad badalta hai - yahan abhi purani state hai
+    if created or getattr(instance, '_loaded_nights_state', None) != instance.nights_state():
+        availability.bump_versions([instance.property_id])
+
+
+@receiver(post_delete, sender=Booking)
+def bump_calendar_on_delete(sender, instance, **kwargs):
+    availability.bump_versions([instance.property_id])
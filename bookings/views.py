@@ -1,6 +1,8 @@
 # bookings/apis.py
 from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from django.db import IntegrityError
 from rest_framework.response import Response
 from .models import *
 from .serializers import *
@@ -8,6 +10,7 @@ from users.permissions import IsAdminRole
 from properties.permission import IsOwner 
 from django.utils import timezone
 from .permissions import IsPropertyOwnerOfBooking
+from properties.loaders import prefetch_property_cards
 from django.utils import timezone
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
@@ -44,7 +47,10 @@ class MyBookingListView(generics.ListAPIView):
         # Filter logic for 'Upcoming', 'Past', 'Cancelled'
         query_status = self.request.query_params.get('status', None)
         
-        queryset = Booking.objects.filter(user=user).order_by('-check_in_date')
+        # Property card ka data saari bookings ke liye bulk mein (no N+1)
+        queryset = prefetch_property_cards(
+            Booking.objects.filter(user=user), prefix='property__'
+        ).order_by('-check_in_date')
         
         today = timezone.now().date()
         
@@ -68,7 +74,9 @@ class MyBookingDetailView(generics.RetrieveAPIView):
     
     def get_queryset(self):
         # User sirf apni booking hi dekh sakta hai
-        return Booking.objects.filter(user=self.request.user)
+        return prefetch_property_cards(
+            Booking.objects.filter(user=self.request.user), prefix='property__'
+        )
 
 class MyBookingCancelView(APIView):
     """
@@ -105,7 +113,9 @@ class VendorBookingListView(generics.ListAPIView):
     def get_queryset(self):
         user = self.request.user
         # Sirf woh bookings jo vendor ki properties par hain
-        return Booking.objects.filter(property__owner=user).order_by('-check_in_date')
+        return prefetch_property_cards(
+            Booking.objects.filter(property__owner=user), prefix='property__'
+        ).order_by('-check_in_date')
 
 # --- Admin APIs ---
 
@@ -114,13 +124,28 @@ class AdminBookingListView(generics.ListAPIView):
     Admin ke liye: Platform ki saari bookings ki list.
     (/admin/dashboard/bookings)
     """
-    queryset = Booking.objects.all().order_by('-booked_at')
+    queryset = prefetch_property_cards(
+        Booking.objects.select_related('user'), prefix='property__'
+    ).order_by('-booked_at')
     serializer_class = AdminBookingListSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminRole]
 
 
 
-class VendorManageBookingView(generics.UpdateAPIView):
+class NightConflictMixin:
+    """
+    Status badalne se booking dobara active hui (jaise cancelled -> confirmed) aur uski koi raat
+    ab kisi aur booking ki hai: BookedNight ka unique constraint IntegrityError deta hai,
+    jo yahan 500 ki jagah 400 banta hai (booking wapas purane status par hi rehti hai).
+    """
+    def perform_update(self, serializer):
+        try:
+            super().perform_update(serializer)
+        except IntegrityError:
+            raise ValidationError({'status': ['These dates are already booked by another booking.']})
+
+
+class VendorManageBookingView(NightConflictMixin, generics.UpdateAPIView):
     """
     Vendor ke liye: Apni property ki booking ko 'Confirm' ya 'Cancel' karna.
     """
@@ -130,7 +155,7 @@ class VendorManageBookingView(generics.UpdateAPIView):
     lookup_field = 'id' # Booking ID se
 
 
-class AdminManageBookingView(generics.UpdateAPIView):
+class AdminManageBookingView(NightConflictMixin, generics.UpdateAPIView):
     """
     Admin ke liye: Kisi bhi booking ka status update karna.
     """
@@ -0,0 +1,27 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import DigestItem, OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'to')
+    readonly_fields = ('attempts', 'last_error', 'created_at', 'sent_at')
+    actions = ['requeue']
+
+    @admin.action(description='Requeue selected emails')
+    def requeue(self, request, queryset):
+        # Dead letters (ya atke hue) dobara shuru se
+        updated = queryset.exclude(status=OutboxEmail.Status.SENT).update(
+            status=OutboxEmail.Status.PENDING, attempts=0, next_attempt_at=timezone.now(), last_error='',
+        )
+        self.message_user(request, f"{updated} emails requeued.")
+
+
+@admin.register(DigestItem)
+class DigestItemAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'subject', 'created_at')
+    search_fields = ('subject', 'user__email')
+    raw_id_fields = ('user',)
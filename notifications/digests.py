@@ -0,0 +1,90 @@
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+from .models import DigestItem
+from . import outbox
+
+# Vendor digest: jis vendor ne new_booking_email_mode 'hourly'/'daily' chuna hai, uski har
+# booking ka email turant outbox mein nahi jata - DigestItem banta hai (usi transaction mein).
+# send_outbox worker flush_due() chalata hai: jis user ka sabse purana item uske interval se
+# purana ho gaya, uske saare items ek email mein outbox mein jate hain aur items hat jate hain
+# (ek hi transaction). Mode wapas 'instant' kiya to bache items agle flush mein hi nikal jate hain.
+
+logger = logging.getLogger(__name__)
+
+INTERVALS = {
+    'instant': timedelta(0),
+    'hourly': timedelta(hours=1),
+    'daily': timedelta(days=1),
+}
+
+# Ek digest email mein zyada se zyada itne events (baaki agle digest mein)
+MAX_ITEMS = 200
+
+
+def add(user, subject, message):
+    """
+    User ke agle digest mein ek event (caller ke transaction ke andar).
+    """
+    if not user.email:
+        return None
+    return DigestItem.objects.create(user=user, subject=subject[:255], body=message)
+
+
+def due_user_ids(now=None):
+    now = now or timezone.now()
+    user_ids = []
+    for mode, interval in INTERVALS.items():
+        user_ids += (
+            DigestItem.objects.filter(user__new_booking_email_mode=mode)
+            .values('user_id')
+            .annotate(oldest=Min('created_at'))
+            .filter(oldest__lte=now - interval)
+            .values_list('user_id', flat=True)
+        )
+    return user_ids
+
+
+def compose(user, items):
+    count = len(items)
+    subject = f"Your Farmstay update: {count} new booking{'s' if count != 1 else ''}"
+    sections = [f"{item.subject}\n{item.body}" for item in items]
+    body = f"Hi {user.first_name},\n\nHere is what happened since your last update:\n\n" + "\n\n---\n\n".join(sections)
+    return subject, body
+
+
+def flush_user(user_id):
+    """
+    Ek user ke items (purane pehle, MAX_ITEMS tak) -> ek outbox email. Return items ki ginti.
+    """
+    with transaction.atomic():
+        items = list(
+            DigestItem.objects.select_for_update()
+            .select_related('user')
+            .filter(user_id=user_id)
+            .order_by('created_at', 'pk')[:MAX_ITEMS]
+        )
+        if not items:
+            return 0
+        user = items[0].user
+        subject, body = compose(user, items)
+        outbox.enqueue(subject, body, [user.email])
+        DigestItem.objects.filter(pk__in=[item.pk for item in items]).delete()
+    return len(items)
+
+
+def flush_due(now=None):
+    """
+    Jin users ka digest ka waqt ho gaya unke digest emails outbox mein. Return (emails, items).
+    """
+    emails = items = 0
+    for user_id in due_user_ids(now):
+        flushed = flush_user(user_id)
+        if flushed:
+            emails += 1
+            items += flushed
+    if emails:
+        logger.info('Queued %s digest emails covering %s events', emails, items)
+    return emails, items
@@ -0,0 +1,76 @@
+import time
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from notifications.models import OutboxEmail
+from notifications.outbox import BATCH_SIZE, Mailer, deliver
+
+
+class Command(BaseCommand):
+    """
+    Email throughput: purana tareeka (har email par naya SMTP connection - send_mail jaisa)
+    banaam outbox delivery (Mailer ka ek khula connection, BATCH_SIZE ke batches, row status
+    updates samet). Configured SMTP server par asli emails jate hain - sirf run_smtp_sink
+    (ya kisi test server) ke saath chalayein, jaise:
+        python manage.py run_smtp_sink --connect-delay-ms 50
+        EMAIL_HOST=127.0.0.1 EMAIL_PORT=1025 EMAIL_USE_TLS=False EMAIL_HOST_USER= \
+            python manage.py benchmark_email --messages 500
+    Apni banayi outbox rows aakhir mein hata deta hai.
+    Usage: python manage.py benchmark_email [--messages 500] [--batch-size 50] [--to bench@example.invalid]
+    """
+    help = "Compare per-message SMTP connections with pooled outbox delivery."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=500)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--to', default='bench@example.invalid')
+
+    def handle(self, *args, **options):
+        total = options['messages']
+        if total < 1 or options['batch_size'] < 1:
+            raise CommandError('--messages and --batch-size must be positive.')
+        self.stdout.write(f"Sending {total} messages per run via {settings.EMAIL_HOST}:{settings.EMAIL_PORT}")
+
+        run = uuid.uuid4().hex[:8]
+        naive = self.run_naive(run, total, options['to'])
+        pooled = self.run_pooled(run, total, options['batch_size'], options['to'])
+
+        for label, elapsed in (('connection per message', naive), ('pooled outbox', pooled)):
+            self.stdout.write(f"  {label:<24} {elapsed:8.2f}s  {total / elapsed:8.1f} msg/s")
+        self.stdout.write(self.style.SUCCESS(f"Pooled delivery is {naive / pooled:.1f}x faster."))
+
+    def run_naive(self, run, total, to):
+        started = time.perf_counter()
+        for number in range(total):
+            # connection nahi diya - har send() apna connection khol kar band karta hai
+            EmailMessage(f'Benchmark {run} naive #{number}', 'Benchmark message.', None, [to]).send()
+        return time.perf_counter() - started
+
+    def run_pooled(self, run, total, batch_size, to):
+        now = timezone.now()
+        emails = OutboxEmail.objects.bulk_create([
+            OutboxEmail(
+                subject=f'Benchmark {run} pooled #{number}', body='Benchmark message.',
+                from_email=settings.DEFAULT_FROM_EMAIL, to=[to],
+                # Lease jaisa - asli worker inhe na uthaye
+                next_attempt_at=now + timedelta(days=1), attempts=1,
+            )
+            for number in range(total)
+        ])
+
+        mailer = Mailer()
+        try:
+            started = time.perf_counter()
+            sent = 0
+            for start in range(0, len(emails), batch_size):
+                sent += deliver(emails[start:start + batch_size], mailer)[OutboxEmail.Status.SENT]
+            elapsed = time.perf_counter() - started
+        finally:
+            mailer.close()
+            OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).delete()
+        if sent != total:
+            raise CommandError(f'Only {sent} of {total} pooled messages were sent.')
+        return elapsed
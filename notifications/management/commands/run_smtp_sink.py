@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+from aiosmtpd.controller import Controller
+from django.core.management.base import BaseCommand
+
+
+class SinkHandler:
+    """
+    Har email le kar ginta hai, aage kahin nahi bhejta. Delays asli SMTP server ki
+    latency ki nakal hain: connect_delay har naye session (EHLO) par - TLS handshake + login
+    jaisa - aur message_delay har email (DATA) par.
+    """
+
+    def __init__(self, connect_delay=0.0, message_delay=0.0, echo=False):
+        self.connect_delay = connect_delay
+        self.message_delay = message_delay
+        self.echo = echo
+        self.sessions = 0
+        self.messages = 0
+        self.lock = threading.Lock()
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        if self.connect_delay:
+            await asyncio.sleep(self.connect_delay)
+        session.host_name = hostname
+        with self.lock:
+            self.sessions += 1
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.message_delay:
+            await asyncio.sleep(self.message_delay)
+        with self.lock:
+            self.messages += 1
+        if self.echo:
+            print(f"--- {envelope.mail_from} -> {', '.join(envelope.rcpt_tos)}")
+            print(envelope.content.decode('utf8', errors='replace'))
+        return '250 Message accepted for delivery'
+
+
+class Command(BaseCommand):
+    """
+    Local SMTP stand-in (aiosmtpd): development aur benchmark_email ke liye. Emails le kar
+    ginta hai (aur '--echo' par dikhata hai), bahar kuch nahi jata.
+    App ko is par chalane ke liye: EMAIL_HOST=127.0.0.1 EMAIL_PORT=1025 EMAIL_USE_TLS=False
+    (aur EMAIL_HOST_USER khaali - sink login nahi maangta).
+    Usage: python manage.py run_smtp_sink [--host 127.0.0.1] [--port 1025] [--echo]
+           [--connect-delay-ms 0] [--message-delay-ms 0]
+    """
+    help = "Run a local SMTP server that accepts and counts mail without delivering it."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=1025)
+        parser.add_argument('--echo', action='store_true', help='Har aaya email print karein.')
+        parser.add_argument('--connect-delay-ms', type=float, default=0.0,
+                            help='Har naye SMTP session par itni der (handshake/login ki nakal).')
+        parser.add_argument('--message-delay-ms', type=float, default=0.0,
+                            help='Har email par itni der.')
+
+    def handle(self, *args, **options):
+        handler = SinkHandler(
+            connect_delay=options['connect_delay_ms'] / 1000,
+            message_delay=options['message_delay_ms'] / 1000,
+            echo=options['echo'],
+        )
+        controller = Controller(handler, hostname=options['host'], port=options['port'])
+        controller.start()
+        self.stdout.write(self.style.SUCCESS(
+            f"SMTP sink listening on {options['host']}:{options['port']} (Ctrl+C to stop)."
+        ))
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            controller.stop()
+        self.stdout.write(f"{handler.messages} messages received over {handler.sessions} sessions.")
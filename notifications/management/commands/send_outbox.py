@@ -0,0 +1,53 @@
+import time
+from collections import Counter
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from notifications import digests
+from notifications.outbox import BATCH_SIZE, Mailer, process_batch
+
+
+class Command(BaseCommand):
+    """
+    Outbox worker: pending emails bhejta hai (retry/backoff/dead letter - notifications/outbox.py).
+    Ek SMTP connection batches ke beech khula rehta hai (khaali baithne par band). Har
+    '--digest-interval' second par jin vendors ka digest due hai unke digest emails bhi banata hai.
+    Supervisor (systemd/supervisord) ke neeche lagatar chalayein, ya cron se '--once'.
+    Kai workers ek saath chal sakte hain.
+    Usage: python manage.py send_outbox [--once] [--batch-size 50] [--interval 2] [--digest-interval 60]
+    """
+    help = "Send queued outbox emails with retries, backoff and dead-lettering."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Jo due hai bhej kar ruk jayein.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--interval', type=float, default=2.0, help='Outbox khaali ho to itne second ruk kar dobara dekhein.')
+        parser.add_argument('--digest-interval', type=float, default=60.0, help='Itne second mein ek baar due digests banayein.')
+
+    def handle(self, *args, **options):
+        total = Counter()
+        mailer = Mailer()
+        next_digest_run = 0.0
+        try:
+            while True:
+                close_old_connections()
+                if time.monotonic() >= next_digest_run:
+                    digest_emails, _ = digests.flush_due()
+                    total['digests'] += digest_emails
+                    next_digest_run = time.monotonic() + options['digest_interval']
+                counts = process_batch(options['batch_size'], mailer)
+                total.update(counts)
+                if counts and options['verbosity'] > 1:
+                    self.stdout.write(', '.join(f'{count} {status}' for status, count in counts.items()))
+                if not counts:
+                    if options['once']:
+                        break
+                    mailer.close_if_idle()
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            mailer.close()
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox: {total['sent']} sent, {total['pending']} scheduled for retry, {total['dead']} dead, "
+            f"{total['digests']} digests queued."
+        ))
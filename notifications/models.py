@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import models
+
+# Transactional outbox: bahar jane wala har email pehle is table mein ek row banta hai -
+# usi transaction mein jisme booking/user bana - aur 'send_outbox' worker baad mein bhejta hai.
+# Request kabhi SMTP ka intezaar nahi karti; transaction rollback ho to email bhi nahi jata,
+# aur SMTP band ho to email khota nahi (retry hota hai, aakhir mein 'dead' - admin se dobara bhej sakte hain).
+
+
+class OutboxEmail(models.Model):
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'   # Bhejna baaki (ya agli koshish ka intezaar)
+        SENT = 'sent', 'Sent'
+        DEAD = 'dead', 'Dead'            # Saari koshishein fail - dead letter
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField()          # Recipients ki list
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Worker isse pehle row nahi uthata (backoff, aur bhejte waqt lease)
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # Worker ki query: status='pending' AND next_attempt_at <= now, purane pehle
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.get_status_display()})"
+
+
+class DigestItem(models.Model):
+    """
+    Digest mode wale user (CustomUser.new_booking_email_mode hourly/daily) ka ek event -
+    turant email ki jagah yahan rukta hai; notifications/digests.py sabko ek email mein bhejta hai.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='digest_items')
+    subject = models.CharField(max_length=255)   # Digest mein event ki heading
+    body = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='digest_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.user}"
@@ -0,0 +1,191 @@
+import logging
+import random
+import time
+from collections import Counter
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import OutboxEmail
+
+# Outbox mein email daalna (request ke andar) aur use bhejna ('send_outbox' worker).
+# Worker due rows par lease leta hai (next_attempt_at LEASE aage, attempts + 1) - kai workers
+# ek saath chal sakte hain (Postgres par SKIP LOCKED). Fail hone par exponential backoff
+# (jitter ke saath); MAX_ATTEMPTS ke baad row 'dead' ho jati hai. Worker beech mein mar jaye
+# to lease khatam hone par row apne aap dobara uthti hai.
+# Batch lamba chal sakta hai (50 emails x EMAIL_TIMEOUT), isliye lease har email bhejne se
+# theek pehle renew hoti hai, aur har update (renew, sent, failed) sirf tab lagta hai jab row
+# abhi bhi isi claim ki hai (status pending + wahi attempts). Lease beech mein nikal gayi aur
+# doosre worker ne row utha li (attempts badh gaye) to yeh worker use chhod deta hai - email
+# do baar nahi jata.
+# Bhejna Mailer se hota hai: get_connection() ka ek hi authenticated SMTP connection poore
+# batch - aur worker mein agle batches - ke liye khula rehta hai (har email par naya TLS
+# handshake + login nahi). Har email alag send_messages([message]) call hai, taaki har row
+# ka apna sent/retry status rahe; ek saath poori list bhejne par yeh pata nahi chalta ki
+# kaun sa email fail hua.
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 8
+
+# Pehli retry ~30s baad, fir dugna... zyada se zyada 1 ghanta
+BACKOFF_BASE = 30
+BACKOFF_MAX = 60 * 60
+
+# Har email se pehle renew hoti hai - ek email bhejne ki max der (EMAIL_TIMEOUT) se kaafi zyada.
+# Itni der mein renew na hui to worker mar chuka maana jata hai
+LEASE = timedelta(minutes=5)
+
+# Ek connection par itne emails ke baad naya (server ki per-session limits), aur itne
+# seconds khaali pada connection band (server khud kaat de usse pehle)
+MAX_MESSAGES_PER_CONNECTION = 500
+MAX_IDLE_SECONDS = 30
+
+
+def enqueue(subject, message, recipient_list, from_email=None):
+    """
+    send_mail() ki jagah: email outbox mein likhta hai - caller ke transaction ke andar,
+    taaki business change ke saath hi commit/rollback ho. Khaali recipients par kuch nahi.
+    """
+    recipients = [recipient for recipient in recipient_list if recipient]
+    if not recipients:
+        return None
+    return OutboxEmail.objects.create(
+        subject=subject[:255],
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=recipients,
+        next_attempt_at=timezone.now(),
+    )
+
+
+def backoff(attempts):
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    # Jitter: SMTP wapas aane par saare retries ek hi second par na tootein
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim(limit=BATCH_SIZE):
+    """
+    Due emails par lease lekar unhe lautata hai (purane pehle).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEmail.Status.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('pk', flat=True)[:limit]
+        )
+        OutboxEmail.objects.filter(pk__in=ids).update(next_attempt_at=now + LEASE, attempts=F('attempts') + 1)
+    return list(OutboxEmail.objects.filter(pk__in=ids).order_by('next_attempt_at', 'pk'))
+
+
+def _held(email):
+    """
+    Row, agar abhi bhi is worker ke claim mein hai (claim ke baad koi aur attempt nahi hua).
+    """
+    return OutboxEmail.objects.filter(pk=email.pk, status=OutboxEmail.Status.PENDING, attempts=email.attempts)
+
+
+def renew_lease(email):
+    return bool(_held(email).update(next_attempt_at=timezone.now() + LEASE))
+
+
+def _failed(email, error):
+    """
+    Retry ka waqt tay karta hai, ya koshishein khatam to dead letter. Return naya status.
+    """
+    now = timezone.now()
+    if email.attempts >= MAX_ATTEMPTS:
+        status, next_attempt_at = OutboxEmail.Status.DEAD, now
+        logger.error('Outbox email #%s dead after %s attempts: %s', email.pk, email.attempts, error)
+    else:
+        status, next_attempt_at = OutboxEmail.Status.PENDING, now + backoff(email.attempts)
+        logger.warning('Outbox email #%s failed (attempt %s), retrying at %s: %s', email.pk, email.attempts, next_attempt_at, error)
+    _held(email).update(
+        status=status, next_attempt_at=next_attempt_at, last_error=f'{type(error).__name__}: {error}'[:2000],
+    )
+    return status
+
+
+class Mailer:
+    """
+    get_connection() ka ek connection kai emails/batches tak khula rakhta hai. Pehle email par
+    khulta hai; error, MAX_MESSAGES_PER_CONNECTION ya close_if_idle() par band hota hai aur
+    agla email naya kholta hai.
+    """
+
+    def __init__(self, connection_factory=get_connection):
+        self.connection_factory = connection_factory
+        self.connection = None
+        self.sent_on_connection = 0
+        self.last_used = 0.0
+
+    def send(self, message):
+        if self.connection is None:
+            connection = self.connection_factory()
+            connection.open()
+            self.connection, self.sent_on_connection = connection, 0
+        try:
+            if not self.connection.send_messages([message]):
+                raise RuntimeError('Email backend did not accept the message.')
+        except Exception:
+            # Connection kharab ho sakta hai - agla email naya kholega
+            self.close()
+            raise
+        self.sent_on_connection += 1
+        self.last_used = time.monotonic()
+        if self.sent_on_connection >= MAX_MESSAGES_PER_CONNECTION:
+            self.close()
+
+    def close_if_idle(self):
+        if self.connection is not None and time.monotonic() - self.last_used >= MAX_IDLE_SECONDS:
+            self.close()
+
+    def close(self):
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                # Toota connection band karte waqt ki galti se koi email nahi rukna chahiye
+                logger.warning('Closing the email connection failed', exc_info=True)
+
+
+def deliver(emails, mailer=None):
+    """
+    Claimed emails bhejta hai - diye gaye Mailer se (worker wala, connection khula rehta hai),
+    na ho to is batch ke liye ek naya jo aakhir mein band hota hai. Return Counter(sent/pending/dead).
+    """
+    counts = Counter()
+    own_mailer = mailer is None
+    mailer = mailer or Mailer()
+    try:
+        for email in emails:
+            if not renew_lease(email):
+                # Lease nikal gayi aur row kisi aur worker ke paas hai
+                logger.info('Outbox email #%s was reclaimed by another worker, skipping', email.pk)
+                counts['lost'] += 1
+                continue
+            message = EmailMessage(email.subject, email.body, email.from_email, email.to)
+            try:
+                mailer.send(message)
+            except Exception as error:
+                counts[_failed(email, error)] += 1
+                continue
+            if not _held(email).update(status=OutboxEmail.Status.SENT, sent_at=timezone.now(), last_error=''):
+                logger.warning('Outbox email #%s was sent after its lease was lost', email.pk)
+            counts[OutboxEmail.Status.SENT] += 1
+    finally:
+        if own_mailer:
+            mailer.close()
+    return counts
+
+
+def process_batch(limit=BATCH_SIZE, mailer=None):
+    emails = claim(limit)
+    return deliver(emails, mailer) if emails else Counter()
@@ -0,0 +1,32 @@
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+from . import outbox
+from .models import OutboxEmail
+
+
+class OutboxLeaseTests(TestCase):
+
+    def test_reclaimed_email_is_sent_once(self):
+        outbox.enqueue('Hello', 'Body', ['guest@example.com'])
+        first_worker = outbox.claim()
+        # Pehle worker ka batch lamba chala, lease nikal gayi, doosre worker ne row utha li
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        second_worker = outbox.claim()
+
+        self.assertEqual(outbox.deliver(first_worker)['lost'], 1)
+        self.assertEqual(outbox.deliver(second_worker)[OutboxEmail.Status.SENT], 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxEmail.Status.SENT)
+
+    def test_late_failure_does_not_touch_reclaimed_row(self):
+        outbox.enqueue('Hello', 'Body', ['guest@example.com'])
+        email, = outbox.claim()
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        outbox.claim()
+
+        outbox._failed(email, RuntimeError('smtp down'))
+
+        row = OutboxEmail.objects.get()
+        self.assertEqual(row.attempts, 2)
+        self.assertEqual(row.last_error, '')
@@ -8,6 +8,7 @@ class Payment(models.Model):
         COMPLETED = 'completed', 'Completed'
         FAILED = 'failed', 'Failed'
         REFUNDED = 'refunded', 'Refunded'
+        CANCELLED = 'cancelled', 'Cancelled'   # Booking ka hold expire/cancel - paisa aaya hi nahi
 
     # Payment ko Booking se link karein
     booking = models.OneToOneField(
@@ -7,12 +7,24 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django_filters.rest_framework import DjangoFilterBackend
-from .filters import PropertyFilter
+from .filters import AdminPropertyBulkFilter, PropertyFilter, PropertyOrderingFilter, PropertySearchFilter
+from .loaders import prefetch_property_cards
+from . import autocomplete, availability, detail, facets, importer, moderation, pricing, reference
+from .reference import CachedReferenceMixin
+from .pagination import KeysetPagination
 from users.permissions import IsAdminRole # importing isAdmin role for property accept/reject feature from "users"
-from django.db.models import Count, Avg, Q
+from django.db.models import Count, Avg, Q, Prefetch
 from drf_spectacular.utils import extend_schema, OpenApiTypes, OpenApiResponse
 from rest_framework import serializers
+from rest_framework.exceptions import NotFound, ValidationError
+from django.utils.http import http_date, parse_http_date_safe
+from django.http import StreamingHttpResponse
+from django.db import transaction
+import json
+from uploads.chunks import discard_part
+from uploads.serializers import claim_uploads
 from bookings.models import Booking
+from reviews.models import Review
 from django.utils import timezone
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
@@ -37,18 +49,25 @@ class PropertyListView(generics.ListAPIView):
     serializer_class = PropertyListSerializer
     permission_classes = [permissions.AllowAny]
     
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter] # (FIX 3) OrderingFilter add karein
+    # SearchFilter ki jagah PropertySearchFilter: full-text index se ranked search
+    # PropertyOrderingFilter: 'distance' se sorting sirf ?lat=&lng= ke saath
+    filter_backends = [DjangoFilterBackend, PropertyOrderingFilter, PropertySearchFilter] # (FIX 3) OrderingFilter add karein
     filterset_class = PropertyFilter
+
+    # Cursor (keyset) pagination: ?ordering= ke har option par stable, 'id' se tie-break
+    pagination_class = KeysetPagination
     
-    ordering_fields = ['base_price', 'average_rating', 'created_at'] 
-    # SearchFilter ke liye
+    ordering_fields = ['base_price', 'average_rating', 'created_at', 'distance'] 
+    # Full-text index na ho to (LIKE) SearchFilter inhi fields par chalta hai -
+    # wahi columns jo index mein hain (properties/search.py), taaki dono ke results ek se hon
     search_fields = [
         'title', 
         'city', 
         'state', 
         'area', 
         'category__name', 
-        'property_type'
+        'property_type',
+        'short_description',
     ]
     # --------------------------
 
@@ -56,11 +75,13 @@ class PropertyListView(generics.ListAPIView):
         """
         Queryset for approved property
         """
-        # (FIX 5)
-        return Property.objects.filter(
-            status=Property.PropertyStatus.APPROVED
-        ).annotate(
-            average_rating=Avg('reviews__rating', filter=Q(reviews__isnull=False), default=0.0)
+        # 'average_rating' ab Property ki stored field hai,
+        # isliye filter (min_rating) aur sorting bina annotate ke chal jati hai
+        # Cards ka related data (images, tags, reviews) page ke liye bulk mein aata hai
+        # (sirf woh jo ?fields=/?expand= ke hisab se card mein banega)
+        return prefetch_property_cards(
+            Property.objects.filter(status=Property.PropertyStatus.APPROVED),
+            fields=PropertyListSerializer.resolve_fields(self.request),
         )
 
     def get_serializer_context(self):
@@ -74,8 +95,15 @@ class PropertyDetailView(generics.RetrieveAPIView):
     """
     API view to show details of a single property.
     Ise bhi koi bhi (bina login) access kar sakta hai.
+
+    Conditional GET: ETag (har user ke liye, wishlist bit ke saath) aur Last-Modified
+    (updated_at) bhejta hai; client ka version same ho to 304. Payload ka user-independent
+    hissa property version (updated_at + review stats) par cache hota hai (properties/detail.py).
     """
-    queryset = Property.objects.all()
+    # Reviews prefetch nahi hote: serializer sirf latest kuch reviews ek query mein laata hai
+    queryset = Property.objects.select_related('owner', 'category').prefetch_related(
+        'images', 'amenities', 'certifications', 'views',
+    )
     serializer_class = PropertyDetailSerializer # 'Detail' wala serializer istemal karo
     permission_classes = [permissions.AllowAny]
     lookup_field = 'slug' # URL mein 'id' (ya 'pk') se property ko dhundhega
@@ -88,7 +116,179 @@ class PropertyDetailView(generics.RetrieveAPIView):
         context = super().get_serializer_context()
         context.update({'request': self.request})
         return context
+
+    def build_payload(self):
+        """
+        Poora detail payload, 'is_in_wishlist' ke bina (woh har user ka alag hai).
+        """
+        context = self.get_serializer_context()
+        # Wishlist bit yahaan hata dete hain, isliye uski query chalane ki zaroorat nahi
+        context['wishlist_ids'] = set()
+        data = dict(self.get_serializer_class()(self.get_object(), context=context).data)
+        data.pop('is_in_wishlist', None)
+        return data
+
+    def retrieve(self, request, *args, **kwargs):
+        # 1. Sirf version wali fields (ek chhoti query), poora object nahi
+        row = (
+            Property.objects.filter(**{self.lookup_field: kwargs[self.lookup_field]})
+            .values_list(*detail.VERSION_FIELDS).first()
+        )
+        if row is None:
+            raise NotFound()
+        version, updated_at = detail.detail_version(row), row[1]
+
+        # 2. Wishlist bit (login user ke liye ek EXISTS query)
+        user = request.user
+        in_wishlist = user.is_authenticated and user.wishlist.filter(pk=row[0]).exists()
+
+        base_url = request.build_absolute_uri('/')
+        etag = detail.detail_etag(version, base_url, in_wishlist)
+        last_modified = http_date(updated_at.timestamp())
+
+        # 3. Client ke paas yahi version hai? (If-None-Match pehle; If-Modified-Since sirf
+        #    bina login ke, kyunki wishlist bit updated_at ke saath nahi badalta)
+        if request.headers.get('If-None-Match'):
+            not_modified = reference.is_not_modified(request, etag)
+        else:
+            since = parse_http_date_safe(request.headers.get('If-Modified-Since') or '')
+            not_modified = (
+                since is not None and not user.is_authenticated
+                and int(updated_at.timestamp()) <= since
+            )
+
+        if not_modified:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            payload = detail.get_detail_payload(version, base_url, self.build_payload)
+            response = Response({**payload, 'is_in_wishlist': in_wishlist})
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+        response['Cache-Control'] = 'private, no-cache'
+        response['Vary'] = 'Authorization'
+        return response
     
+class PropertyQuoteView(APIView):
+    """
+    Booking se pehle daam dekhna: GET /properties/<slug>/quote/?check_in=&check_out=&guests=
+    Wahi hisaab jo booking create karta hai (properties/pricing.py) - weekend raatein,
+    extra guests, cleaning aur service fee alag alag.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(parameters=[PropertyQuoteQuerySerializer], responses={200: OpenApiTypes.OBJECT})
+    def get(self, request, slug, *args, **kwargs):
+        params = PropertyQuoteQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        row = Property.objects.filter(slug=slug, status=Property.PropertyStatus.APPROVED).values(*pricing.RATE_FIELDS).first()
+        if row is None:
+            raise NotFound()
+        try:
+            quote = pricing.quote(pricing.Rates.from_values(row), data['check_in'], data['check_out'], data['guests'])
+        except pricing.PricingError as error:
+            raise ValidationError({'non_field_errors': [str(error)]})
+        return Response({
+            'check_in': data['check_in'], 'check_out': data['check_out'], 'guests': data['guests'],
+            **quote,
+        })
+
+
+class PropertyPriceCalendarView(APIView):
+    """
+    Mahine ka price calendar: GET /properties/<slug>/prices/?month=2025-12&months=1&guests=2
+    Har raat ka daam (weekend aur extra guests ke saath); month na do to is mahine se.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(parameters=[PriceCalendarQuerySerializer], responses={200: OpenApiTypes.OBJECT})
+    def get(self, request, slug, *args, **kwargs):
+        params = PriceCalendarQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        row = Property.objects.filter(slug=slug, status=Property.PropertyStatus.APPROVED).values(*pricing.RATE_FIELDS).first()
+        if row is None:
+            raise NotFound()
+        rates = pricing.Rates.from_values(row)
+        if data['guests'] > rates.max_guests:
+            raise ValidationError({'guests': [f'This property allows at most {rates.max_guests} guests.']})
+
+        start = data.get('month') or timezone.localdate().replace(day=1)
+        end = start + relativedelta(months=data['months'])
+        nights = pricing.night_prices({row['id']: rates}, start, end, data['guests'])[row['id']]
+        return Response({
+            'start': start,
+            'end': end,
+            'guests': data['guests'],
+            'nights': [
+                {'date': night, 'price': price, 'is_weekend': is_weekend}
+                for night, price, is_weekend in nights
+            ],
+        })
+
+
+class PropertyAvailabilityCalendarView(APIView):
+    """
+    Mahine ki har raat free hai ya nahi, daam ke saath:
+    GET /properties/<slug>/calendar/?month=2025-12&guests=2
+    status: available / booked / blocked (vendor ne band ki) / past.
+    Status cache se aate hain, booking ya blackout badalte hi naye (properties/availability.py).
+    """
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(parameters=[AvailabilityCalendarQuerySerializer], responses={200: OpenApiTypes.OBJECT})
+    def get(self, request, slug, *args, **kwargs):
+        params = AvailabilityCalendarQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        row = Property.objects.filter(slug=slug, status=Property.PropertyStatus.APPROVED).values(*pricing.RATE_FIELDS).first()
+        if row is None:
+            raise NotFound()
+        rates = pricing.Rates.from_values(row)
+        if data['guests'] > rates.max_guests:
+            raise ValidationError({'guests': [f'This property allows at most {rates.max_guests} guests.']})
+
+        today = timezone.localdate()
+        month = data.get('month') or today.replace(day=1)
+        nights = availability.calendar(row['id'], rates, month, data['guests'], today)
+        return Response({
+            'month': f'{month:%Y-%m}',
+            'guests': data['guests'],
+            'available_nights': sum(1 for night in nights if night['status'] == availability.AVAILABLE),
+            'nights': nights,
+        })
+
+
+class SimilarPropertyListView(generics.ListAPIView):
+    """
+    Detail page ka "You may also like": GET /properties/<slug>/similar/
+    List pehle se bani hai (rebuild_similar_properties command) - yahan bas
+    SimilarProperty ka (property, rank) index read, rank ke kram mein cards.
+    """
+    serializer_class = PropertyListSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None
+
+    def get_queryset(self):
+        return prefetch_property_cards(
+            # Yahan Property = padosi (SimilarProperty.similar), isliye 'status' hi similar__status
+            # hai - rebuild ke beech unapproved hua padosi list mein na dikhe
+            Property.objects.filter(
+                status=Property.PropertyStatus.APPROVED,
+                recommended_in__property__slug=self.kwargs['slug'],
+            ).order_by('recommended_in__rank'),
+            fields=PropertyListSerializer.resolve_fields(self.request),
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context.update({'request': self.request})
+        return context
+
+
 # --- (MAIN) View 3: Property Create View (Vendor ke liye) ---
 
 class PropertyCreateView(generics.CreateAPIView):
@@ -110,6 +310,40 @@ class PropertyCreateView(generics.CreateAPIView):
         serializer.save(owner=self.request.user)
 
 
+class PropertyImportView(APIView):
+    """
+    Vendor ke liye bulk import: POST {"upload": "<uuid>"} - CSV/JSONL file jo pehle
+    /uploads/ (kind='data') par upload hui hai. Har row PropertyCreateSerializer ke rules
+    se jaanchi jati hai aur sahi rows batches mein bante hain (properties/importer.py).
+    Response JSON Lines stream hai: har row ka result file ke kram mein, aakhri line
+    mein {"summary": {...}}. Properties 'pending' banti hain; images baad mein edit se.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsVendor]
+
+    @extend_schema(request=PropertyImportRequestSerializer, responses={200: OpenApiTypes.STR})
+    def post(self, request):
+        serializer = PropertyImportRequestSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data['upload']
+        format = importer.detect_format(upload.filename)
+        if format is None:
+            raise ValidationError({'upload': 'Upload a .csv or .jsonl file.'})
+        claim_uploads([upload], 'upload')
+
+        def lines():
+            counts = {'created': 0, 'error': 0}
+            try:
+                with open(upload.part_path, 'rb') as stream:
+                    for result in importer.import_properties(stream, format, request.user):
+                        counts[result['status']] += 1
+                        yield json.dumps(result) + '\n'
+            finally:
+                discard_part(upload)
+            yield json.dumps({'summary': {'created': counts['created'], 'failed': counts['error']}}) + '\n'
+
+        return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+
+
 # --- (MAIN) View 4: Property Manage View (Edit/Delete ke liye) ---
 
 class PropertyManageView(generics.RetrieveUpdateDestroyAPIView):
@@ -199,7 +433,10 @@ class VendorPropertyListView(generics.ListAPIView):
         yeh sirf logged-in user ki properties ko filter karta hai.
         """
         user = self.request.user
-        return Property.objects.filter(owner=user)
+        return prefetch_property_cards(
+            Property.objects.filter(owner=user),
+            fields=PropertyListSerializer.resolve_fields(self.request),
+        )
     
     def get_serializer_context(self):
         # 'is_in_wishlist' ke liye request pass karna
@@ -212,7 +449,9 @@ class AdminPropertyListView(generics.ListAPIView):
     Admin ke liye: Platform ki saari properties ki list.
     (Pending, Approved, Rejected sab)
     """
-    queryset = Property.objects.all().order_by('-created_at') # Sabse nayi upar
+    queryset = Property.objects.select_related('category', 'owner').prefetch_related(
+        Prefetch('reviews', queryset=Review.objects.select_related('user'))
+    ).order_by('-created_at') # Sabse nayi upar
     serializer_class = AdminPropertyListSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminRole]
     # Hum yahaan 'PropertyFilter' ka istemal nahi kar rahe hain,
@@ -256,6 +495,43 @@ class AdminRejectPropertyView(APIView):
         
         return Response({'message': 'Property rejected.'}, status=status.HTTP_200_OK)
 
+class AdminBulkPropertyStatusView(APIView):
+    """
+    Admin ke liye: kai properties ek saath approve/reject karna.
+    POST {"items": [slugs]} ya {"filter": {...}} (AdminPropertyBulkFilter).
+    Status ek UPDATE mein badalta hai (updated_at ke saath, taaki detail cache ka version badle),
+    aur destinations/areas cache ek hi baar saaf hota hai.
+    Har item ka result: 'approved'/'rejected', 'unchanged' (pehle se wahi status) ya 'not_found'.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminRole]
+    target_status = None
+
+    @extend_schema(request=moderation.BulkSelectionSerializer, responses={200: OpenApiTypes.OBJECT})
+    def post(self, request, *args, **kwargs):
+        serializer = moderation.BulkSelectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            rows, missing, more = moderation.select_items(
+                Property.objects.all(), 'slug', serializer.validated_data, AdminPropertyBulkFilter, fields=('status',)
+            )
+            changed = [row for row in rows if row['status'] != self.target_status]
+            Property.objects.filter(pk__in=[row['pk'] for row in changed]).update(
+                status=self.target_status, updated_at=timezone.now()
+            )
+
+        # Destinations/areas sirf approved properties se bante hain
+        approved = Property.PropertyStatus.APPROVED
+        if any(approved in (row['status'], self.target_status) for row in changed):
+            reference.invalidate(reference.DESTINATIONS, reference.AREAS)
+            # UPDATE ne updated_at badla hai, autocomplete index wahin se sync hota hai
+            autocomplete.mark_changed()
+
+        changed_ids = {row['pk'] for row in changed}
+        results = [(row, self.target_status if row['pk'] in changed_ids else 'unchanged') for row in rows]
+        return Response(moderation.bulk_response('slug', results, missing, more), status=status.HTTP_200_OK)
+
+
 class AdminManagePropertyView(generics.DestroyAPIView):
     """
     Admin ke liye: Ek property ko delete karna.
@@ -268,7 +544,7 @@ class AdminManagePropertyView(generics.DestroyAPIView):
     lookup_field = 'slug'
 
 
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(CachedReferenceMixin, generics.ListAPIView):
     """
     API to list all available property categories.
     (Used for /categories route and filters)
@@ -276,8 +552,10 @@ class CategoryListView(generics.ListAPIView):
     queryset = Category.objects.all().order_by('name')
     serializer_class = SimpleCategorySerializer
     permission_classes = [permissions.AllowAny] # Koi bhi dekh sakta hai
+    # Cache + ETag (properties/reference.py), Category save/delete par cache saaf hota hai
+    reference_name = reference.CATEGORIES
 
-class AmenityListView(generics.ListAPIView):
+class AmenityListView(CachedReferenceMixin, generics.ListAPIView):
     """
     API to list all available amenities.
     (Used for property forms and filters)
@@ -285,17 +563,21 @@ class AmenityListView(generics.ListAPIView):
     queryset = Amenity.objects.all().order_by('name')
     serializer_class = SimpleAmenitySerializer
     permission_classes = [permissions.AllowAny]
+    reference_name = reference.AMENITIES
 
 
-class DestinationListView(APIView):
+class DestinationListView(CachedReferenceMixin, APIView):
     """
     API to list all unique cities/destinations where APPROVED properties are available
     along with the total count of properties in that city.
+    Result cache mein rehta hai; property approve/reject (ya approved property ki
+    location badalne) par hi cache saaf hota hai.
     """
     permission_classes = [permissions.AllowAny]
+    reference_name = reference.DESTINATIONS
     
 #    @extend_schema(responses=DestinationResponseSerializer(many=True))
-    def get(self, request, format=None):
+    def build_reference(self):
         # 1. Sirf 'APPROVED' properties ko filter karein
         # 2. 'city' field ke hisab se group karein
         # 3. Har group ka count nikalen (annotation)
@@ -309,18 +591,20 @@ class DestinationListView(APIView):
         
         # Output: JSON format mein list of objects return karein
         # [{'city': 'Lonavala', 'state': 'Maharashtra', 'count': 108}, ...]
-        return Response(cities_with_count)
+        return list(cities_with_count)
     
 
-class AreaListView(APIView):
+class AreaListView(CachedReferenceMixin, APIView):
     """
     API to list all unique Areas (Neighbourhoods) where APPROVED properties are available.
     (Used for /search filter dropdown)
+    DestinationListView ki tarah cached hai.
     """
     permission_classes = [permissions.AllowAny]
+    reference_name = reference.AREAS
 
 #    @extend_schema(responses=OpenApiResponse(response=[OpenApiTypes.STR]))
-    def get(self, request, format=None):
+    def build_reference(self):
         # Database se saare unique 'area' values nikalna
         areas = (
             Property.objects
@@ -329,7 +613,75 @@ class AreaListView(APIView):
             .distinct()
             .order_by('area')
         )
-        return Response(list(areas))
+        return list(areas)
+
+class PropertyFacetView(APIView):
+    """
+    Search page ke liye live counts (facets): amenities, certifications, views,
+    categories, cities, property types aur price buckets.
+    PropertyListView wale hi params (PropertyFilter + ?search=) leta hai, aur
+    saare counts kuch fixed GROUP BY queries se aate hain (properties/facets.py).
+
+    City, property type aur price ke counts mein unka apna filter nahi lagta,
+    taaki ?city=Jaipur chuna ho tab bhi baaki cities ke counts dikhen.
+    """
+    permission_classes = [permissions.AllowAny]
+    search_fields = PropertyListView.search_fields
+    # Counts ke liye relevance rank ki zarurat nahi
+    search_ranked = False
+
+    def filter_properties(self, filterset, skip=()):
+        """
+        Validated filters (skip wale chhod kar) aur ?search= approved properties par lagata hai.
+        """
+        queryset = Property.objects.filter(status=Property.PropertyStatus.APPROVED)
+        for name, value in filterset.form.cleaned_data.items():
+            if name not in skip:
+                queryset = filterset.filters[name].filter(queryset, value)
+        return PropertySearchFilter().filter_queryset(self.request, queryset, self)
+
+    def get(self, request, format=None):
+        # Filters ek hi baar validate hote hain, har dimension unhi cleaned values ko reuse karta hai
+        filterset = PropertyFilter(request.query_params, queryset=Property.objects.none(), request=request)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+
+        matching = self.filter_properties(filterset)
+        total, categories = facets.category_facets(matching)
+
+        data = {
+            'total': total,
+            **facets.tag_facets(matching),
+            'categories': categories,
+            'cities': facets.city_facets(self.filter_properties(filterset, skip=('city',))),
+            'property_types': facets.property_type_facets(
+                self.filter_properties(filterset, skip=('property_type',))
+            ),
+            'price_buckets': facets.price_facets(
+                self.filter_properties(filterset, skip=('min_price', 'max_price'))
+            ),
+        }
+        return Response(data)
+
+
+class AutocompleteView(APIView):
+    """
+    Search box ke suggestions: GET /properties/autocomplete/?q=jai&limit=8
+    Cities/states/areas (approved properties ki ginti ke saath) aur property titles -
+    process ke in-memory prefix index se (properties/autocomplete.py), DB query nahi.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    def get(self, request, *args, **kwargs):
+        text = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get('limit', autocomplete.DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({'limit': 'A valid integer is required.'})
+        limit = max(1, min(limit, autocomplete.MAX_LIMIT))
+        return Response({'query': text, 'results': autocomplete.index.suggest(text, limit)})
+
 
 class PropertyTypeListView(APIView):
     """
@@ -375,7 +727,7 @@ class AdminPropertyPerformanceReportView(APIView):
         return Response(serializer.data)
     
 
-class CertificationListView(generics.ListAPIView):
+class CertificationListView(CachedReferenceMixin, generics.ListAPIView):
     """
     API to list all available certifications.
     (Used for property forms and filters)
@@ -383,12 +735,14 @@ class CertificationListView(generics.ListAPIView):
     queryset = Certification.objects.all().order_by('name')
     serializer_class = SimpleCertificationSerializer
     permission_classes = [permissions.AllowAny]
+    reference_name = reference.CERTIFICATIONS
 
 
-class ViewTypeListView(generics.ListAPIView):
+class ViewTypeListView(CachedReferenceMixin, generics.ListAPIView):
     """
     API to list all available View Types (e.g., Beach View).
     """
     queryset = ViewType.objects.all().order_by('name')
     serializer_class = SimpleViewTypeSerializer
-    permission_classes = [permissions.AllowAny]
\ No newline at end of file
+    permission_classes = [permissions.AllowAny]
+    reference_name = reference.VIEW_TYPES
\ No newline at end of file
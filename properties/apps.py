@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class PropertiesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "properties"
+
+    def ready(self):
+        # Property ke signals (search index sync) register karein
+        from . import signals
+        post_migrate.connect(signals.create_search_index, sender=self)
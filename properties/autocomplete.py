@@ -0,0 +1,258 @@
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from .models import Property
+
+# Search box ka autocomplete: approved properties ke titles, cities, states aur areas par
+# process ke andar (in-memory) prefix index. Har naam ke har shabd ki shuruaat ek key hai
+# ('north goa' -> 'north goa', 'goa'), keys ek sorted array mein hain aur prefix lookup
+# bas do bisect hai - DB query nahi.
+#   - Places (city/state/area) ka wazan = kitni approved properties wahan hain
+#   - Titles ka wazan 1 hai, isliye woh places ke baad alphabetical kram mein aate hain
+# Index pehli query par DB se banta hai. Uske baad Property save/delete ke signals
+# (properties/signals.py) sirf us property ka farq lagate hain, aur shared cache mein
+# 'changed_at' badha dete hain; doosre processes agli query par updated_at >= apna sync time
+# wali properties dobara padh kar (aur delete log se) apna index incremental update karte hain.
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+
+CHANGED_KEY = 'properties:autocomplete:changed_at'
+DELETED_KEY = 'properties:autocomplete:deleted'
+# Delete log mein itni entries (purani hat jati hain)
+MAX_DELETED_LOG = 1000
+# Commit der se ho ya servers ki ghadi thodi alag ho - sync itna peeche se padhta hai
+SYNC_OVERLAP = timedelta(minutes=1)
+
+CITY, STATE, AREA, PROPERTY = 'city', 'state', 'area', 'property'
+
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize(text):
+    """
+    Lowercase, accents hata kar, sirf letters/digits aur single spaces.
+    """
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def word_keys(text):
+    """
+    Naam ke har shabd se shuru hone wala hissa: 'vaishali nagar' -> ['vaishali nagar', 'nagar']
+    """
+    words = normalize(text).split()
+    return {' '.join(words[start:]) for start in range(len(words))}
+
+
+class _SortedKeys:
+    """
+    (key, id) ka sorted array, do parallel lists mein (tuples se kam memory).
+    """
+
+    def __init__(self, pairs=()):
+        pairs = sorted(pairs)
+        self.keys = [key for key, _ in pairs]
+        self.ids = [item_id for _, item_id in pairs]
+
+    def add(self, key, item_id):
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.ids.insert(position, item_id)
+
+    def remove(self, key, item_id):
+        position = bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key:
+            if self.ids[position] == item_id:
+                del self.keys[position]
+                del self.ids[position]
+                return
+            position += 1
+
+    def matches(self, prefix):
+        """
+        Prefix se shuru hone wali keys ke ids, key ke kram mein (duplicates ho sakte hain).
+        """
+        position = bisect_left(self.keys, prefix)
+        keys, ids = self.keys, self.ids
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield ids[position]
+            position += 1
+
+
+def _listing(row):
+    """
+    Ek property ka index mein hissa: (title, slug, city, state, area) - approved na ho to None.
+    """
+    if row['status'] != Property.PropertyStatus.APPROVED:
+        return None
+    return (row['title'], str(row['slug']), row['city'], row['state'], row['area'])
+
+
+def _places(listing):
+    title, slug, city, state, area = listing
+    return [(CITY, city, state), (STATE, state, ''), (AREA, area, city)]
+
+
+ROW_FIELDS = ('id', 'status', 'title', 'slug', 'city', 'state', 'area')
+
+
+class AutocompleteIndex:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+
+    def _reset(self):
+        self._listings = {}       # property id -> listing
+        self._place_ids = {}      # (kind, name, parent) -> place id
+        self._places = []         # place id -> (kind, name, parent)
+        self._place_counts = []   # place id -> approved properties
+        self._place_keys = _SortedKeys()
+        self._title_keys = _SortedKeys()
+
+    # --- Building / sync ---
+
+    def _build(self):
+        self._reset()
+        self.synced_at = timezone.now()
+        rows = Property.objects.filter(status=Property.PropertyStatus.APPROVED).values(*ROW_FIELDS)
+        title_pairs = []
+        for row in rows.iterator(chunk_size=2000):
+            listing = _listing(row)
+            self._listings[row['id']] = listing
+            for place in _places(listing):
+                self._count_place(place, 1, index=False)
+            title_pairs.extend((key, row['id']) for key in word_keys(listing[0]))
+        self._title_keys = _SortedKeys(title_pairs)
+        self._place_keys = _SortedKeys(
+            (key, place_id)
+            for place_id, (kind, name, parent) in enumerate(self._places)
+            if self._place_counts[place_id]
+            for key in word_keys(name)
+        )
+        self._built = True
+
+    def _count_place(self, place, delta, index=True):
+        place_id = self._place_ids.get(place)
+        if place_id is None:
+            place_id = self._place_ids[place] = len(self._places)
+            self._places.append(place)
+            self._place_counts.append(0)
+        before = self._place_counts[place_id]
+        self._place_counts[place_id] = before + delta
+        if index and (before == 0) != (before + delta == 0):
+            # Place pehli baar aayi ya uski aakhri property gayi - tabhi keys badalti hain
+            for key in word_keys(place[1]):
+                if delta > 0:
+                    self._place_keys.add(key, place_id)
+                else:
+                    self._place_keys.remove(key, place_id)
+
+    def _apply(self, property_id, listing):
+        """
+        Ek property ki purani listing hata kar nayi lagata hai (sirf farq).
+        """
+        old = self._listings.pop(property_id, None)
+        if old == listing:
+            if listing is not None:
+                self._listings[property_id] = listing
+            return
+        if old is not None:
+            for place in _places(old):
+                self._count_place(place, -1)
+            for key in word_keys(old[0]):
+                self._title_keys.remove(key, property_id)
+        if listing is not None:
+            self._listings[property_id] = listing
+            for place in _places(listing):
+                self._count_place(place, 1)
+            for key in word_keys(listing[0]):
+                self._title_keys.add(key, property_id)
+
+    def _sync(self):
+        """
+        Doosre process ke badlaav: synced_at ke baad badli properties aur delete log.
+        """
+        since = self.synced_at - SYNC_OVERLAP
+        self.synced_at = timezone.now()
+        for row in Property.objects.filter(updated_at__gte=since).values(*ROW_FIELDS).iterator():
+            self._apply(row['id'], _listing(row))
+        for deleted_at, property_id in cache.get(DELETED_KEY) or ():
+            if deleted_at >= since:
+                self._apply(property_id, None)
+
+    def _ensure_fresh(self):
+        changed_at = cache.get(CHANGED_KEY)
+        if not self._built:
+            self._build()
+        elif changed_at is not None and changed_at > self.synced_at:
+            self._sync()
+
+    # --- Signals ke liye ---
+
+    def property_saved(self, instance):
+        with self._lock:
+            if self._built:
+                self._apply(instance.pk, _listing({field: getattr(instance, field) for field in ROW_FIELDS}))
+        mark_changed()
+
+    def property_deleted(self, property_id):
+        with self._lock:
+            if self._built:
+                self._apply(property_id, None)
+        log = [entry for entry in cache.get(DELETED_KEY) or () if entry[0] >= timezone.now() - timedelta(days=1)]
+        log.append((timezone.now(), property_id))
+        cache.set(DELETED_KEY, log[-MAX_DELETED_LOG:], None)
+        mark_changed()
+
+    # --- Query ---
+
+    def suggest(self, text, limit=DEFAULT_LIMIT):
+        """
+        [{'type': 'city', 'label': 'Jaipur, Rajasthan', 'value': 'Jaipur', 'count': 12}, ...,
+         {'type': 'property', 'label': title, 'slug': slug}]
+        Pehle places (zyada properties wale upar), fir bachi jagah mein property titles.
+        """
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        with self._lock:
+            self._ensure_fresh()
+
+            place_ids = set(self._place_keys.matches(prefix))
+            ranked = sorted(place_ids, key=lambda place_id: (-self._place_counts[place_id], self._places[place_id]))
+            results = []
+            for place_id in ranked[:limit]:
+                kind, name, parent = self._places[place_id]
+                results.append({
+                    'type': kind,
+                    'label': f'{name}, {parent}' if parent else name,
+                    'value': name,
+                    'count': self._place_counts[place_id],
+                })
+
+            seen = set()
+            for property_id in self._title_keys.matches(prefix):
+                if len(results) >= limit:
+                    break
+                if property_id not in seen:
+                    seen.add(property_id)
+                    title, slug = self._listings[property_id][:2]
+                    results.append({'type': PROPERTY, 'label': title, 'slug': slug})
+            return results
+
+
+def mark_changed():
+    """
+    Baaki processes ko batata hai ki unka index purana hai (jaise queryset.update() ke baad).
+    """
+    cache.set(CHANGED_KEY, timezone.now(), None)
+
+
+index = AutocompleteIndex()
@@ -0,0 +1,103 @@
+import uuid
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from dateutil.relativedelta import relativedelta
+from bookings.models import BookedNight
+from .models import BlackoutDate
+from .pricing import night_prices
+
+# Property ka mahine bhar ka availability calendar (/properties/<slug>/calendar/?month=).
+# Do indexed queries - mahine ki booked nights (BookedNight) aur blackout dates, dono
+# (property, date) unique index par date ke kram mein - fir ek hi sweep mein har raat ka status.
+# Status property-month par cache hota hai. Key mein property ka calendar version hai;
+# booking ya blackout date badalte hi (commit ke baad) version badal jata hai, isliye
+# purani entries apne aap bekaar ho jati hain. Daam (properties/pricing.py) aur 'past'
+# har request par lagte hain - woh guests aur aaj ki date par tikte hain.
+
+AVAILABLE, BOOKED, BLOCKED, PAST = 'available', 'booked', 'blocked', 'past'
+
+# Version miss ho jaye to bhi (jaise cache restart) entry itni der se purani nahi hogi
+CALENDAR_TIMEOUT = 60 * 60 * 24
+
+VERSION_PREFIX = 'properties:calendar:version:'
+KEY_PREFIX = 'properties:calendar:'
+
+
+def _version_key(property_id):
+    return f'{VERSION_PREFIX}{property_id}'
+
+
+def bump_versions(property_ids):
+    """
+    In properties ke cached calendars bekaar (commit ke baad, taaki beech mein koi
+    purana data naye version par na likh de).
+    """
+    keys = [_version_key(property_id) for property_id in set(property_ids)]
+    if keys:
+        transaction.on_commit(lambda: cache.set_many({key: uuid.uuid4().hex for key in keys}, None))
+
+
+def sweep(property_id, start, end):
+    """
+    [start, end) ki har raat ka status: AVAILABLE, BOOKED (pending/confirmed booking) ya
+    BLOCKED (vendor ki blackout date; booking se upar).
+    """
+    booked = (
+        BookedNight.objects.filter(property_id=property_id, date__gte=start, date__lt=end)
+        .order_by('date')
+        .values_list('date', flat=True)
+    )
+    blackouts = (
+        BlackoutDate.objects.filter(property_id=property_id, date__gte=start, date__lt=end)
+        .order_by('date')
+        .values_list('date', flat=True)
+    )
+
+    booked, blackouts = iter(booked), iter(blackouts)
+    booked_night, blackout = next(booked, None), next(blackouts, None)
+    statuses = []
+    night = start
+    while night < end:
+        status = AVAILABLE
+        if booked_night == night:
+            status = BOOKED
+            booked_night = next(booked, None)
+        if blackout == night:
+            status = BLOCKED
+            blackout = next(blackouts, None)
+        statuses.append(status)
+        night += timedelta(days=1)
+    return statuses
+
+
+def month_statuses(property_id, month):
+    """
+    Mahine (pehli tareekh) ki raaton ke status - cache se, na ho to sweep.
+    """
+    version = cache.get(_version_key(property_id))
+    if version is None:
+        version = uuid.uuid4().hex
+        # Kisi aur ne beech mein set kar diya ho to wahi lein
+        if not cache.add(_version_key(property_id), version, None):
+            version = cache.get(_version_key(property_id), version)
+
+    key = f'{KEY_PREFIX}{property_id}:{version}:{month:%Y-%m}'
+    statuses = cache.get(key)
+    if statuses is None:
+        statuses = sweep(property_id, month, month + relativedelta(months=1))
+        cache.set(key, statuses, CALENDAR_TIMEOUT)
+    return statuses
+
+
+def calendar(property_id, rates, month, guests, today):
+    """
+    [{'date', 'status', 'price'}, ...] - aaj se pehle ki raatein PAST.
+    """
+    end = month + relativedelta(months=1)
+    statuses = month_statuses(property_id, month)
+    prices = night_prices({property_id: rates}, month, end, guests)[property_id]
+    return [
+        {'date': night, 'status': PAST if night < today else night_status, 'price': price}
+        for night_status, (night, price, _) in zip(statuses, prices)
+    ]
@@ -0,0 +1,76 @@
+import hashlib
+from django.core.cache import cache
+from django.utils import timezone
+from .models import RATING_STARS, Property
+
+# PropertyDetailView ka conditional GET + response cache.
+# Version = updated_at + review stats (count, sum, 1-5 histogram). Property save, image
+# badalna aur review ka aana/jaana/edit - sab inme se kuch na kuch badal dete hain
+# (images aur har review create/edit/delete par signals 'touch_properties' chalate hain -
+# stats same reh kar bhi 'latest reviews' badal sakte hain).
+# Owner ki profile (OWNER_FIELDS), category aur amenity/certification/view ka naam badalne
+# par bhi signals unki properties ko 'touch_related' se touch karte hain.
+# Payload ka user-independent hissa (version, host) key par cache hota hai; 'is_in_wishlist'
+# har request par alag se lagta hai.
+
+DETAIL_TIMEOUT = 60 * 60
+
+KEY_PREFIX = 'properties:detail:'
+
+VERSION_FIELDS = (
+    'id', 'updated_at', 'rating_count', 'rating_sum',
+    *(f'rating_{star}_count' for star in RATING_STARS),
+)
+
+# Owner (CustomUser) ki woh fields jo detail payload mein dikhti hain (UserProfileSerializer)
+OWNER_FIELDS = frozenset({
+    'slug', 'email', 'first_name', 'last_name', 'phone_number', 'role', 'status',
+    'profile_picture', 'profile_picture_derivatives',
+    'notify_new_bookings', 'new_booking_email_mode', 'notify_guest_messages', 'notify_cancellations',
+    'notify_booking_confirmations', 'notify_promotional_offers', 'notify_account_activity',
+})
+
+
+def detail_version(row):
+    """
+    VERSION_FIELDS wali row se version string (pehli do fields id aur updated_at hain).
+    """
+    property_id, updated_at, *stats = row
+    return ':'.join([str(property_id), updated_at.isoformat(), *map(str, stats)])
+
+
+def detail_etag(version, base_url, in_wishlist):
+    """
+    Poore response (wishlist bit ke saath) ka strong ETag.
+    """
+    raw = f'{version}|{base_url}|{int(in_wishlist)}'
+    return '"%s"' % hashlib.sha1(raw.encode()).hexdigest()
+
+
+def get_detail_payload(version, base_url, build):
+    """
+    Cache se user-independent payload; na ho to build() se bana kar rakhta hai.
+    Image URLs absolute hain, isliye host (base_url) bhi key ka hissa hai.
+    """
+    key = KEY_PREFIX + hashlib.sha1(f'{version}|{base_url}'.encode()).hexdigest()
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, DETAIL_TIMEOUT)
+    return payload
+
+
+def touch_properties(property_ids):
+    """
+    Properties ka updated_at aage badhata hai (detail version badal jata hai).
+    Un badlaavon ke liye jo Property.save() se nahi guzarte.
+    """
+    Property.objects.filter(pk__in=list(property_ids)).update(updated_at=timezone.now())
+
+
+def touch_related(**lookup):
+    """
+    Lookup se mili saari properties touch karta hai, e.g. touch_related(owner_id=5),
+    touch_related(amenities=3). Ek hi UPDATE - ids Python mein nahi aate.
+    """
+    Property.objects.filter(**lookup).update(updated_at=timezone.now())
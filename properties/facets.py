@@ -0,0 +1,100 @@
+from django.db.models import Count, Q
+from .models import Property
+
+# Search page ke filters ke saath 'kitni properties milengi' wale counts (facets).
+# Har dimension ek GROUP BY query hai, isliye queries ki ginti fixed hai (7),
+# chahe kitni bhi amenities/cities hon. 'queryset' hamesha filter ho chuka Property
+# queryset hota hai, aur yahaan woh 'id IN (...)' subquery ban kar jata hai.
+
+# Price buckets (base_price): (min, max) - max None ka matlab 'isse upar'
+PRICE_BUCKETS = [
+    (0, 5000),
+    (5000, 10000),
+    (10000, 20000),
+    (20000, 50000),
+    (50000, None),
+]
+
+
+def _tag_counts(field_name, queryset):
+    """
+    M2M tag (amenity/certification/view) -> kitni filtered properties par laga hai.
+    Jis tag ki ginti 0 hai woh list mein nahi aata.
+    """
+    field = Property._meta.get_field(field_name)
+    # Tag model se Property tak ka naam ('property' ya related_name jaise 'properties')
+    related = field.related_query_name()
+    return list(
+        field.related_model.objects
+        .filter(**{f'{related}__in': queryset.values('id')})
+        .values('id', 'name')
+        .annotate(count=Count(related))
+        .order_by('-count', 'name')
+    )
+
+
+def tag_facets(queryset):
+    return {
+        'amenities': _tag_counts('amenities', queryset),
+        'certifications': _tag_counts('certifications', queryset),
+        'views': _tag_counts('views', queryset),
+    }
+
+
+def category_facets(queryset):
+    """
+    Category ke counts aur 'total' (bina category wali properties bhi total mein gini jati hain).
+    """
+    rows = (
+        queryset
+        .values('category_id', 'category__name')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'category__name')
+    )
+    total, categories = 0, []
+    for row in rows:
+        total += row['count']
+        if row['category_id'] is not None:
+            categories.append({'id': row['category_id'], 'name': row['category__name'], 'count': row['count']})
+    return total, categories
+
+
+def city_facets(queryset):
+    return list(
+        queryset
+        .values('city', 'state')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'city')
+    )
+
+
+def property_type_facets(queryset):
+    counts = dict(
+        queryset
+        .order_by()
+        .values_list('property_type')
+        .annotate(count=Count('id'))
+    )
+    # Sab types dikhayein (0 count ke saath bhi), PropertyTypeListView wale order mein
+    return [
+        {'value': value, 'label': label, 'count': counts.get(value, 0)}
+        for value, label in Property.PropertyType.choices
+    ]
+
+
+def price_facets(queryset):
+    """
+    Saare price buckets ek hi aggregate query mein (har bucket ek filtered COUNT).
+    """
+    aggregates = {}
+    for index, (low, high) in enumerate(PRICE_BUCKETS):
+        condition = Q(base_price__gte=low)
+        if high is not None:
+            condition &= Q(base_price__lt=high)
+        aggregates[f'bucket_{index}'] = Count('id', filter=condition)
+
+    counts = queryset.order_by().aggregate(**aggregates)
+    return [
+        {'min': low, 'max': high, 'count': counts[f'bucket_{index}']}
+        for index, (low, high) in enumerate(PRICE_BUCKETS)
+    ]
@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class SearchDocumentField(models.TextField):
+    """
+    Full-text index ka document column (SQLite FTS5 row / Postgres tsvector).
+    Is par sirf '__match' lookup ka matlab hai, value ko kabhi padha nahi jata.
+    """
+
+
+@SearchDocumentField.register_lookup
+class FullTextMatch(models.Lookup):
+    """
+    document__match='<query>' -> full-text match (query properties/search.py banata hai)
+    """
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        # Postgres: tsvector @@ tsquery (GIN index)
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} @@ to_tsquery('simple', {rhs})", lhs_params + rhs_params
+
+    def as_sqlite(self, compiler, connection):
+        # FTS5 mein MATCH poori table (hidden column jiska naam table jaisa hai) par lagta hai
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{compiler.quote_name_unless_alias(self.lhs.alias)} MATCH {rhs}", rhs_params
@@ -1,7 +1,48 @@
 import django_filters
+from datetime import timedelta
+from django import forms
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import filters
 from .models import *
+from . import geo, search, tags
+from bookings.models import BookedNight
 from django.db.models import Avg
 
+
+class PropertyFilterForm(forms.Form):
+    """
+    PropertyFilter ka form: check_in/check_out ki aapas mein validation.
+    """
+
+    def clean(self):
+        cleaned_data = super().clean()
+        check_in = cleaned_data.get('check_in')
+        check_out = cleaned_data.get('check_out')
+        if check_in and check_out and check_out <= check_in:
+            raise forms.ValidationError({'check_out': "check-out date must be after check-in date."})
+
+        lat, lng = cleaned_data.get('lat'), cleaned_data.get('lng')
+        if (lat is None) != (lng is None):
+            raise forms.ValidationError("lat and lng must be given together.")
+        if cleaned_data.get('radius_km') is not None and lat is None:
+            raise forms.ValidationError({'radius_km': "radius_km needs lat and lng."})
+
+        bbox = cleaned_data.get('bbox')
+        if bbox:
+            if len(bbox) != 4:
+                raise forms.ValidationError({'bbox': "bbox must be min_lat,min_lng,max_lat,max_lng."})
+            min_lat, min_lng, max_lat, max_lng = bbox
+            if min_lat > max_lat or min_lng > max_lng:
+                raise forms.ValidationError({'bbox': "bbox minimums must not exceed maximums."})
+        return cleaned_data
+
+
+class NumberCSVFilter(django_filters.BaseCSVFilter, django_filters.NumberFilter):
+    """
+    Comma se alag numbers (jaise ?bbox=26.8,75.7,27.0,75.9).
+    """
+
+
 class PropertyFilter(django_filters.FilterSet):
     """
     Property ke liye custom filters.
@@ -39,6 +80,7 @@ class PropertyFilter(django_filters.FilterSet):
     # ?amenities=1&amenities=3 (Wi-Fi aur Pool dono chahiye)
     amenities = django_filters.ModelMultipleChoiceFilter(
         field_name='amenities__name', # Naam se filter karein
+        method='filter_all_tags',
         to_field_name='name',
         queryset=Amenity.objects.all(),
         conjoined=True, # 'conjoined=True' ka matlab 'AND' hai (sari amenities honi chahiye)
@@ -46,6 +88,7 @@ class PropertyFilter(django_filters.FilterSet):
 
     certifications = django_filters.ModelMultipleChoiceFilter(
         field_name='certifications__name',
+        method='filter_all_tags',
         to_field_name='name',
         queryset=Certification.objects.all(),
         conjoined=True,
@@ -53,12 +96,143 @@ class PropertyFilter(django_filters.FilterSet):
 
     views = django_filters.ModelMultipleChoiceFilter(
         field_name='views__name',
+        method='filter_all_tags',
         to_field_name='name',
         queryset=ViewType.objects.all(),
         conjoined=True,
     )
 
+    # 7. Availability (तारीखें)
+    # ?check_in=2025-12-20&check_out=2025-12-23
+    # In raaton mein jo properties booked (pending/confirmed) ya blackout hain, woh hat jati hain.
+    # Sirf ek date di ho to ek raat maani jati hai.
+    check_in = django_filters.DateFilter(method='filter_available')
+    check_out = django_filters.DateFilter(method='filter_available')
+
+    # 8. Location (दूरी)
+    # ?lat=26.91&lng=75.78&radius_km=10 -> itne km ke andar, 'distance' (km) ke saath
+    # radius_km na diya ho to DEFAULT_RADIUS_KM. '?ordering=distance' se paas wali pehle.
+    lat = django_filters.NumberFilter(method='filter_near', min_value=-90, max_value=90)
+    lng = django_filters.NumberFilter(method='filter_near', min_value=-180, max_value=180)
+    radius_km = django_filters.NumberFilter(method='filter_near', min_value=0, max_value=500)
+
+    # ?bbox=min_lat,min_lng,max_lat,max_lng (map ka dikh raha hissa)
+    bbox = NumberCSVFilter(method='filter_bbox')
+
+    DEFAULT_RADIUS_KM = 25
+
     class Meta:
         model = Property
+        form = PropertyFilterForm
         # 'fields' list batati hai ki filterset ko kin fields par kaam karna hai
-        fields = ['city', 'property_type', 'guests', 'min_price', 'max_price', 'amenities','area', 'min_rating', 'certifications', 'views']
\ No newline at end of file
+        fields = ['city', 'property_type', 'guests', 'min_price', 'max_price', 'amenities','area', 'min_rating', 'certifications', 'views', 'check_in', 'check_out', 'lat', 'lng', 'radius_km', 'bbox']
+
+    def filter_available(self, queryset, name, value):
+        """
+        check_in aur check_out dono ek hi filter hain, isliye yeh sirf ek baar lagta hai.
+        Occupied raatein BookedNight (occupancy index) aur BlackoutDate se aati hain - dono
+        date range par index seek hain, aur poora filter ek hi SQL query ke andar rehta hai
+        (NOT IN subqueries, har property ke liye alag query nahi).
+        """
+        check_in = self.form.cleaned_data.get('check_in')
+        check_out = self.form.cleaned_data.get('check_out')
+        if name == 'check_out' and check_in:
+            # check_in wale call mein pehle hi lag chuka hai
+            return queryset
+        if check_in is None:
+            check_in = check_out - timedelta(days=1)
+        if check_out is None:
+            check_out = check_in + timedelta(days=1)
+
+        nights = {'date__gte': check_in, 'date__lt': check_out}
+        return queryset.exclude(
+            id__in=BookedNight.objects.filter(**nights).values('property_id')
+        ).exclude(
+            id__in=BlackoutDate.objects.filter(**nights).values('property_id')
+        )
+
+    def filter_all_tags(self, queryset, name, value):
+        """
+        amenities/certifications/views: saare chune hue tags chahiye (AND).
+        Har tag ke liye M2M join ki jagah Property ke bitmask par ek bitwise check (properties/tags.py).
+        """
+        # 'name' yahaan filter ki field_name hai, jaise 'amenities__name'
+        return tags.filter_has_all(queryset, name.split('__')[0], [tag.pk for tag in value])
+
+    def filter_near(self, queryset, name, value):
+        """
+        lat/lng/radius_km teeno ek hi filter hain (sirf 'lat' wale call mein lagta hai).
+        Geohash cells se candidates, fir unhi par haversine (properties/geo.py).
+        """
+        if name != 'lat':
+            return queryset
+        radius_km = self.form.cleaned_data.get('radius_km')
+        if radius_km is None:
+            radius_km = self.DEFAULT_RADIUS_KM
+        return geo.within_radius(
+            queryset, float(value), float(self.form.cleaned_data['lng']), float(radius_km)
+        )
+
+    def filter_bbox(self, queryset, name, value):
+        return geo.within_box(queryset, *(float(edge) for edge in value))
+
+
+class PropertyOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter jo annotation wali ordering (jaise 'distance') tabhi lagata hai
+    jab woh queryset par maujood ho (yaani ?lat=&lng= diye gaye hon).
+    """
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        valid = super().remove_invalid_fields(queryset, fields, view, request)
+        return [term for term in valid if is_orderable(queryset, term.lstrip('-'))]
+
+
+def is_orderable(queryset, field):
+    """
+    Kya queryset is field (model field ya annotation) se sort ho sakta hai?
+    """
+    if field in queryset.query.annotations:
+        return True
+    try:
+        queryset.model._meta.get_field(field)
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+class PropertySearchFilter(filters.SearchFilter):
+    """
+    '?search=' ko full-text index (properties/search.py) se chalata hai.
+    Har shabd prefix match hota hai, aur results 'search_rank' (relevance) ke saath aate hain.
+    Agar DB par index nahi hai to purana icontains (LIKE) wala SearchFilter hi chalta hai.
+    View par 'search_ranked = False' ho to sirf filter lagta hai, rank nahi (counts/facets ke liye).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = ' '.join(self.get_search_terms(request))
+        if text and search.index_available():
+            if getattr(view, 'search_ranked', True):
+                results = search.search_properties(queryset, text)
+            else:
+                results = search.filter_matches(queryset, text)
+            if results is not None:
+                return results
+        return super().filter_queryset(request, queryset, view)
+
+
+class AdminPropertyBulkFilter(django_filters.FilterSet):
+    """
+    Admin bulk approve/reject ka 'filter' (properties/moderation.py).
+    Jaise {"status": "pending", "city": "Jaipur", "created_before": "2025-01-31"}
+    """
+    status = django_filters.ChoiceFilter(choices=Property.PropertyStatus.choices)
+    city = django_filters.CharFilter(lookup_expr='iexact')
+    state = django_filters.CharFilter(lookup_expr='iexact')
+    owner = django_filters.CharFilter(field_name='owner__slug')
+    created_after = django_filters.DateFilter(field_name='created_at', lookup_expr='date__gte')
+    created_before = django_filters.DateFilter(field_name='created_at', lookup_expr='date__lte')
+
+    class Meta:
+        model = Property
+        fields = ['status', 'city', 'state', 'owner', 'created_after', 'created_before']
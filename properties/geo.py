@@ -0,0 +1,174 @@
+import math
+import re
+from urllib.parse import parse_qs, unquote, urlparse
+from django.db.models import ExpressionWrapper, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+# Location helpers (bina GIS extension ke, plain SQLite par bhi chalte hain).
+#   - google_maps_location URL se (latitude, longitude) nikalna
+#   - geohash: lat/lng ko ek string mein badalna jiska prefix ek grid cell hai.
+#     Paas-paas ki jagahon ka prefix same hota hai, isliye 'is area mein kaun hai'
+#     sirf kuch geohash ranges ka index seek ban jata hai (har row par haversine nahi).
+
+EARTH_RADIUS_KM = 6371.0088
+
+GEOHASH_PRECISION = 9  # ~5m x 5m cell
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Ek search area ko zyada se zyada kitne geohash cells se dhakein
+MAX_COVER_CELLS = 16
+
+# Maps URL mein coordinates in jagahon par milte hain (pehle wale zyada bharosemand)
+_PIN_PATTERN = re.compile(r'!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)')
+_AT_PATTERN = re.compile(r'@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)')
+_PAIR_PATTERN = re.compile(r'(-?\d{1,2}\.\d+)\s*,\s*(-?\d{1,3}\.\d+)')
+_QUERY_KEYS = ('q', 'query', 'll', 'center', 'destination', 'daddr')
+
+
+def _valid(lat, lng):
+    lat, lng = float(lat), float(lng)
+    if -90 <= lat <= 90 and -180 <= lng <= 180:
+        return lat, lng
+    return None
+
+
+def parse_maps_location(url):
+    """
+    Google Maps URL se (lat, lng) nikalta hai, na mile to None.
+    Jaise: .../place/.../@26.9124,75.7873,15z/...!3d26.91!4d75.78  ya  ...?q=26.9124,75.7873
+    (maps.app.goo.gl jaise short links mein coordinates nahi hote - unke liye None)
+    """
+    if not url:
+        return None
+    url = unquote(url)
+
+    match = _PIN_PATTERN.search(url)
+    if match:
+        return _valid(*match.groups())
+
+    params = parse_qs(urlparse(url).query)
+    for key in _QUERY_KEYS:
+        for value in params.get(key, []):
+            match = _PAIR_PATTERN.fullmatch(value.strip())
+            if match:
+                return _valid(*match.groups())
+
+    for pattern in (_AT_PATTERN, _PAIR_PATTERN):
+        match = pattern.search(url)
+        if match:
+            return _valid(*match.groups())
+    return None
+
+
+def _cell_size(precision):
+    """
+    Is precision ke geohash cell ki (height, width) degrees mein.
+    """
+    bits = precision * 5
+    lng_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def encode_geohash(lat, lng, precision=GEOHASH_PRECISION):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bit, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        # Bits baari-baari se longitude aur latitude ko aadha karte hain
+        span, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        middle = (span[0] + span[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            span[0] = middle
+        else:
+            span[1] = middle
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bit, value = 0, 0
+    return ''.join(chars)
+
+
+def cover_cells(min_lat, min_lng, max_lat, max_lng, max_cells=MAX_COVER_CELLS):
+    """
+    Bounding box ko dhakne wale geohash prefixes (sabse bareek precision jisme
+    max_cells se zyada cells na hon). Antimeridian (180°) paar karne wale box support nahi hain.
+    """
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    min_lng, max_lng = max(min_lng, -180.0), min(max_lng, 180.0)
+
+    cells = None
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        height, width = _cell_size(precision)
+        rows = range(int((min_lat + 90) // height), int((max_lat + 90) // height) + 1)
+        columns = range(int((min_lng + 180) // width), int((max_lng + 180) // width) + 1)
+        if len(rows) * len(columns) > max_cells:
+            break
+        # Har cell ke center ka geohash hi us cell ka prefix hai
+        cells = {
+            encode_geohash(-90 + (row + 0.5) * height, -180 + (column + 0.5) * width, precision)
+            for row in rows for column in columns
+        }
+    # Box itna bada hai ki pehli precision par bhi zyada cells hain - poori duniya
+    return cells if cells is not None else {''}
+
+
+def bounding_box(lat, lng, radius_km):
+    """
+    (lat, lng) ke aas-paas radius_km wale circle ka bounding box:
+    (min_lat, min_lng, max_lat, max_lng)
+    """
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    # Pole ke paas longitude ke degree chhote ho jate hain
+    cos_lat = math.cos(math.radians(lat))
+    lng_delta = 180.0 if cos_lat < 1e-6 else min(180.0, lat_delta / cos_lat)
+    return lat - lat_delta, lng - lng_delta, lat + lat_delta, lng + lng_delta
+
+
+# --- Queryset helpers (Property ki latitude/longitude/geohash fields par) ---
+
+def within_box(queryset, min_lat, min_lng, max_lat, max_lng):
+    """
+    Bounding box ke andar ki properties. Pehle geohash ranges (index seek) se
+    candidates chhant-te hain, fir lat/lng ki exact seema lagti hai.
+    """
+    cells = Q()
+    for cell in cover_cells(min_lat, min_lng, max_lat, max_lng):
+        # 'startswith' SQLite par case-insensitive LIKE banta hai jo index use nahi karta,
+        # isliye prefix ko range (cell <= geohash < cell + '~') mein likhte hain
+        cells |= Q(geohash__gte=cell, geohash__lt=cell + '~')
+    return queryset.filter(
+        cells,
+        latitude__gte=min_lat, latitude__lte=max_lat,
+        longitude__gte=min_lng, longitude__lte=max_lng,
+    )
+
+
+def distance_km(lat, lng):
+    """
+    (lat, lng) se property tak ki doori (km) - haversine formula ka SQL expression.
+    SQLite par yeh functions Django khud register karta hai, koi extension nahi chahiye.
+    """
+    lat_rad, lng_rad = math.radians(lat), math.radians(lng)
+    half_dlat = (Radians('latitude') - Value(lat_rad)) / 2
+    half_dlng = (Radians('longitude') - Value(lng_rad)) / 2
+    a = (
+        Power(Sin(half_dlat), 2) +
+        Value(math.cos(lat_rad)) * Cos(Radians('latitude')) * Power(Sin(half_dlng), 2)
+    )
+    return ExpressionWrapper(
+        # Float rounding se sqrt 1 se zara upar na jaye (asin ka domain)
+        Value(2 * EARTH_RADIUS_KM) * ASin(Least(Sqrt(a), Value(1.0))),
+        output_field=FloatField(),
+    )
+
+
+def within_radius(queryset, lat, lng, radius_km):
+    """
+    radius_km ke andar ki properties, 'distance' (km) annotation ke saath.
+    Haversine sirf box ke candidates par chalta hai, poori table par nahi.
+    """
+    queryset = within_box(queryset, *bounding_box(lat, lng, radius_km))
+    return queryset.annotate(distance=distance_km(lat, lng)).filter(distance__lte=radius_km)
@@ -0,0 +1,212 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+
+# Uploaded images (PropertyImage.image, CustomUser.profile_picture) ke chhote derivatives.
+# Har width (DERIVATIVE_WIDTHS) ki ek JPEG aur ek WebP file banti hai, original ke paas
+# 'derived/' folder mein: property_images/abc.jpeg -> property_images/derived/abc_320.jpg / .webp
+# Kaam request ke bahar hota hai - post_save signal transaction commit hone par
+# image ko worker pool (threads; Pillow resize/encode ke dauran GIL chhod deta hai) mein daal deta hai.
+# Ban jane par paths model ke JSON column mein likhe jate hain (serializers wahin se
+# 'srcset' banate hain). Jab tak nahi bane, serializers original URL hi dete hain.
+# Purani images ke liye 'generate_image_derivatives' command hai.
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_WIDTHS = (320, 768, 1600)
+
+# Format -> (extension, Pillow save options)
+FORMATS = {
+    'jpeg': ('jpg', {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True}),
+    'webp': ('webp', {'format': 'WEBP', 'quality': 80, 'method': 4}),
+}
+
+# Card ki main image ke liye kaunsi width (phone/laptop dono par card itna hi bada hai)
+CARD_WIDTH = 768
+# Review ke saath user ki chhoti photo
+AVATAR_WIDTH = 320
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2),
+            thread_name_prefix='image-derivatives',
+        )
+    return _executor
+
+
+def derivative_name(name, width, extension):
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'derived', f'{stem}_{width}.{extension}')
+
+
+def target_widths(original_width):
+    """
+    Original se badi width nahi banate (upscale bekaar hai); original sabse chhoti
+    width se bhi chhota ho to uski apni width ka ek derivative.
+    """
+    widths = [width for width in DERIVATIVE_WIDTHS if width < original_width]
+    return widths or [original_width]
+
+
+def _save(name, content):
+    # Storage naam badal na de (abc_320_x7Yz.jpg) - deterministic path chahiye
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(content))
+
+
+def render_derivatives(name):
+    """
+    Storage ki ek image se saare derivatives banata hai. Return:
+    {'source': name, 'width': original width, 'jpeg': {'320': path, ...}, 'webp': {...}}
+    """
+    with default_storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        # Phone ki photos mein rotation EXIF mein hota hai
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    result = {'source': name, 'width': image.width}
+    for format_name in FORMATS:
+        result[format_name] = {}
+
+    for width in target_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+        for format_name, (extension, options) in FORMATS.items():
+            frame = resized
+            if format_name == 'jpeg' and has_alpha:
+                # JPEG mein transparency nahi hoti - safed background par
+                frame = Image.new('RGB', resized.size, (255, 255, 255))
+                frame.paste(resized, mask=resized.getchannel('A'))
+            buffer = BytesIO()
+            frame.save(buffer, **options)
+            result[format_name][str(width)] = _save(
+                derivative_name(name, width, extension), buffer.getvalue()
+            )
+    return result
+
+
+def generate(model_label, pk, field_name, derivatives_field):
+    """
+    Ek object ki image ke derivatives banakar uske JSON column mein likhta hai - queryset
+    update() se, pk + source file naam par. Beech mein image badal gayi ho to kuch nahi
+    likhta (nayi image ka kaam alag se aayega). Models ke full save() JSON DB se taaza
+    lete hain, isliye purana instance ise mita nahi sakta.
+    """
+    model = apps.get_model(model_label)
+    name = model.objects.filter(pk=pk).values_list(field_name, flat=True).first()
+    if not name:
+        return None
+
+    derivatives = render_derivatives(name)
+    updated = model.objects.filter(pk=pk, **{field_name: name}).update(**{derivatives_field: derivatives})
+    if updated and model_label == 'properties.PropertyImage':
+        from .detail import touch_properties
+        # Detail page ka cached payload naye srcset ke saath dobara bane
+        touch_properties(model.objects.filter(pk=pk).values_list('property_id', flat=True))
+    elif updated and model_label == 'users.CustomUser':
+        from .detail import touch_related
+        # Owner ka srcset bhi detail payload mein hai
+        touch_related(owner_id=pk)
+    return derivatives if updated else None
+
+
+def _run(model_label, pk, field_name, derivatives_field):
+    try:
+        generate(model_label, pk, field_name, derivatives_field)
+    except Exception:
+        logger.exception('Image derivatives failed for %s #%s', model_label, pk)
+    finally:
+        # Worker thread ka apna DB connection hai, use khula na chhodein
+        connections.close_all()
+
+
+def loaded_name(instance, field_name):
+    """
+    from_db ke waqt file field ka naam (models isse '_loaded_<field>' mein rakhte hain).
+    Field deferred ho to None.
+    """
+    if field_name not in instance.__dict__:
+        return None
+    value = instance.__dict__[field_name]
+    return getattr(value, 'name', value) or ''
+
+
+def schedule(instance, field_name, derivatives_field):
+    """
+    Image nayi/badli hai to commit ke baad derivatives ka kaam worker pool ko.
+    (Signals se bulaya jata hai) Sirf tab jab is save mein file field sach mein badla -
+    baaki har save par nahi; chhoote hue kaam 'generate_image_derivatives' command pakadti hai.
+    """
+    name = getattr(instance, field_name).name
+    loaded_attr = f'_loaded_{field_name}'
+    loaded = getattr(instance, loaded_attr, None)
+    if loaded is not None:
+        changed = loaded != name
+    else:
+        # Naya ya bina from_db ka instance - JSON se hi pata chalega
+        changed = (getattr(instance, derivatives_field) or {}).get('source') != name
+    # Agle save ke liye yahi 'purana' naam hai
+    setattr(instance, loaded_attr, name or '')
+    if not name or not changed:
+        return
+    job = (instance._meta.label, instance.pk, field_name, derivatives_field)
+    transaction.on_commit(lambda: get_executor().submit(_run, *job))
+
+
+# --- Serializers ke liye ---
+
+def _absolute(request, path):
+    url = default_storage.url(path)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def _current(file_field, derivatives):
+    # Image badal chuki hai aur naye derivatives abhi bane nahi - purane kaam ke nahi
+    if file_field and derivatives and derivatives.get('source') == file_field.name:
+        return derivatives
+    return None
+
+
+def build_srcset(request, file_field, derivatives):
+    """
+    {'jpeg': {'320': url, '768': url, ...}, 'webp': {...}} - abhi tak nahi bane to None.
+    """
+    derivatives = _current(file_field, derivatives)
+    if not derivatives:
+        return None
+    return {
+        format_name: {width: _absolute(request, path) for width, path in derivatives.get(format_name, {}).items()}
+        for format_name in FORMATS
+    }
+
+
+def best_url(request, file_field, derivatives, width):
+    """
+    'width' tak ka sabse bada JPEG derivative (na ho to sabse chhota), warna original URL.
+    """
+    if not file_field:
+        return None
+    sizes = (_current(file_field, derivatives) or {}).get('jpeg')
+    if not sizes:
+        return _absolute(request, file_field.name)
+    widths = sorted(int(size) for size in sizes)
+    chosen = max((size for size in widths if size <= width), default=widths[0])
+    return _absolute(request, sizes[str(chosen)])
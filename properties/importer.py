@@ -0,0 +1,158 @@
+import csv
+import io
+import json
+import os
+import re
+from django.db import DatabaseError, transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+from . import search, tags
+from .models import Amenity, Certification, Property, ViewType
+from .serializers import PropertyImportRowSerializer
+
+# Vendor ki properties ka bulk import (CSV ya JSONL file se).
+# Har row PropertyImportRowSerializer (PropertyCreateSerializer ke rules) se validate hoti hai;
+# sahi rows BATCH_SIZE ke batches mein bulk_create hoti hain aur unke M2M rows bhi har field
+# ke liye ek bulk_create - per-property .set() nahi. File stream karke padhi jati hai aur
+# memory mein ek batch se zyada kuch nahi rehta, isliye hazaron rows bhi chal jati hain.
+# Har row ka result (created/error) file ke kram mein yield hota hai.
+
+BATCH_SIZE = 500
+
+FORMATS = ('csv', 'jsonl')
+
+M2M_FIELDS = ('amenities', 'certifications', 'views')
+
+# CSV cell mein kai IDs: "1;4;7" (ya "1,4,7" quotes ke andar)
+_LIST_SEPARATOR = re.compile(r'[;,]')
+
+
+def detect_format(filename):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    return None
+
+
+def _csv_rows(text):
+    reader = csv.DictReader(text)
+    for row in reader:
+        # Khaali cell = field diya hi nahi (optional fields default lein, required par error)
+        data = {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+        for field_name in M2M_FIELDS:
+            if field_name in data:
+                data[field_name] = [item.strip() for item in _LIST_SEPARATOR.split(data[field_name]) if item.strip()]
+        yield reader.line_num, data
+
+
+def _jsonl_rows(text):
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as error:
+            yield line_number, {'__error__': f'Invalid JSON: {error}'}
+            continue
+        if not isinstance(data, dict):
+            data = {'__error__': 'Each line must be a JSON object.'}
+        yield line_number, data
+
+
+def read_rows(stream, format):
+    """
+    Binary stream se (row number, data) - ek baar mein ek row.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='' if format == 'csv' else None)
+    return _csv_rows(text) if format == 'csv' else _jsonl_rows(text)
+
+
+def known_tag_ids():
+    """
+    Teeno tag tables ki saari IDs (chhoti tables) - rows inhi se validate hoti hain.
+    """
+    return {
+        'amenities': set(Amenity.objects.values_list('id', flat=True)),
+        'certifications': set(Certification.objects.values_list('id', flat=True)),
+        'views': set(ViewType.objects.values_list('id', flat=True)),
+    }
+
+
+def _insert_batch(owner, rows):
+    """
+    rows = [(result dict, validated_data)]. Ek transaction: properties, fir har M2M field
+    ke through rows. Results mein slug bhar deta hai.
+    """
+    properties, tag_ids = [], []
+    for result, data in rows:
+        row_tags = {field_name: data.pop(field_name, []) for field_name in M2M_FIELDS}
+        # Naye listings admin ke approval ka intezaar karte hain
+        property_obj = Property(owner=owner, status=Property.PropertyStatus.PENDING, **data)
+        # bulk_create save() nahi chalata - jo save()/signals karte, woh yahin
+        property_obj.set_coordinates()
+        for field_name, mask_field in tags.MASK_FIELDS.items():
+            setattr(property_obj, mask_field, tags.tags_mask(row_tags[field_name]))
+        properties.append(property_obj)
+        tag_ids.append(row_tags)
+
+    with transaction.atomic():
+        Property.objects.bulk_create(properties)
+        for field_name in M2M_FIELDS:
+            field = Property._meta.get_field(field_name)
+            through = field.remote_field.through
+            source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+            through.objects.bulk_create([
+                through(**{f'{source}_id': property_obj.pk, f'{target}_id': tag_id})
+                for property_obj, row_tags in zip(properties, tag_ids)
+                for tag_id in row_tags[field_name]
+            ])
+        # Pending properties public lists mein nahi hain, isliye reference caches nahi chhedte
+        search.index_properties([property_obj.pk for property_obj in properties])
+
+    for (result, _), property_obj in zip(rows, properties):
+        result.update(status='created', slug=str(property_obj.slug))
+
+
+def _flush(owner, results, valid):
+    if valid:
+        try:
+            _insert_batch(owner, valid)
+        except DatabaseError as error:
+            for result, _ in valid:
+                result.update(status='error', errors={'non_field_errors': [f'Database error: {error}']})
+    yield from results
+
+
+def import_properties(stream, format, owner, batch_size=BATCH_SIZE):
+    """
+    File ki har row ke liye {'row': n, 'status': 'created', 'slug': ...} ya
+    {'row': n, 'status': 'error', 'errors': {...}} yield karta hai.
+    Generator hai - batches tabhi likhe jate hain jab results padhe jayein.
+    """
+    # Ek hi serializer har row par - har row ke liye naya banane mein fields
+    # dobara banti hain, jo validation se kai guna mehenga hai
+    validator = PropertyImportRowSerializer(context={'tag_ids': known_tag_ids()})
+    results, valid = [], []
+    try:
+        for row_number, data in read_rows(stream, format):
+            result = {'row': row_number}
+            results.append(result)
+            if '__error__' in data:
+                result.update(status='error', errors={'non_field_errors': [data['__error__']]})
+            else:
+                try:
+                    valid.append((result, validator.run_validation(data)))
+                except ValidationError as error:
+                    result.update(status='error', errors=as_serializer_error(error))
+
+            if len(valid) >= batch_size or len(results) >= batch_size * 4:
+                yield from _flush(owner, results, valid)
+                results, valid = [], []
+    except (UnicodeDecodeError, csv.Error) as error:
+        # File aage padhi hi nahi ja sakti - ab tak ki rows likh kar ruk jate hain
+        yield from _flush(owner, results, valid)
+        yield {'row': None, 'status': 'error', 'errors': {'non_field_errors': [f'Could not read file: {error}']}}
+        return
+    yield from _flush(owner, results, valid)
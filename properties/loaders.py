@@ -0,0 +1,56 @@
+from django.db.models import Prefetch
+from reviews.models import Review
+from .models import PropertyImage
+
+# Property card (PropertyListSerializer) ke liye batch loading helpers.
+# Card ka saara related data (images, views, certifications, reviews + unke users)
+# page ke saare rows ke liye ek saath load hota hai, isliye queries ki ginti
+# rows ki ginti par depend nahi karti.
+
+
+def prefetch_property_cards(queryset, prefix='', fields=None):
+    """
+    Queryset par card ke prefetches laga deta hai - sirf unhi fields ke jo card mein banengi.
+
+    'prefix' tab dena hai jab card kisi aur model ke andar nested ho,
+    jaise Booking ke liye prefix='property__'.
+    'fields' card ki fields hain (PropertyListSerializer.resolve_fields(request));
+    na di hon to default card (bina reviews).
+    """
+    if prefix:
+        # Nested property ko JOIN se hi le aayein (alag query nahi)
+        queryset = queryset.select_related(prefix[:-2])
+    if fields is None:
+        # serializers.py khud is module ko import karta hai, isliye yahaan andar import
+        from .serializers import PropertyListSerializer
+        fields = PropertyListSerializer.resolve_fields()
+
+    lookups = []
+    if 'main_image' in fields or 'main_image_srcset' in fields:
+        # Pehli image hi 'main_image' hai, isliye id se order rakhein
+        lookups.append(Prefetch(f'{prefix}images', queryset=PropertyImage.objects.order_by('id')))
+    if 'views' in fields:
+        lookups.append(f'{prefix}views')
+    if 'certifications' in fields:
+        lookups.append(f'{prefix}certifications')
+    if 'reviews' in fields:
+        # ReviewListSerializer 'user' ki fields padhta hai, usey bhi saath mein lein
+        lookups.append(Prefetch(f'{prefix}reviews', queryset=Review.objects.select_related('user')))
+    return queryset.prefetch_related(*lookups)
+
+
+def get_wishlist_ids(context):
+    """
+    Logged-in user ki wishlist property IDs ka set (ek hi query).
+
+    Set serializer ke root context mein cache ho jata hai, isliye poore
+    page (ya nested cards) ke liye yeh query sirf ek baar chalti hai.
+    """
+    if 'wishlist_ids' not in context:
+        request = context.get('request')
+        user = getattr(request, 'user', None)
+        if user and user.is_authenticated:
+            context['wishlist_ids'] = set(user.wishlist.values_list('id', flat=True))
+        else:
+            context['wishlist_ids'] = set()
+    return context['wishlist_ids']
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from properties.models import Property
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    """
+    Purani properties ke google_maps_location se latitude/longitude/geohash bharta hai.
+    Default mein sirf wahi rows jinka geohash khaali hai; --all se sab dobara.
+    Usage: python manage.py backfill_coordinates [--all]
+    """
+    help = "Parse google_maps_location into latitude, longitude and geohash for existing properties."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Pehle se bhari rows bhi dobara nikalein.')
+
+    def handle(self, *args, **options):
+        queryset = Property.objects.exclude(google_maps_location__isnull=True).exclude(google_maps_location='')
+        if not options['all']:
+            queryset = queryset.filter(geohash='')
+
+        located = skipped = 0
+        batch = []
+        # Pehle list bana lete hain - jis table ko padh rahe hain usi ko update karna hai
+        for prop in list(queryset.only('id', 'google_maps_location')):
+            prop.set_coordinates()
+            if prop.geohash:
+                located += 1
+            else:
+                skipped += 1
+            batch.append(prop)
+            if len(batch) >= BATCH_SIZE:
+                # bulk_update save() nahi chalata, isliye updated_at/signals nahi chhedte
+                Property.objects.bulk_update(batch, ['latitude', 'longitude', 'geohash'])
+                batch = []
+        Property.objects.bulk_update(batch, ['latitude', 'longitude', 'geohash'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Coordinates set for {located} properties ({skipped} URLs had no coordinates)."
+        ))
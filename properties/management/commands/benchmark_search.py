@@ -0,0 +1,114 @@
+import datetime
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from properties.apis import PropertyListView
+from properties.filters import PropertySearchFilter
+from properties.models import Category, Property
+from properties import search
+from rest_framework.filters import SearchFilter
+from users.models import CustomUser
+
+CITIES = [
+    ('Jaipur', 'Rajasthan'), ('Udaipur', 'Rajasthan'), ('Lonavala', 'Maharashtra'),
+    ('Alibaug', 'Maharashtra'), ('Goa', 'Goa'), ('Manali', 'Himachal Pradesh'),
+    ('Shimla', 'Himachal Pradesh'), ('Coorg', 'Karnataka'), ('Munnar', 'Kerala'),
+    ('Rishikesh', 'Uttarakhand'),
+]
+WORDS = [
+    'green', 'valley', 'river', 'lake', 'hill', 'orchard', 'mango', 'palm', 'sunset',
+    'heritage', 'royal', 'cozy', 'pool', 'garden', 'organic', 'forest', 'meadow', 'spice',
+]
+QUERIES = ['jaipur', 'lake villa', 'goa pool', 'heritage', 'manali orchard cottage', 'mango']
+
+
+class Command(BaseCommand):
+    """
+    ?search= ke liye purane LIKE (icontains) path aur full-text index ka muqabla.
+    Saara data ek transaction mein banta hai aur aakhir mein rollback ho jata hai,
+    isliye DB par kuch nahi bachta.
+    Usage: python manage.py benchmark_search --rows 100000
+    """
+    help = "Benchmark the full-text property search against the LIKE SearchFilter path."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        rng = random.Random(42)
+
+        with transaction.atomic():
+            self.seed(rows, rng)
+            started = time.perf_counter()
+            if search.rebuild_search_index() is None:
+                raise CommandError("Full-text index is database par available nahi hai.")
+            self.stdout.write(f"Index build: {(time.perf_counter() - started) * 1000:.0f} ms for {rows} rows")
+
+            view = PropertyListView()
+            factory = APIRequestFactory()
+            self.stdout.write(
+                f"{'query':<26}{'matches':>9}{'LIKE page':>11}{'FTS page':>10}{'LIKE count':>12}{'FTS count':>11}  (ms)"
+            )
+            for text in QUERIES:
+                request = Request(factory.get('/properties/', {'search': text}))
+                view.request = request
+                like = SearchFilter().filter_queryset(request, view.get_queryset(), view)
+                ranked = PropertySearchFilter().filter_queryset(request, view.get_queryset(), view)
+                matched = search.filter_matches(view.get_queryset(), text)
+
+                # Page wahi ordering use karta hai jo KeysetPagination lagata hai
+                like_page = self.measure(lambda: list(like.order_by('-created_at', '-pk')[:20]), repeat)
+                fts_page = self.measure(lambda: list(ranked.order_by('-search_rank', '-pk')[:20]), repeat)
+                like_count = self.measure(like.count, repeat)
+                fts_count = self.measure(matched.count, repeat)
+                self.stdout.write(
+                    f"{text:<26}{matched.count():>9}{like_page:>11.1f}{fts_page:>10.1f}"
+                    f"{like_count:>12.1f}{fts_count:>11.1f}"
+                )
+
+            # Benchmark ka data DB mein nahi rehna chahiye
+            transaction.set_rollback(True)
+
+    def measure(self, run, repeat):
+        """
+        run() ka median time (ms). Har baar naya queryset clone hota hai, isliye cache nahi lagta.
+        """
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def seed(self, rows, rng):
+        owner = CustomUser.objects.create_user(
+            'benchmark-vendor@farmstay.invalid', None,
+            first_name='Bench', last_name='Mark', phone_number='benchmark', role='vendor',
+        )
+        categories = [Category.objects.get_or_create(name=name)[0] for name in ('Farm Stay', 'Luxury', 'Budget')]
+        batch = []
+        for i in range(rows):
+            city, state = rng.choice(CITIES)
+            batch.append(Property(
+                owner=owner,
+                title=' '.join(rng.sample(WORDS, 3)).title(),
+                property_type=rng.choice(Property.PropertyType.values),
+                category=rng.choice(categories),
+                status=Property.PropertyStatus.APPROVED,
+                state=state, city=city, area=f"{rng.choice(WORDS).title()} Nagar",
+                pin_code='000000',
+                short_description=' '.join(rng.sample(WORDS, 6)),
+                full_description='',
+                base_price=rng.randrange(2000, 30000),
+                check_in_time=datetime.time(12), check_out_time=datetime.time(11),
+            ))
+            if len(batch) == 5000:
+                Property.objects.bulk_create(batch)
+                batch = []
+        Property.objects.bulk_create(batch)
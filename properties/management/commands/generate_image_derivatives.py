@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import connections
+from properties import imaging
+from properties.models import PropertyImage
+from users.models import CustomUser
+
+# (queryset, image field, derivatives JSON field)
+TARGETS = (
+    (PropertyImage.objects.all(), 'image', 'derivatives'),
+    (CustomUser.objects.exclude(profile_picture=''), 'profile_picture', 'profile_picture_derivatives'),
+)
+
+
+class Command(BaseCommand):
+    """
+    Property images aur profile pictures ke derivatives (320/768/1600 JPEG + WebP) banata hai.
+    Default mein sirf woh images jinke derivatives nahi bane (ya purani image ke hain).
+    Usage: python manage.py generate_image_derivatives [--all] [--workers 4]
+    """
+    help = "Generate resized JPEG/WebP derivatives for property images and profile pictures."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Bane hue derivatives bhi dobara banayein.')
+        parser.add_argument('--workers', type=int, default=4, help='Kitne threads (default 4).')
+
+    def handle(self, *args, **options):
+        jobs = []
+        for queryset, field_name, derivatives_field in TARGETS:
+            rows = queryset.exclude(**{f'{field_name}__isnull': True}).values_list('pk', field_name, derivatives_field)
+            for pk, name, derivatives in rows.iterator():
+                if options['all'] or (derivatives or {}).get('source') != name:
+                    jobs.append((queryset.model._meta.label, pk, field_name, derivatives_field))
+
+        def run(job):
+            try:
+                imaging.generate(*job)
+                return None
+            except Exception as error:
+                return f'{job[0]} #{job[1]}: {error}'
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            failures = [failure for failure in executor.map(run, jobs) if failure]
+
+        for failure in failures:
+            self.stderr.write(failure)
+        self.stdout.write(self.style.SUCCESS(
+            f"Derivatives generated for {len(jobs) - len(failures)} images ({len(failures)} failed)."
+        ))
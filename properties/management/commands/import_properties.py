@@ -0,0 +1,48 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from properties import importer
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    """
+    CSV/JSONL file se ek vendor ki properties bulk mein banata hai (properties/importer.py).
+    Har row ka result --report file mein (JSON Lines); galat rows stderr par bhi.
+    Usage: python manage.py import_properties listings.csv --owner vendor@example.com [--report out.jsonl]
+    """
+    help = "Bulk import properties for a vendor from a CSV or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV ya JSONL file.')
+        parser.add_argument('--owner', required=True, help='Vendor ka email.')
+        parser.add_argument('--format', choices=importer.FORMATS, help='Default: file extension se.')
+        parser.add_argument('--report', help='Har row ka result is file mein (JSON Lines).')
+        parser.add_argument('--batch-size', type=int, default=importer.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            owner = CustomUser.objects.get(email=options['owner'], role='vendor')
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"No vendor with email {options['owner']}.")
+
+        format = options['format'] or importer.detect_format(options['path'])
+        if format is None:
+            raise CommandError('Could not tell the format from the file name, pass --format.')
+
+        counts = {'created': 0, 'error': 0}
+        report = open(options['report'], 'w') if options['report'] else None
+        try:
+            with open(options['path'], 'rb') as stream:
+                for result in importer.import_properties(stream, format, owner, options['batch_size']):
+                    counts[result['status']] += 1
+                    if report:
+                        report.write(json.dumps(result) + '\n')
+                    if result['status'] == 'error':
+                        self.stderr.write(f"Row {result['row']}: {json.dumps(result['errors'])}")
+        finally:
+            if report:
+                report.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {counts['created']} properties ({counts['error']} rows failed)."
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from properties.models import Property
+from properties.ratings import rebuild_rating_stats
+
+
+class Command(BaseCommand):
+    """
+    Property ke stored rating stats ko reviews table se dobara banata hai.
+    Usage: python manage.py rebuild_rating_stats [--slug <property-slug> ...]
+    """
+    help = "Rebuild rating_sum, rating_count, the 1-5 histogram, average_rating and is_guest_favourite for properties."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--slug',
+            action='append',
+            dest='slugs',
+            help='Sirf in properties ke stats banayein (kai baar de sakte hain).',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Property.objects.all()
+        if options['slugs']:
+            queryset = queryset.filter(slug__in=options['slugs'])
+
+        total = queryset.count()
+        rebuild_rating_stats(queryset)
+        self.stdout.write(self.style.SUCCESS(f"Rating stats rebuilt for {total} properties."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from properties.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """
+    Property full-text search index ko shuru se banata hai.
+    Usage: python manage.py rebuild_search_index
+    """
+    help = "Create (if needed) and fully rebuild the property full-text search index."
+
+    def handle(self, *args, **options):
+        total = rebuild_search_index()
+        if total is None:
+            raise CommandError(
+                "Is database par full-text index support nahi hai (SQLite FTS5 ya Postgres chahiye)."
+            )
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt for {total} properties."))
@@ -0,0 +1,24 @@
+import time
+from django.core.management.base import BaseCommand
+from properties.recommendations import TOP_K, rebuild_similar_properties
+
+
+class Command(BaseCommand):
+    """
+    "You may also like" ki SimilarProperty table dobara banata hai (properties/recommendations.py).
+    Periodic job hai - cron se chalayein (jaise raat mein ek baar); nayi approved properties
+    ki list agli run tak khaali rehti hai.
+    Usage: python manage.py rebuild_similar_properties [--top-k 12]
+    """
+    help = "Precompute the top-K similar properties for every approved property."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=TOP_K, help='Har property ke kitne padosi.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        properties, written = rebuild_similar_properties(top_k=options['top_k'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Similar properties rebuilt for {properties} properties ({written} rows) "
+            f"in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from properties.models import Property
+from properties.tags import rebuild_tag_masks
+
+
+class Command(BaseCommand):
+    """
+    amenity_mask, certification_mask aur view_mask ko M2M tables se dobara banata hai
+    (purani properties ka backfill bhi yahi hai).
+    Usage: python manage.py rebuild_tag_masks [--slug <property-slug> ...]
+    """
+    help = "Rebuild the amenity/certification/view bitmask columns from the M2M tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--slug',
+            action='append',
+            dest='slugs',
+            help='Sirf in properties ke masks banayein (kai baar de sakte hain).',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Property.objects.all()
+        if options['slugs']:
+            queryset = queryset.filter(slug__in=options['slugs'])
+
+        total = rebuild_tag_masks(queryset)
+        self.stdout.write(self.style.SUCCESS(f"Tag masks rebuilt for {total} properties."))
@@ -1,9 +1,24 @@
 from django.db import models
 from django.conf import settings # We'll use this to get your CustomUser model
 from django.utils.text import slugify
+from .fields import SearchDocumentField
+from . import geo, imaging
 import uuid
 
 
+# Review rating 1 se 5 tak hoti hai (Property ke histogram counters isi par bane hain)
+RATING_STARS = range(1, 6)
+
+# Property ke denormalized columns - sirf signals ke F()/queryset.update() se likhe jate hain
+# (properties/ratings.py, properties/tags.py). Existing property ka poora save() pehle inhe
+# DB se dobara padhta hai, warna purane instance ki value taaze counters par chadh jaati.
+DENORMALIZED_FIELDS = frozenset((
+    'amenity_mask', 'certification_mask', 'view_mask',
+    'rating_sum', 'rating_count', *(f'rating_{star}_count' for star in RATING_STARS),
+    'average_rating', 'is_guest_favourite',
+))
+
+
 #     Model 1: ViewType ---
 class ViewType(models.Model):
     """
@@ -103,6 +118,11 @@ class Property(models.Model):
     area = models.CharField(max_length=255)
     pin_code = models.CharField(max_length=6)
     google_maps_location = models.URLField(max_length=500, blank=True, null=True)
+    # google_maps_location se save par nikalte hain (properties/geo.py), haath se edit na karein
+    # 'backfill_coordinates' command purani properties ke liye inhe bhar deta hai
+    latitude = models.FloatField(blank=True, null=True, editable=False)
+    longitude = models.FloatField(blank=True, null=True, editable=False)
+    geohash = models.CharField(max_length=12, blank=True, default='', editable=False)
 
     # --- Description ---
     short_description = models.CharField(max_length=250)
@@ -127,6 +147,13 @@ class Property(models.Model):
         blank=True, 
         null=True
     )
+    # Itne guests tak base/weekend price; usse upar har guest har raat extra_guest_charge.
+    # Default 2 - purani listings (jinme yeh field thi hi nahi) bhi migration ke baad
+    # extra_guest_charge lagati hain
+    included_guests = models.PositiveIntegerField(
+        default=2,
+        help_text="Guests covered by the nightly price; each extra guest pays the extra guest charge"
+    )
 
     cleaning_fee = models.DecimalField(
         max_digits=8, 
@@ -163,10 +190,90 @@ class Property(models.Model):
     certifications = models.ManyToManyField(Certification, blank=True)
     views = models.ManyToManyField(ViewType, blank=True, related_name='properties')
 
+    # --- Tag Bitmasks (Denormalized) ---
+    # Upar ke teeno M2M ka bitmask (tag id N -> bit N-1), taaki 'saare tags chahiye'
+    # wala filter ek bitwise check ho (properties/tags.py). M2M badalte hi signals update karte hain.
+    amenity_mask = models.BigIntegerField(default=0, editable=False)
+    certification_mask = models.BigIntegerField(default=0, editable=False)
+    view_mask = models.BigIntegerField(default=0, editable=False)
+
+    # --- Rating Stats (Denormalized) ---
+    # Yeh fields 'reviews' app ke signals se update hoti hain (properties/ratings.py)
+    # Haath se edit na karein, 'rebuild_rating_stats' command inhe dobara bana deta hai
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    # Har star ki ginti (review summary ka 1-5 histogram)
+    rating_1_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_2_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_3_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_4_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_5_count = models.PositiveIntegerField(default=0, editable=False)
+    average_rating = models.FloatField(default=0, editable=False)
+    is_guest_favourite = models.BooleanField(default=False, editable=False)
+
     # --- Timestamps ---
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Public search ki har sorting (PropertyListView.ordering_fields) ke liye
+        # (status, field, id) index - keyset pagination isi par seek karta hai
+        indexes = [
+            models.Index(fields=['status', 'base_price', 'id'], name='property_status_price_idx'),
+            models.Index(fields=['status', 'average_rating', 'id'], name='property_status_rating_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='property_status_created_idx'),
+            # Radius / bounding-box search geohash prefix ranges par seek karta hai
+            models.Index(fields=['status', 'geohash'], name='property_status_geohash_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Load hui listing state yaad rakhein - isi se pata chalta hai ki destinations/areas
+        # ka cache saaf karna hai ya nahi (properties/signals.py)
+        instance._loaded_listing = instance.listing_state()
+        return instance
+
+    def listing_state(self):
+        """
+        Woh fields jo public destinations/areas lists mein dikhti hain.
+        (Deferred field ho to None, taaki uske liye extra query na chale)
+        """
+        return tuple(self.__dict__.get(field) for field in ('status', 'city', 'state', 'area'))
+
+    def rating_histogram(self):
+        """
+        {1: n, ..., 5: n} - stored counters se, koi query nahi.
+        """
+        return {star: getattr(self, f'rating_{star}_count') for star in RATING_STARS}
+
+    def set_coordinates(self):
+        """
+        google_maps_location se latitude, longitude aur geohash set karta hai (save nahi karta).
+        """
+        point = geo.parse_maps_location(self.google_maps_location)
+        if point is None:
+            self.latitude, self.longitude, self.geohash = None, None, ''
+        else:
+            self.latitude, self.longitude = point
+            self.geohash = geo.encode_geohash(*point)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            # Full save purane instance se ho sakta hai - counters/masks signals ne beech mein
+            # F() se badle honge, unhe DB se taaza le lein taaki purani value na likhi jaye
+            try:
+                self.refresh_from_db(fields=DENORMALIZED_FIELDS)
+            except Property.DoesNotExist:
+                # Row hat chuki - Django ki tarah save() insert karega
+                pass
+        if update_fields is None or 'google_maps_location' in update_fields:
+            self.set_coordinates()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'latitude', 'longitude', 'geohash'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.title
     
@@ -182,6 +289,24 @@ class PropertyImage(models.Model):
     )
     # The image file
     image = models.ImageField(upload_to='property_images/')
+    # Chhote JPEG/WebP versions ke paths (properties/imaging.py worker bharta hai)
+    derivatives = models.JSONField(default=dict, blank=True, editable=False)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Load hui file yaad rakhein - derivatives tabhi banein jab image badle (properties/imaging.py)
+        instance._loaded_image = imaging.loaded_name(instance, 'image')
+        return instance
+
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is None and not self._state.adding:
+            # Worker ne beech mein derivatives likhe honge - purana JSON wapas na likhein
+            try:
+                self.refresh_from_db(fields=['derivatives'])
+            except PropertyImage.DoesNotExist:
+                pass
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Image for {self.property.title}"
@@ -200,6 +325,55 @@ class BlackoutDate(models.Model):
     class Meta:
         # Ensures a property can't have the same date blacked out twice
         unique_together = ('property', 'date')
+        # Search ka availability filter date range se blackout wali properties nikalta hai
+        indexes = [
+            models.Index(fields=['date', 'property'], name='blackout_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"Blackout on {self.date} for {self.property.title}"
+
+
+# Model 8: PROPERTY SEARCH DOCUMENT
+# Property ka full-text index row. Yeh table Django nahi banata (managed=False),
+# 'properties/search.py' banata hai: SQLite par FTS5 virtual table, Postgres par tsvector + GIN.
+# Search ke waqt Property isse JOIN hoti hai (search_document__document__match=...).
+class PropertySearchDocument(models.Model):
+    property = models.OneToOneField(
+        Property,
+        on_delete=models.DO_NOTHING, # Index row ko signals hatate hain
+        primary_key=True,
+        db_column='rowid',
+        related_name='search_document'
+    )
+    document = SearchDocumentField()
+
+    class Meta:
+        managed = False
+        db_table = 'properties_property_search'
+
+
+# Model 9: SIMILAR PROPERTY
+# "You may also like": har approved property ke top-K milti-julti properties, rank ke kram mein.
+# Yeh rows 'rebuild_similar_properties' command (periodic job) banata hai
+# ('properties/recommendations.py'); detail page bas (property, rank) index se padhta hai.
+class SimilarProperty(models.Model):
+    property = models.ForeignKey(
+        Property,
+        on_delete=models.CASCADE,
+        related_name='similar_entries'
+    )
+    similar = models.ForeignKey(
+        Property,
+        on_delete=models.CASCADE,
+        related_name='recommended_in'
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        # (property, rank) - ek property ki list ek index range read hai
+        unique_together = ('property', 'rank')
 
     def __str__(self):
-        return f"Blackout on {self.date} for {self.property.title}"
\ No newline at end of file
+        return f"{self.property_id} -> {self.similar_id} (#{self.rank})"
@@ -0,0 +1,90 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+# Admin ke bulk moderation endpoints (properties approve/reject, vendors approve,
+# reviews delete) ke saanjhe helpers. Request mein ya to 'items' (slugs/IDs ki list)
+# hote hain ya 'filter' (us endpoint ke FilterSet ki fields). Rows ek SELECT mein
+# (transaction ke andar, lock ke saath) chune jate hain, badlav ek UPDATE/DELETE mein
+# hota hai, aur response mein har item ka result aata hai.
+
+# Ek request mein zyada se zyada itne items (SQLite ki parameter limit se neeche).
+# Filter isse zyada rows se match kare to pehle MAX_ITEMS badalte hain aur 'more': true
+MAX_ITEMS = 500
+
+
+class BulkSelectionSerializer(serializers.Serializer):
+    """
+    {"items": ["slug-1", "slug-2"]}  ya  {"filter": {"status": "pending", "city": "Jaipur"}}
+    """
+    items = serializers.ListField(
+        child=serializers.CharField(), required=False, allow_empty=False, max_length=MAX_ITEMS
+    )
+    filter = serializers.DictField(required=False, allow_empty=False)
+
+    def validate(self, data):
+        if ('items' in data) == ('filter' in data):
+            raise serializers.ValidationError("Send either 'items' or 'filter'.")
+        return data
+
+
+def _normalize(field, item):
+    """
+    Item ko field ki asli value ke string roop mein (UUID case/format farq na pade).
+    Galat value ho to None.
+    """
+    try:
+        return str(field.to_python(item))
+    except DjangoValidationError:
+        return None
+
+
+def select_items(queryset, lookup, data, filterset_class, fields=()):
+    """
+    Bulk request ke rows: ek SELECT (pk, lookup, *fields), select_for_update ke saath -
+    caller ke transaction.atomic() ke andar bulayein.
+    Return (rows, missing, more):
+      rows    - values() dicts; 'items' diye the to unhi ke kram mein
+      missing - woh items jo mile nahi
+      more    - filter MAX_ITEMS se zyada rows se match karta hai
+    """
+    queryset = queryset.select_for_update().order_by('pk')
+    columns = ('pk', lookup, *fields)
+
+    if 'items' in data:
+        field = queryset.model._meta.get_field(lookup)
+        keys = {}
+        for item in data['items']:
+            keys.setdefault(item, _normalize(field, item))
+        valid = [key for key in keys.values() if key is not None]
+        found = {str(row[lookup]): row for row in queryset.filter(**{f'{lookup}__in': valid}).values(*columns)}
+        rows, missing, seen = [], [], set()
+        for item, key in keys.items():
+            if key not in found:
+                missing.append(item)
+            elif key not in seen:
+                seen.add(key)
+                rows.append(found[key])
+        return rows, missing, False
+
+    unknown = sorted(set(data['filter']) - set(filterset_class.base_filters))
+    if unknown:
+        # Galat naam wali key chupchaap hat jati to filter sab rows par lag jata
+        raise ValidationError({'filter': [f"Unknown filter: {', '.join(unknown)}."]})
+    filterset = filterset_class(data['filter'], queryset=queryset)
+    if not filterset.is_valid():
+        raise ValidationError({'filter': filterset.errors})
+    rows = list(filterset.qs.values(*columns)[:MAX_ITEMS + 1])
+    return rows[:MAX_ITEMS], [], len(rows) > MAX_ITEMS
+
+
+def bulk_response(lookup, results, missing, more):
+    """
+    results = [(row, result)] -> {'results': [{'item': ..., 'result': ...}], 'count': {...}, 'more': ...}
+    """
+    items = [{'item': str(row[lookup]), 'result': result} for row, result in results]
+    items += [{'item': item, 'result': 'not_found'} for item in missing]
+    count = {}
+    for item in items:
+        count[item['result']] = count.get(item['result'], 0) + 1
+    return {'results': items, 'count': count, 'more': more}
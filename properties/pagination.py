@@ -0,0 +1,130 @@
+import json
+from datetime import date, datetime
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import Cursor, CursorPagination
+from .filters import is_orderable
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination jo kisi bhi allowed ordering field par stable hai.
+
+    DRF ki CursorPagination barabar values par OFFSET ka sahara leti hai. Yahaan
+    cursor mein (field value, pk) dono hote hain aur agla page
+    WHERE (field, pk) > (value, pk) se aata hai - primary key tie todti hai,
+    isliye 100va page bhi pehle page jitna hi sasta hai (index seek, no OFFSET).
+
+    Ordering '?ordering=' (OrderingFilter ka param) se aati hai aur view ke
+    'ordering_fields' mein honi chahiye, warna default 'ordering' lagti hai.
+    Comma se di gayi multiple ordering mein sirf pehli field use hoti hai.
+    Ordering na di ho aur queryset par 'search_rank' (full-text relevance) ho,
+    to results relevance se sort hote hain; 'distance' (geo search) ho to paas wali pehle.
+    Annotation wali ordering (jaise 'distance') sirf tab chalti hai jab annotation maujood ho.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-created_at'
+    rank_field = 'search_rank'
+    distance_field = 'distance'
+
+    def get_ordering(self, request, queryset, view):
+        param = request.query_params.get(OrderingFilter.ordering_param, '')
+        term = param.split(',')[0].strip()
+        allowed = getattr(view, 'ordering_fields', None) or []
+        if term and term.lstrip('-') in allowed and is_orderable(queryset, term.lstrip('-')):
+            return (term,)
+        if self.rank_field in queryset.query.annotations:
+            return (f'-{self.rank_field}',)
+        if self.distance_field in queryset.query.annotations:
+            return (self.distance_field,)
+        return (self.ordering,)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.field = self.ordering[0].lstrip('-')
+        self.model = queryset.model
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, position = False, None
+        else:
+            reverse, position = self.cursor.reverse, self.cursor.position
+
+        # Descending ordering mein aage badhna = chhoti values ki taraf jana
+        # (previous page ke liye direction ulti ho jati hai)
+        descending = self.ordering[0].startswith('-') != reverse
+        if descending:
+            queryset = queryset.order_by(f'-{self.field}', '-pk')
+        else:
+            queryset = queryset.order_by(self.field, 'pk')
+
+        if position is not None:
+            value, pk = self.decode_position(position)
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value}) |
+                Q(**{self.field: value, f'pk__{lookup}': pk})
+            )
+
+        # Ek extra row lete hain taaki pata chale ki aage aur data hai ya nahi
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_previous = has_more
+            self.has_next = position is not None
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = Cursor(offset=0, reverse=False, position=self.encode_position(self.page[-1]))
+        return self.encode_cursor(cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        cursor = Cursor(offset=0, reverse=True, position=self.encode_position(self.page[0]))
+        return self.encode_cursor(cursor)
+
+    # --- Cursor position helpers ---
+
+    def encode_position(self, obj):
+        value = getattr(obj, self.field)
+        if isinstance(value, (datetime, date)):
+            # isoformat() microseconds ko nahi katta (tie-break ke liye zaroori)
+            value = value.isoformat()
+        elif isinstance(value, float):
+            value = repr(value)
+        else:
+            value = str(value)
+        return json.dumps([value, str(obj.pk)])
+
+    def decode_position(self, position):
+        try:
+            value, pk = json.loads(position)
+            try:
+                value = self.model._meta.get_field(self.field).to_python(value)
+            except FieldDoesNotExist:
+                # Annotated field (jaise search rank ya distance) - yeh hamesha number hoti hai
+                value = float(value)
+            pk = self.model._meta.pk.to_python(pk)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
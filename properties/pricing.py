@@ -0,0 +1,162 @@
+from collections import namedtuple
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from .models import Property
+
+# Property ka raat-dar-raat daam (quote, price calendar aur booking create - teeno yahin se).
+#   - Raat ka daam: weekday par base_price, weekend raat (Fri/Sat) par weekend_price (khaali ho to base)
+#   - included_guests se zyada har guest ke liye har raat extra_guest_charge
+#   - Ek baar cleaning_fee, aur raaton ke total par service_fee_percent
+# Daam sirf raat ke weekday par tikta hai, isliye har property ke 7 daam ek baar bante hain
+# aur lambi range (saal bhar) unhi se bharti hai; totals weekend raaton ki ginti se seedhe
+# nikalte hain, har raat par loop nahi. Kai properties ek query mein (load_rates).
+
+# date.weekday(): Friday = 4, Saturday = 5 (Sunday raat agle din kaam hai, woh weekday hai)
+WEEKEND_NIGHTS = frozenset((4, 5))
+
+# Ek quote/calendar mein zyada se zyada itni raatein
+MAX_NIGHTS = 366
+
+CENT = Decimal('0.01')
+
+RATE_FIELDS = (
+    'id', 'base_price', 'weekend_price', 'extra_guest_charge', 'included_guests',
+    'max_guests', 'cleaning_fee', 'service_fee_percent',
+)
+
+
+class PricingError(ValueError):
+    """
+    Stay ka daam nahi ban sakta (galat dates, guests max se zyada...). Message user ke liye hai.
+    """
+
+
+class Rates(namedtuple('Rates', (
+    'weekday', 'weekend', 'extra_guest', 'included_guests',
+    'max_guests', 'cleaning_fee', 'service_fee_percent',
+))):
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        Property object ya RATE_FIELDS wali values() dict se; khaali fields ke defaults yahin.
+        """
+        get = values.get if isinstance(values, dict) else lambda name: getattr(values, name)
+        base = Decimal(get('base_price'))
+        weekend = get('weekend_price')
+        max_guests = get('max_guests') or 1
+        return cls(
+            weekday=base,
+            weekend=base if weekend is None else Decimal(weekend),
+            extra_guest=Decimal(get('extra_guest_charge') or 0),
+            included_guests=min(get('included_guests'), max_guests),
+            max_guests=max_guests,
+            cleaning_fee=Decimal(get('cleaning_fee') or 0),
+            service_fee_percent=Decimal(get('service_fee_percent') or 0),
+        )
+
+    def extra_guests(self, guests):
+        return max(0, guests - self.included_guests)
+
+    def week(self, guests):
+        """
+        Weekday (0-6) -> us raat ka daam, 'guests' ke extra charge ke saath.
+        """
+        extra = self.extra_guest * self.extra_guests(guests)
+        return [
+            (self.weekend if weekday in WEEKEND_NIGHTS else self.weekday) + extra
+            for weekday in range(7)
+        ]
+
+
+def load_rates(property_ids):
+    """
+    {property id: Rates} - ek query.
+    """
+    return {
+        row['id']: Rates.from_values(row)
+        for row in Property.objects.filter(pk__in=property_ids).values(*RATE_FIELDS)
+    }
+
+
+def weekend_nights(check_in, nights):
+    """
+    check_in se shuru 'nights' raaton mein kitni weekend raatein (poore hafton mein 2-2, baaki gin kar).
+    """
+    weeks, remainder = divmod(nights, 7)
+    start = check_in.weekday()
+    return weeks * len(WEEKEND_NIGHTS) + sum(
+        1 for offset in range(remainder) if (start + offset) % 7 in WEEKEND_NIGHTS
+    )
+
+
+def _check_guests(rates, guests):
+    if guests < 1:
+        raise PricingError('At least one guest is required.')
+    if guests > rates.max_guests:
+        raise PricingError(f'This property allows at most {rates.max_guests} guests.')
+
+
+def quote(rates, check_in, check_out, guests=1):
+    """
+    Ek stay ka poora hisaab (Decimal, paise tak round):
+    {'nights', 'weekday_nights', 'weekend_nights', 'weekday_rate', 'weekend_rate',
+     'extra_guests', 'extra_guest_fee', 'nights_total', 'average_nightly',
+     'cleaning_fee', 'service_fee', 'total'}
+    """
+    nights = (check_out - check_in).days
+    if nights < 1:
+        raise PricingError('check-out date must be after check-in date.')
+    if nights > MAX_NIGHTS:
+        raise PricingError(f'A stay can be at most {MAX_NIGHTS} nights.')
+    _check_guests(rates, guests)
+
+    weekends = weekend_nights(check_in, nights)
+    weekdays = nights - weekends
+    extra_guests = rates.extra_guests(guests)
+    extra_guest_fee = rates.extra_guest * extra_guests * nights
+    nights_total = rates.weekday * weekdays + rates.weekend * weekends + extra_guest_fee
+    service_fee = (nights_total * rates.service_fee_percent / 100).quantize(CENT, ROUND_HALF_UP)
+    nights_total = nights_total.quantize(CENT, ROUND_HALF_UP)
+    cleaning_fee = rates.cleaning_fee.quantize(CENT, ROUND_HALF_UP)
+
+    return {
+        'nights': nights,
+        'weekday_nights': weekdays,
+        'weekend_nights': weekends,
+        'weekday_rate': rates.weekday,
+        'weekend_rate': rates.weekend,
+        'extra_guests': extra_guests,
+        'extra_guest_fee': extra_guest_fee.quantize(CENT, ROUND_HALF_UP),
+        'nights_total': nights_total,
+        'average_nightly': (nights_total / nights).quantize(CENT, ROUND_HALF_UP),
+        'cleaning_fee': cleaning_fee,
+        'service_fee': service_fee,
+        'total': nights_total + cleaning_fee + service_fee,
+    }
+
+
+def night_prices(rates_by_property, start, end, guests=1):
+    """
+    Kai properties ke [start, end) ki har raat ka daam, ek call mein:
+    {property id: [(date, price, is_weekend), ...]}
+    Dates aur weekdays sab properties ke liye ek hi baar bante hain.
+    guests kisi property ke max se zyada ho to woh property result mein nahi aati.
+    """
+    nights = (end - start).days
+    if nights < 1:
+        return {}
+    if nights > MAX_NIGHTS:
+        raise PricingError(f'At most {MAX_NIGHTS} nights can be priced at once.')
+
+    dates = [start + timedelta(days=offset) for offset in range(nights)]
+    weekdays = [night.weekday() for night in dates]
+    weekend_flags = [weekday in WEEKEND_NIGHTS for weekday in weekdays]
+
+    prices = {}
+    for property_id, rates in rates_by_property.items():
+        if guests > rates.max_guests:
+            continue
+        week = rates.week(guests)
+        prices[property_id] = list(zip(dates, [week[weekday] for weekday in weekdays], weekend_flags))
+    return prices
@@ -0,0 +1,82 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Greatest
+from .models import RATING_STARS, Property
+
+# Property ke denormalized rating stats (rating_sum, rating_count, rating_N_count histogram,
+# average_rating, is_guest_favourite) ko yahaan se sync kiya jata hai.
+# Review ke create/edit/delete par 'reviews/signals.py' isey call karta hai.
+
+# Is average (ya usse zyada) wali property ko 'Guest Favourite' badge milta hai.
+# (4.8 ko integer mein rakha hai taaki float compare ki galti na ho: sum*10 >= count*48)
+GUEST_FAVOURITE_MIN_RATING_X10 = 48
+
+
+def _derived_stats():
+    """
+    Stored sum/count se average_rating aur is_guest_favourite DB mein hi nikalta hai.
+    """
+    return {
+        'average_rating': Case(
+            When(rating_count__gt=0, then=Cast('rating_sum', FloatField()) / F('rating_count')),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+        'is_guest_favourite': Case(
+            When(
+                Q(rating_count__gt=0) &
+                Q(rating_sum__gte=F('rating_count') * GUEST_FAVOURITE_MIN_RATING_X10 / 10.0),
+                then=Value(True),
+            ),
+            default=Value(False),
+        ),
+    }
+
+
+def apply_rating_delta(property_id, sum_delta, count_delta, histogram=None):
+    """
+    Ek property ke stats mein sirf farq (delta) jodta hai - poora aggregate dobara nahi chalata.
+    F() expressions ka istemal hai, isliye do requests ek saath aayein to bhi count sahi rahega.
+    'histogram' star -> delta hai, jaise {4: -1, 5: 1} (rating 4 se 5 hui).
+    """
+    # Greatest(..., 0): agar stats kabhi build hi nahi hue the to minus mein na jayein
+    deltas = {
+        'rating_sum': Greatest(F('rating_sum') + sum_delta, 0),
+        'rating_count': Greatest(F('rating_count') + count_delta, 0),
+    }
+    for star, delta in (histogram or {}).items():
+        if delta:
+            field = f'rating_{star}_count'
+            deltas[field] = Greatest(F(field) + delta, 0)
+
+    with transaction.atomic():
+        queryset = Property.objects.filter(pk=property_id)
+        queryset.update(**deltas)
+        queryset.update(**_derived_stats())
+
+
+def rebuild_rating_stats(queryset=None):
+    """
+    Reviews table se stats ko shuru se dobara banata hai (2 UPDATE queries, chahe kitni bhi properties hon).
+    'rebuild_rating_stats' management command isi ko call karta hai.
+    """
+    if queryset is None:
+        queryset = Property.objects.all()
+
+    # 'reviews' app properties ko import karta hai, isliye yahaan model ko lazily lete hain
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(property=OuterRef('pk')).order_by().values('property')
+
+    with transaction.atomic():
+        queryset.update(
+            rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0),
+            rating_count=Coalesce(Subquery(reviews.annotate(total=Count('pk')).values('total')), 0),
+            **{
+                f'rating_{star}_count': Coalesce(
+                    Subquery(reviews.filter(rating=star).annotate(total=Count('pk')).values('total')), 0
+                )
+                for star in RATING_STARS
+            },
+        )
+        queryset.update(**_derived_stats())
@@ -0,0 +1,169 @@
+import math
+from collections import defaultdict
+import numpy as np
+from django.db import transaction
+from django.db.models import Q
+from .models import Property, SimilarProperty
+from .tags import MAX_TAG_ID
+
+# "You may also like" - har approved property ke top-K padosi pehle se (periodic job) nikal
+# kar SimilarProperty table mein; request par sirf ek indexed read.
+# Har property ek vector hai, kai blocks mein:
+#   amenities / views / certifications - tag bitmask columns se multi-hot (M2M join nahi)
+#   category, property_type, city, area - one-hot
+#   price band - log scale par band, bagal ke bands ko aadha wazan (thoda sasta/mehenga bhi milta-julta)
+# Har block apne aap mein unit length ka hai aur sqrt(weight) se guna, isliye do properties ka
+# dot product = blocks ki cosine similarity ka weighted average (0..1).
+# Padosi sirf usi state mein dhoondhe jate hain (wahin ghoomne wala hi dekhega), aur state ke
+# andar similarity BATCH_ROWS rows ke matrix multiply se - poori n x n matrix memory mein nahi.
+
+TOP_K = 12
+
+# Ek baar mein itni properties ki similarity row (BATCH_ROWS x state ki properties, float32)
+BATCH_ROWS = 1024
+
+WEIGHTS = {
+    'amenities': 1.0,
+    'views': 0.6,
+    'certifications': 0.4,
+    'category': 0.8,
+    'property_type': 0.8,
+    'price': 1.0,
+    'city': 0.8,
+    'area': 0.4,
+}
+
+# Purani rows itni property ids ke tukdon mein hatti hain (IN (...) ki parameter limit)
+DELETE_BATCH = 500
+
+# Price band ki chaudai: sqrt(2) guna (1000-1414, 1414-2000, ...)
+PRICE_BAND_RATIO = math.sqrt(2)
+
+VECTOR_FIELDS = (
+    'id', 'state', 'city', 'area', 'category_id', 'property_type', 'base_price',
+    'amenity_mask', 'view_mask', 'certification_mask',
+)
+
+MASK_BLOCKS = (
+    ('amenities', 'amenity_mask'),
+    ('views', 'view_mask'),
+    ('certifications', 'certification_mask'),
+)
+
+
+def _normalize_rows(block):
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    np.divide(block, norms, out=block, where=norms > 0)
+    return block
+
+
+def _mask_block(masks):
+    """
+    Bitmask column -> (n, 63) multi-hot; jo tag kisi property par nahi, uska column hata dete hain.
+    """
+    bits = (np.asarray(masks, dtype=np.int64)[:, None] >> np.arange(MAX_TAG_ID, dtype=np.int64)) & 1
+    bits = bits[:, bits.any(axis=0)]
+    return bits.astype(np.float32)
+
+
+def _one_hot(values):
+    lookup = {}
+    codes = [lookup.setdefault(value, len(lookup)) for value in values]
+    block = np.zeros((len(values), len(lookup)), dtype=np.float32)
+    block[np.arange(len(values)), codes] = 1
+    return block
+
+
+def _price_block(prices):
+    bands = np.floor(np.log(np.maximum(np.asarray(prices, dtype=np.float64), 1)) / math.log(PRICE_BAND_RATIO))
+    # Sabse sasta band 1 par, taaki uske dono bagal (band - 1, band + 1) matrix mein hon
+    bands = (bands - bands.min()).astype(np.int64) + 1
+    block = np.zeros((len(prices), int(bands.max()) + 2), dtype=np.float32)
+    rows = np.arange(len(prices))
+    block[rows, bands] = 1
+    block[rows, bands - 1] = 0.5
+    block[rows, bands + 1] = 0.5
+    return block
+
+
+def encode(rows):
+    """
+    VECTOR_FIELDS wali rows (ek state ki) -> (n, d) float32 matrix.
+    """
+    blocks = {
+        name: _mask_block([row[mask_field] for row in rows]) for name, mask_field in MASK_BLOCKS
+    }
+    blocks['category'] = _one_hot([row['category_id'] for row in rows])
+    blocks['property_type'] = _one_hot([row['property_type'] for row in rows])
+    blocks['city'] = _one_hot([row['city'].strip().lower() for row in rows])
+    blocks['area'] = _one_hot([(row['city'].strip().lower(), row['area'].strip().lower()) for row in rows])
+    blocks['price'] = _price_block([row['base_price'] for row in rows])
+
+    total = sum(WEIGHTS.values())
+    return np.hstack([
+        _normalize_rows(blocks[name]) * np.float32(math.sqrt(weight / total))
+        for name, weight in WEIGHTS.items()
+    ])
+
+
+def top_neighbours(vectors, top_k=TOP_K, batch_rows=BATCH_ROWS):
+    """
+    Har row ke top_k sabse milte rows (khud ko chhod kar): (indices, scores), dono (n, k),
+    score ke ghatte kram mein. k = min(top_k, n - 1).
+    """
+    n = len(vectors)
+    k = min(top_k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64), np.empty((n, 0), dtype=np.float32)
+
+    indices = np.empty((n, k), dtype=np.int64)
+    scores = np.empty((n, k), dtype=np.float32)
+    for start in range(0, n, batch_rows):
+        stop = min(start + batch_rows, n)
+        similarity = vectors[start:stop] @ vectors.T
+        rows = np.arange(stop - start)
+        similarity[rows, rows + start] = -np.inf
+        # Pehle bina sort ke top k (O(n)), fir sirf un k ko sort
+        candidates = np.argpartition(similarity, -k, axis=1)[:, -k:]
+        candidate_scores = np.take_along_axis(similarity, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind='stable')
+        indices[start:stop] = np.take_along_axis(candidates, order, axis=1)
+        scores[start:stop] = np.take_along_axis(candidate_scores, order, axis=1)
+    return indices, scores
+
+
+def approved_rows_by_state():
+    groups = defaultdict(list)
+    rows = Property.objects.filter(status=Property.PropertyStatus.APPROVED).values(*VECTOR_FIELDS)
+    for row in rows.iterator(chunk_size=2000):
+        groups[row['state'].strip().lower()].append(row)
+    return groups
+
+
+def rebuild_similar_properties(top_k=TOP_K, batch_size=2000):
+    """
+    Poori SimilarProperty table dobara banata hai. Har state ek transaction hai, isliye
+    padhne wale ko har waqt ya purani ya nayi poori list milti hai.
+    Return (properties, rows likhi gayi).
+    """
+    written = 0
+    groups = approved_rows_by_state()
+    for rows in groups.values():
+        ids = [row['id'] for row in rows]
+        indices, scores = top_neighbours(encode(rows), top_k)
+        entries = [
+            SimilarProperty(property_id=ids[row], similar_id=ids[neighbour], rank=rank, score=round(float(score), 4))
+            for row in range(len(rows))
+            for rank, (neighbour, score) in enumerate(zip(indices[row], scores[row]), start=1)
+        ]
+        with transaction.atomic():
+            for start in range(0, len(ids), DELETE_BATCH):
+                SimilarProperty.objects.filter(property_id__in=ids[start:start + DELETE_BATCH]).delete()
+            SimilarProperty.objects.bulk_create(entries, batch_size=batch_size)
+        written += len(entries)
+
+    # Jo properties ab approved nahi (ya state badal gayi aur list khaali hai) unki purani rows,
+    # aur jin rows ka padosi ab approved nahi (rows padhne ke baad, rebuild ke dauran unapprove hua)
+    approved = Property.PropertyStatus.APPROVED
+    SimilarProperty.objects.filter(~Q(property__status=approved) | ~Q(similar__status=approved)).delete()
+    return sum(len(rows) for rows in groups.values()), written
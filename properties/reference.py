@@ -0,0 +1,96 @@
+import hashlib
+import json
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+# Search page ka reference data (categories, amenities, destinations...) Django cache mein.
+# Har entry (data, etag) hai; model save/delete hone par 'properties/signals.py' entry
+# (commit ke baad) delete kar deta hai aur agli request use dobara bana deti hai.
+# ETag data ka hash hai, isliye client 'If-None-Match' bhej kar 304 pa sakta hai.
+
+CATEGORIES = 'categories'
+AMENITIES = 'amenities'
+CERTIFICATIONS = 'certifications'
+VIEW_TYPES = 'view-types'
+DESTINATIONS = 'destinations'
+AREAS = 'areas'
+
+# Signals miss ho jayein (jaise queryset.update()) to bhi data itni der mein taaza ho jata hai
+REFERENCE_TIMEOUT = 60 * 60 * 24
+
+KEY_PREFIX = 'properties:reference:'
+
+
+def make_etag(data):
+    """
+    Data ka strong ETag (same data -> same ETag, har process/server par).
+    """
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':'))
+    return '"%s"' % hashlib.sha1(body.encode()).hexdigest()
+
+
+def get_reference(name, build):
+    """
+    Cache se (data, etag); na ho to build() se bana kar cache mein rakhta hai.
+    """
+    key = KEY_PREFIX + name
+    entry = cache.get(key)
+    if entry is None:
+        data = build()
+        entry = (data, make_etag(data))
+        cache.set(key, entry, REFERENCE_TIMEOUT)
+    return entry
+
+
+def invalidate(*names):
+    """
+    Entries commit ke baad delete (transaction ke bahar ho to turant). Pehle delete karte to
+    commit se pehle aayi request purani rows dobara cache kar deti aur woh agle badlaav tak rehti.
+    """
+    keys = [KEY_PREFIX + name for name in names]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def is_not_modified(request, etag):
+    """
+    Client ke paas yahi version hai? (If-None-Match mein yeh ETag ya '*')
+    """
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return '*' in etags or etag in etags
+
+
+def etag_response(request, data, etag):
+    """
+    ETag ke saath response; client ka version same ho to bina body ke 304.
+    """
+    if is_not_modified(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+    response['ETag'] = etag
+    # Browser/CDN har baar server se revalidate karein (304 sasta hai)
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+class CachedReferenceMixin:
+    """
+    GET ko cache + ETag se serve karta hai. View 'reference_name' set kare aur,
+    agar generic list view nahi hai, to 'build_reference()' likhe.
+    """
+    reference_name = None
+
+    def build_reference(self):
+        # Generic list views ke liye: poora queryset serialize (pagination nahi hai)
+        return [dict(item) for item in self.get_serializer(self.get_queryset(), many=True).data]
+
+    def get(self, request, *args, **kwargs):
+        data, etag = get_reference(self.reference_name, self.build_reference)
+        return etag_response(request, data, etag)
@@ -0,0 +1,215 @@
+import re
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from .models import Category, Property, PropertySearchDocument
+
+# Property ke liye full-text search index (table: PropertySearchDocument).
+#   - SQLite: FTS5 virtual table (rowid = property id), bm25 se ranking
+#   - Postgres: (rowid, tsvector) side table + GIN index, ts_rank se ranking
+# Ranked search (search_properties) mein Property is table se JOIN hoti hai, isliye rank
+# ek hi pass mein aata hai; sirf ginti/facets ke liye filter_matches ka IN-subquery roop hai.
+# Index 'post_migrate' par banta hai, Property/Category save hone par signals
+# (properties/signals.py) isey update karte hain, aur 'rebuild_search_index'
+# command isey shuru se bana deta hai. Jis DB par index nahi hai wahan
+# PropertySearchFilter purane icontains (LIKE) path par chala jata hai.
+
+INDEX_TABLE = PropertySearchDocument._meta.db_table
+
+# Rank mein kis column ka kitna wazan hai (title sabse zyada)
+SQLITE_WEIGHTS = (10.0, 5.0, 3.0, 5.0, 3.0, 3.0, 1.0)
+
+# Ek statement mein kitni ids bhejein (SQLite ki parameter limit se kaafi neeche)
+BATCH_SIZE = 500
+
+_available = set()
+
+
+def ensure_search_index():
+    """
+    Index table banata hai (agar pehle se nahi hai). Index ban gaya to True.
+    """
+    property_table = Property._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE} USING fts5("
+                    "title, city, state, area, category, property_type, short_description, "
+                    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+                )
+            except Exception:
+                # SQLite FTS5 ke bina compile hua hai - LIKE search hi chalega
+                return False
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {INDEX_TABLE} ("
+                f"rowid bigint PRIMARY KEY REFERENCES {property_table}(id) ON DELETE CASCADE, "
+                "document tsvector NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {INDEX_TABLE}_gin ON {INDEX_TABLE} USING GIN (document)"
+            )
+        else:
+            return False
+    _available.add(connection.alias)
+    return True
+
+
+def index_available():
+    """
+    Kya is DB par search index bana hua hai? (Positive result process mein cache hota hai)
+    """
+    if connection.alias in _available:
+        return True
+    if INDEX_TABLE in connection.introspection.table_names():
+        _available.add(connection.alias)
+        return True
+    return False
+
+
+def _select_documents(where=''):
+    """
+    Property + Category se index ke rows nikalne wali SELECT (INSERT ... SELECT ke liye).
+    """
+    property_table = Property._meta.db_table
+    category_table = Category._meta.db_table
+    if connection.vendor == 'sqlite':
+        columns = (
+            "p.id, p.title, p.city, p.state, p.area, COALESCE(c.name, ''), "
+            "p.property_type, p.short_description"
+        )
+    else:
+        columns = (
+            "p.id, "
+            "setweight(to_tsvector('simple', p.title), 'A') || "
+            "setweight(to_tsvector('simple', p.city || ' ' || p.state || ' ' || p.area), 'B') || "
+            "setweight(to_tsvector('simple', COALESCE(c.name, '') || ' ' || p.property_type), 'B') || "
+            "setweight(to_tsvector('simple', p.short_description), 'C')"
+        )
+    return (
+        f"SELECT {columns} FROM {property_table} p "
+        f"LEFT JOIN {category_table} c ON c.id = p.category_id {where}"
+    )
+
+
+def _write(property_ids=None):
+    """
+    INSERT ... SELECT se index rows likhta hai ('property_ids' na ho to saari properties).
+    """
+    where, params = '', []
+    if property_ids is not None:
+        where = f"WHERE p.id IN ({', '.join(['%s'] * len(property_ids))})"
+        params = list(property_ids)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            # FTS5 mein UPSERT nahi hai: purane rows hatao, naye daalo
+            if property_ids is not None:
+                cursor.execute(f"DELETE FROM {INDEX_TABLE} {where.replace('p.id', 'rowid')}", params)
+            cursor.execute(
+                f"INSERT INTO {INDEX_TABLE} (rowid, title, city, state, area, category, "
+                f"property_type, short_description) {_select_documents(where)}",
+                params,
+            )
+        else:
+            cursor.execute(
+                f"INSERT INTO {INDEX_TABLE} (rowid, document) {_select_documents(where)} "
+                "ON CONFLICT (rowid) DO UPDATE SET document = EXCLUDED.document",
+                params,
+            )
+
+
+def index_properties(property_ids):
+    """
+    Di gayi properties ke index rows ko dobara likhta hai (har batch ek INSERT ... SELECT).
+    """
+    property_ids = list(property_ids)
+    if not property_ids or not index_available():
+        return
+    for start in range(0, len(property_ids), BATCH_SIZE):
+        _write(property_ids[start:start + BATCH_SIZE])
+
+
+def index_category(category_id):
+    """
+    Category ka naam badla -> uski saari properties ko reindex karein.
+    """
+    index_properties(Property.objects.filter(category_id=category_id).values_list('id', flat=True))
+
+
+def remove_properties(property_ids):
+    property_ids = list(property_ids)
+    if not property_ids or not index_available():
+        return
+    with connection.cursor() as cursor:
+        for start in range(0, len(property_ids), BATCH_SIZE):
+            batch = property_ids[start:start + BATCH_SIZE]
+            cursor.execute(
+                f"DELETE FROM {INDEX_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(batch))})", batch
+            )
+
+
+def rebuild_search_index():
+    """
+    Poora index shuru se banata hai. Index bana to indexed rows ki ginti, warna None.
+    """
+    if not ensure_search_index():
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {INDEX_TABLE}")
+    _write()
+    return Property.objects.count()
+
+
+def build_match_query(text):
+    """
+    User ke text ko safe full-text query mein badalta hai.
+    Har shabd prefix match hota hai aur saare shabd zaroori hain (AND), jaise
+    'goa vil' -> SQLite: "goa"* "vil"*  |  Postgres: goa:* & vil:*
+    """
+    terms = re.findall(r'\w+', text.lower())
+    if not terms:
+        return None
+    if connection.vendor == 'sqlite':
+        return ' '.join(f'"{term}"*' for term in terms)
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def search_properties(queryset, text):
+    """
+    Queryset ko index se JOIN karke full-text match se filter karta hai aur
+    'search_rank' annotate karta hai (zyada = behtar).
+    Query banane layak text na ho to None.
+    """
+    query = build_match_query(text)
+    if query is None:
+        return None
+
+    if connection.vendor == 'sqlite':
+        weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+        rank = RawSQL(f"-bm25({INDEX_TABLE}, {weights})", [])
+    else:
+        rank = RawSQL(f"ts_rank({INDEX_TABLE}.document, to_tsquery('simple', %s))", [query])
+
+    return queryset.filter(search_document__document__match=query).annotate(search_rank=rank)
+
+
+def filter_matches(queryset, text):
+    """
+    Sirf filter (bina rank) - 'id IN (index match)' subquery ke roop mein.
+    COUNT/GROUP BY jaisi queries ke liye yahi istemal karein: JOIN wale roop mein
+    SQLite planner status index se shuru karke har row par MATCH chala deta hai.
+    Query banane layak text na ho to None.
+    """
+    query = build_match_query(text)
+    if query is None:
+        return None
+    if connection.vendor == 'sqlite':
+        # FTS5 MATCH ke left mein table ka asli naam chahiye (ORM subquery alias 'U0' nahi chalta)
+        matches = RawSQL(f"SELECT rowid FROM {INDEX_TABLE} WHERE {INDEX_TABLE} MATCH %s", [query])
+    else:
+        matches = RawSQL(
+            f"SELECT rowid FROM {INDEX_TABLE} WHERE document @@ to_tsquery('simple', %s)", [query]
+        )
+    return queryset.filter(id__in=matches)
+
@@ -1,18 +1,62 @@
 #serializers file
 from rest_framework import serializers
 from .models import *
-from reviews.models import Review # Rating calculate karne ke liye
-from django.db.models import Avg # Average nikalne ke liye
+from reviews.models import Review
 from django.utils import timezone
 from datetime import timedelta
 from users.serializers import UserProfileSerializer, AdminUserListSerializer
 from users.models import CustomUser
 from reviews.serializers import ReviewListSerializer
+from .loaders import get_wishlist_ids
+from .imaging import CARD_WIDTH, best_url, build_srcset
+from django.db import transaction
+from uploads.models import Upload
+from uploads.serializers import FinishedUploadField, attach_upload, claim_uploads, validate_distinct
 
 
 
 # --- helper serializers ---
 
+def _param_list(request, name):
+    value = request.query_params.get(name, '') if request is not None else ''
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets: '?fields=id,title,main_image' se sirf yeh fields, aur
+    '?expand=reviews' se woh bhaari fields jo default mein band hain ('expandable_fields').
+    Sirf top-level serializer (ya list ke cards) par lagta hai; kisi aur ke andar
+    nested use (jaise Booking ke andar property card) hamesha default fields deta hai.
+    """
+    expandable_fields = ()
+
+    @classmethod
+    def resolve_fields(cls, request=None):
+        """
+        Is request ke liye kaun si fields banengi (views isi se tay karte hain ki kya prefetch karna hai).
+        """
+        available = list(cls.Meta.fields)
+        only = set(_param_list(request, 'fields'))
+        if only:
+            # Naam se maangi gayi expandable field bhi mil jati hai
+            return [name for name in available if name in only]
+        expand = set(_param_list(request, 'expand'))
+        return [name for name in available if name not in cls.expandable_fields or name in expand]
+
+    def _is_top_level(self):
+        parent = self.parent
+        if parent is None:
+            return True
+        return isinstance(parent, serializers.ListSerializer) and parent.parent is None
+
+    def get_field_names(self, declared_fields, info):
+        names = super().get_field_names(declared_fields, info)
+        request = self.context.get('request') if self._is_top_level() else None
+        allowed = set(self.resolve_fields(request))
+        return [name for name in names if name in allowed]
+
+
 class SimpleViewTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = ViewType
@@ -49,25 +93,35 @@ class AmenitySerializer(serializers.ModelSerializer):
 
 class PropertyImageSerializer(serializers.ModelSerializer):
     """
-    Sirf property ki image URL dikhane ke liye
+    Sirf property ki image URL dikhane ke liye.
+    'srcset' mein chhote JPEG/WebP versions ({'jpeg': {'320': url, ...}, 'webp': {...}}),
+    jab tak bane nahi tab tak null.
     """
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = PropertyImage
-        fields = ['id', 'image']
+        fields = ['id', 'image', 'srcset']
+
+    def get_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.image, obj.derivatives)
 
 
 # --- (MAIN) Serializer 1: List Serializer (Card ke liye) ---
 
-class PropertyListSerializer(serializers.ModelSerializer):
+class PropertyListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Property card (list view) ke liye serializer.
     Ismein kam data aur calculated data hoga.
+    Default card mein reviews ki jagah rating summary (average_rating, total_reviews) hai;
+    poore reviews '?expand=reviews' se milte hain. '?fields=' se sirf chuni hui fields.
     """
     
     # --- Calculated Fields (Jo model mein nahi hain) ---
     
-    # 1. Pehli Image (Main Image)
+    # 1. Pehli Image (Main Image) - card size ka derivative, saath mein uska srcset
     main_image = serializers.SerializerMethodField()
+    main_image_srcset = serializers.SerializerMethodField()
     
     # 2. Average Rating
     average_rating = serializers.SerializerMethodField()
@@ -81,6 +135,12 @@ class PropertyListSerializer(serializers.ModelSerializer):
     # 5. 'Wishlist' (Heart) Icon
     is_in_wishlist = serializers.SerializerMethodField()
 
+    # 6. Doori (km) - sirf ?lat=&lng= wali search mein, warna null
+    distance = serializers.SerializerMethodField()
+
+    # 7. Reviews ki ginti (stored counter, rating summary ka hissa)
+    total_reviews = serializers.IntegerField(source='rating_count', read_only=True)
+
     views = SimpleViewTypeSerializer(many=True, read_only=True)
     
     certifications = SimpleCertificationSerializer(many=True, read_only=True)
@@ -97,9 +157,10 @@ class PropertyListSerializer(serializers.ModelSerializer):
             'state',
             'base_price',
             'main_image',       # Calculated
+            'main_image_srcset', # Calculated
             'average_rating',   # Calculated
-            #'total_reviews',
-            'reviews',
+            'total_reviews',
+            'reviews',          # Sirf ?expand=reviews par
             'is_guest_favourite', # Calculated
             'bedrooms',
             'max_guests',
@@ -107,48 +168,56 @@ class PropertyListSerializer(serializers.ModelSerializer):
             'certifications',
             'is_new',           # Calculated
             'is_in_wishlist',   # Calculated
+            'distance',         # Calculated (geo search)
             'slug'
         ]
 
+    # Bhaari nested data, default card mein nahi
+    expandable_fields = ('reviews',)
+
     # --- In Calculated Fields ke functions ---
 
 
-    def get_main_image(self, obj):
+    def _first_image(self, obj):
         # 'obj' yahaan 'Property' model hai
-        first_image = obj.images.first() # PropertyImage model se pehli image
+        # images prefetch ho chuki hain (properties/loaders.py), isliye yahaan query nahi chalti
+        return next(iter(obj.images.all()), None) # PropertyImage model se pehli image
+
+    def get_main_image(self, obj):
+        first_image = self._first_image(obj)
         if first_image:
-            # Agar image hai, to uska URL bhejo
-            request = self.context.get('request')
-            return request.build_absolute_uri(first_image.image.url)
+            # Original ki jagah card size (768px) wala version; woh abhi nahi bana to original
+            return best_url(self.context.get('request'), first_image.image, first_image.derivatives, CARD_WIDTH)
         return None # Agar koi image nahi hai
 
+    def get_main_image_srcset(self, obj):
+        first_image = self._first_image(obj)
+        if first_image:
+            return build_srcset(self.context.get('request'), first_image.image, first_image.derivatives)
+        return None
+
     def get_average_rating(self, obj):
-        # 'reviews' (related_name) ka istemal karke average nikalo
-        avg = obj.reviews.aggregate(Avg('rating')).get('rating__avg')
-        if avg:
-            return round(avg, 2) # 4.888 ko 4.89 kar dega
-        return 0 # Agar koi review nahi hai
+        # Average ab Property par hi stored hai (reviews ke signals update karte hain)
+        # Isliye har card ke liye alag Avg query nahi chalti
+        return round(obj.average_rating, 2) # 4.888 ko 4.89 kar dega
 
     def get_is_guest_favourite(self, obj):
-        # 'average_rating' field yahaan available nahi hai, 
-        # isliye humein use dobara calculate karna hoga
-        avg_rating = self.get_average_rating(obj)
-        return avg_rating is not None and avg_rating >= 4.8
+        # Yeh flag bhi rating stats ke saath stored hai (avg >= 4.8)
+        return obj.is_guest_favourite
     
-#    def get_total_reviews(self, obj):
- #       # 'reviews' (related_name) ka istemal karke count nikalo
-  #      return obj.reviews.count()
-
     def get_is_new(self, obj):
         # Check karo agar property pichle 30 dino mein bani hai
         return obj.created_at > (timezone.now() - timedelta(days=30))
 
     def get_is_in_wishlist(self, obj):
-        user = self.context.get('request').user
-        if user and user.is_authenticated:
-            # Check karo ki yeh property 'user' ki 'wishlist' (jo model mein banayi thi) mein hai ya nahi
-            return user.wishlist.filter(id=obj.id).exists()
-        return False # Agar user login nahi hai
+        # User ki wishlist IDs ek baar load hoti hain (set), har card ke liye alag query nahi
+        # Login nahi hai to set khaali hoga
+        return obj.id in get_wishlist_ids(self.context)
+
+    def get_distance(self, obj):
+        # 'distance' annotation PropertyFilter ka radius filter lagata hai (properties/geo.py)
+        distance = getattr(obj, 'distance', None)
+        return round(distance, 2) if distance is not None else None
     
 
 class PropertyDetailSerializer(serializers.ModelSerializer):
@@ -178,8 +247,8 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
 
     category = SimpleCategorySerializer(read_only=True)
 
-    # Yeh 'Review' model ke related_name='reviews' ka istemal karega
-    reviews = ReviewListSerializer(many=True, read_only=True)
+    # Sirf sabse naye LATEST_REVIEWS reviews; baaki '/reviews/property/<slug>/' (paginated) se
+    reviews = serializers.SerializerMethodField()
     
     # --- Calculated Fields (Jo model mein nahi hain) ---
     
@@ -192,6 +261,11 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
     # 3. 'Wishlist' (Heart) Icon
     is_in_wishlist = serializers.SerializerMethodField()
 
+    # 4. Review summary: count, average aur 1-5 histogram (stored counters se)
+    review_summary = serializers.SerializerMethodField()
+
+    LATEST_REVIEWS = 5
+
     class Meta:
         model = Property
         # Hum 'Property' model se saari fields dikhayenge
@@ -199,7 +273,7 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
             'id', 'owner', 'title', 'property_type',
             'state', 'city', 'area', 'pin_code', 'google_maps_location',
             'short_description', 'full_description',
-            'base_price', 'weekend_price', 'extra_guest_charge',
+            'base_price', 'weekend_price', 'extra_guest_charge', 'included_guests',
             'cleaning_fee', 'service_fee_percent',
             'check_in_time', 'check_out_time',
             'bedrooms', 'bathrooms', 'max_guests',
@@ -213,26 +287,34 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
             'average_rating',   # Calculated
             'total_reviews',    # Calculated
             'is_in_wishlist',   # Calculated
+            'review_summary',   # Calculated
             'reviews','category',
         ]
         
     # --- In Calculated Fields ke functions ---
 
     def get_average_rating(self, obj):
-        avg = obj.reviews.aggregate(Avg('rating')).get('rating__avg')
-        if avg:
-            return round(avg, 2)
-        return 0
+        return round(obj.average_rating, 2)
 
     def get_total_reviews(self, obj):
-        # 'reviews' (related_name) ka istemal karke count nikalo
-        return obj.reviews.count()
+        # Stored counter (COUNT query ki zaroorat nahi)
+        return obj.rating_count
 
     def get_is_in_wishlist(self, obj):
-        user = self.context.get('request').user
-        if user and user.is_authenticated:
-            return user.wishlist.filter(id=obj.id).exists()
-        return False
+        return obj.id in get_wishlist_ids(self.context)
+
+    def get_review_summary(self, obj):
+        return {
+            'count': obj.rating_count,
+            'average': round(obj.average_rating, 2),
+            # JSON keys string hoti hain: {"1": 0, ..., "5": 12}
+            'histogram': {str(star): count for star, count in obj.rating_histogram().items()},
+        }
+
+    def get_reviews(self, obj):
+        # Ek query: naye pehle, user ke saath (review_property_created_idx index par)
+        latest = obj.reviews.select_related('user').order_by('-created_at', '-id')[:self.LATEST_REVIEWS]
+        return ReviewListSerializer(latest, many=True, context=self.context).data
     
 
 class WishlistListSerializer(serializers.ModelSerializer):
@@ -278,12 +360,15 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
         required=False # Zaroori nahi hai
     )
     
-    # 2. Images (List of Files)
+    # 2. Images (Poori ho chuki uploads ki IDs, uploads app se)
+    # Files ek badi multipart request mein nahi aati - pehle /uploads/ par chunks mein jati hain
     # Yeh field model mein nahi hai, ise hum 'create' method mein handle karenge
-    images = serializers.ListField(
-        child=serializers.ImageField(),
+    image_uploads = serializers.ListField(
+        child=FinishedUploadField(kind=Upload.Kind.IMAGE),
         write_only=True, # Yeh field sirf data lene ke liye hai, dikhane ke liye nahi
-        required=True
+        required=True,
+        allow_empty=False,
+        validators=[validate_distinct],
     )
 
     class Meta:
@@ -293,7 +378,7 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
             'title', 'property_type',
             'state', 'city', 'area', 'pin_code', 'google_maps_location',
             'short_description', 'full_description',
-            'base_price', 'weekend_price', 'extra_guest_charge',
+            'base_price', 'weekend_price', 'extra_guest_charge', 'included_guests',
             'cleaning_fee', 'service_fee_percent',
             'check_in_time', 'check_out_time',
             'bedrooms', 'bathrooms', 'max_guests',
@@ -302,17 +387,20 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
             'amenities', # IDs ki list
             'certifications',
             'views',
-            'images',     # Files ki list
+            'image_uploads',     # Upload IDs ki list
             'slug'
         ]
         
 
+    @transaction.atomic
     def create(self, validated_data):
         """
         Property banate waqt Images ko alag se handle karein
         """
-        # 1. 'images' data ko validated_data se nikal lein
-        images_data = validated_data.pop('images')
+        # 1. 'image_uploads' data ko validated_data se nikal lein
+        # (pehle hi 'used' mark - ek upload do properties mein na jaye)
+        uploads = validated_data.pop('image_uploads')
+        claim_uploads(uploads, 'image_uploads')
         
         # 2. 'amenities' data ko bhi nikal lein
         amenities_data = validated_data.pop('amenities', [])
@@ -335,13 +423,79 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
         # 9.
         property_obj.views.set(views_data)
 
-        # 10. Ab har image ke liye 'PropertyImage' object banayein
-        for image_data in images_data:
-            PropertyImage.objects.create(property=property_obj, image=image_data)
+        # 10. Ab har upload ke liye 'PropertyImage' object banayein
+        for upload in uploads:
+            attach_upload(upload, lambda file: PropertyImage.objects.create(property=property_obj, image=file))
             
         return property_obj
     
 
+class PropertyImportRowSerializer(PropertyCreateSerializer):
+    """
+    Bulk import (properties/importer.py) ki ek row. Rules PropertyCreateSerializer wale hi hain,
+    bas do farq: images import mein nahi aati (baad mein edit se 'image_uploads'), aur
+    amenities/certifications/views ki IDs har id par query ki jagah context['tag_ids']
+    ke sets se jaanchi jati hain (hazaron rows ke liye).
+    """
+    image_uploads = None
+
+    amenities = serializers.ListField(child=serializers.IntegerField(), required=False)
+    certifications = serializers.ListField(child=serializers.IntegerField(), required=False)
+    views = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    class Meta(PropertyCreateSerializer.Meta):
+        fields = [name for name in PropertyCreateSerializer.Meta.fields if name not in ('image_uploads', 'slug')]
+
+    def _known_ids(self, field_name, value):
+        known = self.context['tag_ids'][field_name]
+        for pk in value:
+            if pk not in known:
+                raise serializers.ValidationError(f'Invalid pk "{pk}" - object does not exist.')
+        return list(dict.fromkeys(value))
+
+    def validate_amenities(self, value):
+        return self._known_ids('amenities', value)
+
+    def validate_certifications(self, value):
+        return self._known_ids('certifications', value)
+
+    def validate_views(self, value):
+        return self._known_ids('views', value)
+
+
+class PropertyImportRequestSerializer(serializers.Serializer):
+    """
+    Bulk import ki CSV/JSONL file - pehle /uploads/ par (kind='data') upload ki gayi.
+    """
+    upload = FinishedUploadField(kind=Upload.Kind.DATA)
+
+
+class PropertyQuoteQuerySerializer(serializers.Serializer):
+    """
+    GET /properties/<slug>/quote/?check_in=2025-12-19&check_out=2025-12-22&guests=6
+    """
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+    guests = serializers.IntegerField(min_value=1, default=1)
+
+
+class PriceCalendarQuerySerializer(serializers.Serializer):
+    """
+    GET /properties/<slug>/prices/?month=2025-12&months=3&guests=6
+    """
+    month = serializers.DateField(input_formats=['%Y-%m'], required=False)
+    months = serializers.IntegerField(min_value=1, max_value=12, default=1)
+    guests = serializers.IntegerField(min_value=1, default=1)
+
+
+class AvailabilityCalendarQuerySerializer(serializers.Serializer):
+    """
+    GET /properties/<slug>/calendar/?month=2025-12&guests=6
+    """
+    month = serializers.DateField(input_formats=['%Y-%m'], required=False)
+    guests = serializers.IntegerField(min_value=1, default=1)
+
+
 class PropertyUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for updating (editing) an existing property.
@@ -365,10 +519,12 @@ class PropertyUpdateSerializer(serializers.ModelSerializer):
         required=False # Edit karte waqt zaroori nahi
     )
     
-    images = serializers.ListField(
-        child=serializers.ImageField(),
+    image_uploads = serializers.ListField(
+        child=FinishedUploadField(kind=Upload.Kind.IMAGE),
         write_only=True,
-        required=False # Edit karte waqt zaroori nahi
+        required=False, # Edit karte waqt zaroori nahi
+        allow_empty=False,
+        validators=[validate_distinct],
     )
 
     class Meta:
@@ -378,30 +534,32 @@ class PropertyUpdateSerializer(serializers.ModelSerializer):
             'title', 'property_type',
             'state', 'city', 'area', 'pin_code', 'google_maps_location',
             'short_description', 'full_description',
-            'base_price', 'weekend_price', 'extra_guest_charge',
+            'base_price', 'weekend_price', 'extra_guest_charge', 'included_guests',
             'cleaning_fee', 'service_fee_percent',
             'check_in_time', 'check_out_time',
             'bedrooms', 'bathrooms', 'max_guests',
             'amenities',
             'certifications',
             'views',
-            'images'
+            'image_uploads'
         ]
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         """
         Update karte waqt Images aur Amenities ko handle karein.
         """
         # 'instance' woh purani property hai jise hum edit kar rahe hain
         
-        # 1. Images (Agar nayi images aayi hain)
-        if 'images' in validated_data:
-            images_data = validated_data.pop('images')
+        # 1. Images (Agar nayi uploads aayi hain)
+        if 'image_uploads' in validated_data:
+            uploads = validated_data.pop('image_uploads')
+            claim_uploads(uploads, 'image_uploads')
             # Purani images delete karein (optional, lekin achha hai)
             instance.images.all().delete()
             # Nayi images create karein
-            for image_data in images_data:
-                PropertyImage.objects.create(property=instance, image=image_data)
+            for upload in uploads:
+                attach_upload(upload, lambda file: PropertyImage.objects.create(property=instance, image=file))
         
         # 2. Amenities (Agar nayi list aayi hai)
         if 'amenities' in validated_data:
@@ -0,0 +1,206 @@
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
+from django.db import transaction
+from django.dispatch import receiver
+from . import autocomplete, availability, detail, imaging, reference, search, tags
+from users.models import CustomUser
+from .models import Amenity, BlackoutDate, Category, Certification, Property, PropertyImage, ViewType
+
+
+# --- Full-text search index sync (properties/search.py) ---
+
+@receiver(post_save, sender=Property)
+def index_property_on_save(sender, instance, **kwargs):
+    search.index_properties([instance.pk])
+
+
+@receiver(post_delete, sender=Property)
+def remove_property_from_index(sender, instance, **kwargs):
+    search.remove_properties([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_properties(sender, instance, created, **kwargs):
+    # Nayi category par abhi koi property nahi hai
+    if not created:
+        search.index_category(instance.pk)
+
+
+# --- Tag bitmasks sync (properties/tags.py) ---
+
+def _tag_mask_sync(field_name):
+    mask_field = tags.MASK_FIELDS[field_name]
+
+    def sync_tag_mask(sender, instance, action, reverse, pk_set, **kwargs):
+        """
+        amenities/certifications/views M2M badla -> Property ka bitmask update karein.
+        (Serializers ke .set(), admin aur tag ki taraf se .add()/.remove() - sab yahin aate hain)
+        """
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+
+        if reverse:
+            # instance = tag, pk_set = property ids (clear par saari properties)
+            if action == 'post_add':
+                tags.add_tags(pk_set, field_name, [instance.pk])
+            else:
+                tags.remove_tags(None if action == 'post_clear' else pk_set, field_name, [instance.pk])
+            return
+
+        # instance = Property, pk_set = tag ids
+        if action == 'post_clear':
+            Property.objects.filter(pk=instance.pk).update(**{mask_field: 0})
+            mask = 0
+        elif action == 'post_add':
+            tags.add_tags([instance.pk], field_name, pk_set)
+            mask = getattr(instance, mask_field) | tags.tags_mask(pk_set)
+        else:
+            tags.remove_tags([instance.pk], field_name, pk_set)
+            mask = getattr(instance, mask_field) & ~tags.tags_mask(pk_set)
+        # Instance par bhi naya mask rakhein, warna baad wala save() purani value likh dega
+        setattr(instance, mask_field, mask)
+
+    return sync_tag_mask
+
+
+def _tag_bit_cleanup(field_name):
+    def clear_tag_bit(sender, instance, **kwargs):
+        # Delete hua tag kisi property ke mask mein na bache (SQLite par id dobara mil sakti hai)
+        tags.remove_tags(None, field_name, [instance.pk])
+    return clear_tag_bit
+
+
+for _model, _field_name in ((Amenity, 'amenities'), (Certification, 'certifications'), (ViewType, 'views')):
+    m2m_changed.connect(
+        _tag_mask_sync(_field_name),
+        sender=Property._meta.get_field(_field_name).remote_field.through,
+        weak=False,
+        dispatch_uid=f'sync_tag_mask_{_field_name}',
+    )
+    post_delete.connect(
+        _tag_bit_cleanup(_field_name), sender=_model, weak=False, dispatch_uid=f'clear_tag_bit_{_field_name}'
+    )
+
+
+# --- Reference data cache (properties/reference.py) ---
+
+def _reference_invalidator(*names):
+    def invalidate_reference(sender, **kwargs):
+        reference.invalidate(*names)
+    return invalidate_reference
+
+
+for _model, _name in (
+    (Category, reference.CATEGORIES),
+    (Amenity, reference.AMENITIES),
+    (Certification, reference.CERTIFICATIONS),
+    (ViewType, reference.VIEW_TYPES),
+):
+    for _signal in (post_save, post_delete):
+        _signal.connect(
+            _reference_invalidator(_name), sender=_model, weak=False,
+            dispatch_uid=f'invalidate_reference_{_name}_{_signal is post_save}',
+        )
+
+
+LISTING_REFERENCES = (reference.DESTINATIONS, reference.AREAS)
+
+
+@receiver(post_save, sender=Property)
+def invalidate_listing_references(sender, instance, created, **kwargs):
+    """
+    Destinations/areas sirf approved properties se bante hain, isliye cache tabhi saaf karein
+    jab approval status badle (ya approved property ki city/state/area badle).
+    Baaki har edit (price, description...) par cache bana rehta hai.
+    """
+    approved = Property.PropertyStatus.APPROVED
+    state = instance.listing_state()
+    loaded = getattr(instance, '_loaded_listing', None)
+
+    if created or loaded is None:
+        changed = instance.status == approved
+    else:
+        status_changed = loaded[0] != state[0]
+        location_changed = loaded[1:] != state[1:]
+        changed = status_changed or (instance.status == approved and location_changed)
+    if changed:
+        reference.invalidate(*LISTING_REFERENCES)
+
+    # Agli baar save hone par yahi 'purani' state hogi
+    instance._loaded_listing = state
+
+
+@receiver(post_delete, sender=Property)
+def invalidate_listing_references_on_delete(sender, instance, **kwargs):
+    if instance.status == Property.PropertyStatus.APPROVED:
+        reference.invalidate(*LISTING_REFERENCES)
+
+
+# --- Autocomplete index (properties/autocomplete.py) ---
+
+@receiver(post_save, sender=Property)
+def update_autocomplete_on_save(sender, instance, **kwargs):
+    # Commit ke baad - rollback hua to index mein kuch na jaye
+    transaction.on_commit(lambda: autocomplete.index.property_saved(instance))
+
+
+@receiver(post_delete, sender=Property)
+def update_autocomplete_on_delete(sender, instance, **kwargs):
+    property_id = instance.pk
+    transaction.on_commit(lambda: autocomplete.index.property_deleted(property_id))
+
+
+# --- Availability calendar (properties/availability.py) ---
+
+@receiver([post_save, post_delete], sender=BlackoutDate)
+def bump_calendar_on_blackout_change(sender, instance, **kwargs):
+    availability.bump_versions([instance.property_id])
+
+
+# --- Detail page version (properties/detail.py) ---
+
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def touch_property_on_image_change(sender, instance, **kwargs):
+    # Image badli -> detail page ka version (updated_at) badle
+    detail.touch_properties([instance.property_id])
+
+
+@receiver(post_save, sender=CustomUser)
+def touch_owner_properties(sender, instance, created, update_fields=None, **kwargs):
+    # Owner ki profile detail payload ka hissa hai. Login (sirf last_login) jaise saves par nahi.
+    if created or (update_fields is not None and not detail.OWNER_FIELDS.intersection(update_fields)):
+        return
+    detail.touch_related(owner_id=instance.pk)
+
+
+def _related_toucher(lookup):
+    def touch_related_properties(sender, instance, created=False, **kwargs):
+        # Naye category/tag par abhi koi property nahi. Delete par pre_delete - SET_NULL aur
+        # M2M rows hatne ke baad dhoondhne ko kuch nahi bachta.
+        if not created:
+            detail.touch_related(**{lookup: instance.pk})
+    return touch_related_properties
+
+
+for _model, _lookup in (
+    (Category, 'category_id'), (Amenity, 'amenities'), (Certification, 'certifications'), (ViewType, 'views'),
+):
+    for _signal in (post_save, pre_delete):
+        _signal.connect(
+            _related_toucher(_lookup), sender=_model, weak=False,
+            dispatch_uid=f'touch_detail_{_lookup}_{_signal is post_save}',
+        )
+
+
+# --- Image derivatives (properties/imaging.py) ---
+
+@receiver(post_save, sender=PropertyImage)
+def schedule_image_derivatives(sender, instance, **kwargs):
+    imaging.schedule(instance, 'image', 'derivatives')
+
+
+def create_search_index(sender, **kwargs):
+    """
+    'migrate' ke baad search index table bana dein (post_migrate handler).
+    """
+    search.ensure_search_index()
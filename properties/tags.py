@@ -0,0 +1,95 @@
+from functools import reduce
+from django.db.models import F
+from .models import Property
+
+# Amenities, certifications aur views ke liye Property par bitmask columns.
+# Tag ki id N ka bit (1 << (N - 1)) hai, isliye 'X, Y aur Z teeno chahiye'
+# ek hi bitwise predicate ban jata hai: (mask & XYZ) = XYZ - har tag ke liye M2M join nahi.
+# Masks 'properties/signals.py' (m2m_changed) se update hote hain aur
+# 'rebuild_tag_masks' command inhe M2M tables se dobara bana deta hai.
+
+# M2M field -> uska mask column
+MASK_FIELDS = {
+    'amenities': 'amenity_mask',
+    'certifications': 'certification_mask',
+    'views': 'view_mask',
+}
+
+# Signed BIGINT mein 63 bits: tag ids 1..63. Isse badi id wale tag ke liye
+# filter purane join par hi chalta hai (neeche filter_has_all dekhein).
+MAX_TAG_ID = 63
+
+BATCH_SIZE = 500
+
+
+def tag_bit(tag_id):
+    if 1 <= tag_id <= MAX_TAG_ID:
+        return 1 << (tag_id - 1)
+    return 0
+
+
+def tags_mask(tag_ids):
+    return reduce(lambda mask, tag_id: mask | tag_bit(tag_id), tag_ids, 0)
+
+
+def filter_has_all(queryset, field_name, tag_ids):
+    """
+    Woh properties jin par saare diye gaye tags lage hain (conjoined / AND).
+    """
+    mask_field = MASK_FIELDS[field_name]
+    mask = tags_mask(tag_ids)
+    if mask:
+        queryset = queryset.alias(**{f'{mask_field}_match': F(mask_field).bitand(mask)}).filter(
+            **{f'{mask_field}_match': mask}
+        )
+    for tag_id in tag_ids:
+        if not tag_bit(tag_id):
+            queryset = queryset.filter(**{field_name: tag_id})
+    return queryset
+
+
+def add_tags(property_ids, field_name, tag_ids):
+    mask = tags_mask(tag_ids)
+    if mask:
+        mask_field = MASK_FIELDS[field_name]
+        Property.objects.filter(pk__in=property_ids).update(**{mask_field: F(mask_field).bitor(mask)})
+
+
+def remove_tags(property_ids, field_name, tag_ids):
+    """
+    property_ids None ho to saari properties se (jaise tag delete hone par).
+    """
+    mask = tags_mask(tag_ids)
+    if mask:
+        mask_field = MASK_FIELDS[field_name]
+        queryset = Property.objects.all() if property_ids is None else Property.objects.filter(pk__in=property_ids)
+        queryset.update(**{mask_field: F(mask_field).bitand(~mask)})
+
+
+def rebuild_tag_masks(queryset=None):
+    """
+    Masks ko M2M tables se shuru se banata hai. Updated properties ki ginti deta hai.
+    """
+    if queryset is None:
+        queryset = Property.objects.all()
+    property_ids = list(queryset.values_list('id', flat=True))
+
+    for start in range(0, len(property_ids), BATCH_SIZE):
+        batch_ids = property_ids[start:start + BATCH_SIZE]
+        masks = {property_id: dict.fromkeys(MASK_FIELDS.values(), 0) for property_id in batch_ids}
+        for field_name, mask_field in MASK_FIELDS.items():
+            field = Property._meta.get_field(field_name)
+            through = field.remote_field.through
+            property_column, tag_column = field.m2m_column_name(), field.m2m_reverse_name()
+            rows = through.objects.filter(**{f'{property_column}__in': batch_ids}).values_list(
+                property_column, tag_column
+            )
+            for property_id, tag_id in rows:
+                masks[property_id][mask_field] |= tag_bit(tag_id)
+
+        # bulk_update save() nahi chalata, isliye updated_at/signals nahi chhedte
+        Property.objects.bulk_update(
+            [Property(id=property_id, **values) for property_id, values in masks.items()],
+            list(MASK_FIELDS.values()),
+        )
+    return len(property_ids)
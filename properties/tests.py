@@ -1,3 +1,280 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+import numpy as np
+from django.db import connection
 from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from users.models import CustomUser
+from .models import Amenity, Category, Property, SimilarProperty
+from . import search
+from .apis import PropertyFacetView, PropertyListView
+from .filters import PropertySearchFilter
+from .ratings import apply_rating_delta
+from .recommendations import encode, rebuild_similar_properties, top_neighbours
 
-# Create your tests here.
+
+def make_vendor(email='vendor@example.com'):
+    return CustomUser.objects.create_user(
+        email, 'pw', first_name='Test', last_name='Vendor', phone_number=email,
+        role='vendor', status='active', is_active=True,
+    )
+
+
+def make_property(owner, title='Farm', **fields):
+    values = dict(
+        owner=owner, title=title, property_type='farmhouse', status=Property.PropertyStatus.APPROVED,
+        state='Rajasthan', city='Jaipur', area='Amer', pin_code='302001',
+        short_description='s', full_description='f', base_price=Decimal('1000'),
+        check_in_time=datetime.time(12), check_out_time=datetime.time(11), max_guests=4,
+    )
+    values.update(fields)
+    return Property.objects.create(**values)
+
+
+class StalePropertySaveTests(TestCase):
+
+    def setUp(self):
+        self.property = make_property(make_vendor())
+
+    def test_full_save_of_stale_instance_keeps_rating_stats(self):
+        stale = Property.objects.get(pk=self.property.pk)
+        apply_rating_delta(self.property.pk, 5, 1, {5: 1})
+
+        stale.title = 'Renamed'
+        stale.save()
+
+        fresh = Property.objects.get(pk=self.property.pk)
+        self.assertEqual(fresh.title, 'Renamed')
+        self.assertEqual((fresh.rating_count, fresh.rating_sum, fresh.rating_5_count), (1, 5, 1))
+        self.assertEqual(fresh.average_rating, 5.0)
+
+    def test_full_save_of_stale_instance_keeps_tag_mask(self):
+        amenity = Amenity.objects.create(name='Pool')
+        stale = Property.objects.get(pk=self.property.pk)
+        Property.objects.get(pk=self.property.pk).amenities.add(amenity)
+
+        stale.save()
+
+        self.assertEqual(Property.objects.get(pk=self.property.pk).amenity_mask, 1 << (amenity.pk - 1))
+
+    def test_saving_a_deleted_row_inserts_it_again(self):
+        stale = Property.objects.get(pk=self.property.pk)
+        Property.objects.filter(pk=self.property.pk).delete()
+
+        stale.save()
+
+        self.assertTrue(Property.objects.filter(pk=self.property.pk).exists())
+
+
+class DetailETagTests(TestCase):
+    """
+    Payload mein dikhne wale related naam (owner, category, tags) badlein to ETag bhi badle.
+    """
+
+    def setUp(self):
+        self.vendor = make_vendor()
+        self.category = Category.objects.create(name='Farmhouse')
+        self.amenity = Amenity.objects.create(name='Pool')
+        self.property = make_property(self.vendor, category=self.category)
+        self.property.amenities.add(self.amenity)
+        self.client = APIClient()
+
+    def etag(self):
+        response = self.client.get(f'/properties/{self.property.slug}/')
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def assertETagChanges(self, change):
+        before = self.etag()
+        change()
+        self.assertNotEqual(before, self.etag())
+
+    def test_owner_rename(self):
+        def rename():
+            self.vendor.first_name = 'Renamed'
+            self.vendor.save()
+        self.assertETagChanges(rename)
+
+    def test_owner_login_keeps_etag(self):
+        before = self.etag()
+        self.vendor.save(update_fields=['last_login'])
+        self.assertEqual(before, self.etag())
+
+    def test_category_rename(self):
+        def rename():
+            self.category.name = 'Villa'
+            self.category.save()
+        self.assertETagChanges(rename)
+
+    def test_category_delete(self):
+        self.assertETagChanges(self.category.delete)
+
+    def test_amenity_rename(self):
+        def rename():
+            self.amenity.name = 'Swimming Pool'
+            self.amenity.save()
+        self.assertETagChanges(rename)
+
+    def test_amenity_delete(self):
+        self.assertETagChanges(self.amenity.delete)
+
+
+def vector_row(pk, city='Jaipur', area='Amer', price=1000, category=1, amenity_mask=0b11):
+    return {
+        'id': pk, 'state': 'Rajasthan', 'city': city, 'area': area, 'category_id': category,
+        'property_type': 'farmhouse', 'base_price': Decimal(price),
+        'amenity_mask': amenity_mask, 'view_mask': 0b1, 'certification_mask': 0b1,
+    }
+
+
+class RecommendationMathTests(TestCase):
+
+    def test_encode_gives_unit_vectors(self):
+        vectors = encode([vector_row(1), vector_row(2, city='Udaipur', price=9000, amenity_mask=0b100)])
+        self.assertEqual(vectors.dtype, np.float32)
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1, rtol=1e-5)
+
+    def test_encode_similarity_follows_shared_features(self):
+        vectors = encode([
+            vector_row(1),
+            vector_row(2),                                              # bilkul same
+            vector_row(3, price=1100),                                  # bagal wala price band
+            vector_row(4, city='Udaipur', area='Lake', price=20000, category=2, amenity_mask=0b1100),
+        ])
+        similarity = vectors @ vectors.T
+        self.assertAlmostEqual(float(similarity[0, 1]), 1, places=5)
+        self.assertGreater(similarity[0, 2], similarity[0, 3])
+        self.assertLess(similarity[0, 2], similarity[0, 1])
+
+    def test_top_neighbours_excludes_self_and_sorts(self):
+        vectors = encode([vector_row(1), vector_row(2), vector_row(3, price=1100), vector_row(4, city='Udaipur')])
+        indices, scores = top_neighbours(vectors, top_k=2)
+        self.assertEqual(indices.shape, (4, 2))
+        self.assertEqual(indices[0].tolist(), [1, 2])
+        for row in range(4):
+            self.assertNotIn(row, indices[row].tolist())
+            self.assertTrue(np.all(np.diff(scores[row]) <= 0))
+
+    def test_top_neighbours_batches_match_single_pass(self):
+        rng = np.random.default_rng(7)
+        vectors = rng.random((37, 8)).astype(np.float32)
+        whole = top_neighbours(vectors, top_k=5, batch_rows=1024)
+        batched = top_neighbours(vectors, top_k=5, batch_rows=4)
+        np.testing.assert_array_equal(whole[0], batched[0])
+        np.testing.assert_allclose(whole[1], batched[1])
+
+    def test_top_neighbours_small_inputs(self):
+        indices, scores = top_neighbours(encode([vector_row(1)]))
+        self.assertEqual((indices.shape, scores.shape), ((1, 0), (1, 0)))
+        indices, _ = top_neighbours(encode([vector_row(1), vector_row(2), vector_row(3)]), top_k=12)
+        self.assertEqual(indices.shape, (3, 2))
+
+
+class SimilarPropertiesTests(TestCase):
+
+    def setUp(self):
+        vendor = make_vendor()
+        self.farms = [make_property(vendor, f'Farm {number}') for number in range(3)]
+
+    def test_unapproved_neighbour_is_hidden_and_dropped_on_rebuild(self):
+        rebuild_similar_properties()
+        first, second, third = self.farms
+        # Padosi ka status seedha badla (save() signals ke bina) - list mein nahi dikhna chahiye
+        Property.objects.filter(pk=second.pk).update(status=Property.PropertyStatus.PENDING)
+
+        response = APIClient().get(f'/properties/{first.slug}/similar/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['slug'] for item in response.data], [str(third.slug)])
+
+        rebuild_similar_properties()
+        self.assertFalse(SimilarProperty.objects.filter(similar=second).exists())
+        self.assertFalse(SimilarProperty.objects.filter(property=second).exists())
+
+
+class SearchParityTests(TestCase):
+    """
+    FTS5 path aur purana icontains (LIKE) path - shabd ke shuru wale (prefix) queries par
+    dono ke results same. (LIKE beech-shabd bhi pakadta hai - 'pur' -> Jaipur - FTS nahi.)
+    """
+
+    QUERIES = (
+        'jai', 'jaipur', 'goa', 'goa vil', 'villa', 'farm', 'lake', 'pool', 'amer', 'rajasthan',
+        'sunset farm', 'hill', 'nothing', 'Lake View',
+    )
+
+    def setUp(self):
+        vendor = make_vendor()
+        villa = Category.objects.create(name='Villa')
+        make_property(vendor, 'Sunset Farm')
+        make_property(vendor, 'Lake View Retreat', city='Udaipur', area='Fateh Sagar', category=villa)
+        make_property(vendor, 'Beach House', state='Goa', city='Goa', area='Calangute', property_type='villa')
+        make_property(vendor, 'Hill Top', city='Jaipur', short_description='Private pool with hill views')
+        make_property(vendor, 'Goa Villa Stay', state='Goa', city='Panaji', area='Miramar')
+
+    def matches(self, view_class, text, full_text):
+        request = Request(APIRequestFactory().get('/properties/', {'search': text}))
+        view = view_class()
+        with mock.patch.object(search, 'index_available', return_value=full_text):
+            queryset = PropertySearchFilter().filter_queryset(request, Property.objects.all(), view)
+            return set(queryset.values_list('pk', flat=True))
+
+    def test_index_is_available_in_tests(self):
+        self.assertTrue(search.index_available())
+
+    def test_ranked_search_matches_fallback(self):
+        for text in self.QUERIES:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    self.matches(PropertyListView, text, True), self.matches(PropertyListView, text, False)
+                )
+
+    def test_unranked_filter_matches_fallback(self):
+        # Facets wala roop (search_ranked = False, IN-subquery)
+        for text in self.QUERIES:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    self.matches(PropertyFacetView, text, True), self.matches(PropertyFacetView, text, False)
+                )
+
+    def test_queries_find_something(self):
+        # Parity khaali results par na tike
+        self.assertEqual(len(self.matches(PropertyListView, 'goa', True)), 2)
+        self.assertEqual(len(self.matches(PropertyListView, 'pool', True)), 1)
+
+
+class SearchIndexSyncTests(TestCase):
+    """
+    properties/signals.py index ko Property/Category ke badlaav ke saath taaza rakhe.
+    """
+
+    def setUp(self):
+        self.category = Category.objects.create(name='Villa')
+        self.property = make_property(make_vendor(), 'Sunset Farm', category=self.category)
+
+    def found(self, text):
+        return list(search.search_properties(Property.objects.all(), text).values_list('pk', flat=True))
+
+    def test_new_property_is_indexed(self):
+        self.assertEqual(self.found('sunset'), [self.property.pk])
+
+    def test_edit_reindexes(self):
+        self.property.title = 'Moonlight Orchard'
+        self.property.save()
+        self.assertEqual(self.found('sunset'), [])
+        self.assertEqual(self.found('moonlight'), [self.property.pk])
+
+    def test_category_rename_reindexes(self):
+        self.category.name = 'Bungalow'
+        self.category.save()
+        self.assertEqual(self.found('villa'), [])
+        self.assertEqual(self.found('bungalow'), [self.property.pk])
+
+    def test_delete_removes_index_row(self):
+        property_id = self.property.pk
+        self.property.delete()
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {search.INDEX_TABLE} WHERE rowid = %s", [property_id])
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertEqual(self.found('sunset'), [])
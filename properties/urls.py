@@ -13,6 +13,9 @@ urlpatterns = [
     # POST /properties/create/ (Sirf Vendor)
     path('create/', PropertyCreateView.as_view(), name='property-create'),
 
+    # POST /properties/import/ (Sirf Vendor) - CSV/JSONL se bulk create
+    path('import/', PropertyImportView.as_view(), name='property-import'),
+
     # URL: /properties/categories/
     path('categories/', CategoryListView.as_view(), name='category-list'),
     
@@ -29,6 +32,12 @@ urlpatterns = [
     # URL: /properties/areas/
     path('areas/', AreaListView.as_view(), name='area-list'),
     
+    # GET /properties/facets/?city=...&amenities=... (Search filters ke live counts)
+    path('facets/', PropertyFacetView.as_view(), name='property-facets'),
+
+    # GET /properties/autocomplete/?q=jai (Search box suggestions)
+    path('autocomplete/', AutocompleteView.as_view(), name='property-autocomplete'),
+
     # URL: /properties/property-types/
     path('property-types/', PropertyTypeListView.as_view(), name='property-type-list'),
 
@@ -41,6 +50,18 @@ urlpatterns = [
     # GET, PUT, PATCH, DELETE /properties/my-new-property/manage/ (Sirf Maalik/Owner)
     path('<slug:slug>/manage/', PropertyManageView.as_view(), name='property-manage'),
     
+    # GET /properties/my-new-property/quote/?check_in=&check_out=&guests= (Public)
+    path('<slug:slug>/quote/', PropertyQuoteView.as_view(), name='property-quote'),
+
+    # GET /properties/my-new-property/prices/?month=2025-12 (Public)
+    path('<slug:slug>/prices/', PropertyPriceCalendarView.as_view(), name='property-price-calendar'),
+
+    # GET /properties/my-new-property/calendar/?month=2025-12 (Public) - har raat ka status aur daam
+    path('<slug:slug>/calendar/', PropertyAvailabilityCalendarView.as_view(), name='property-calendar'),
+
+    # GET /properties/my-new-property/similar/ (Public) - "You may also like"
+    path('<slug:slug>/similar/', SimilarPropertyListView.as_view(), name='property-similar'),
+
     # POST /properties/my-new-property/wishlist-toggle/ (Sirf Guest)
     path('<slug:slug>/wishlist-toggle/', ToggleWishlistView.as_view(), name='wishlist-toggle'),
 
@@ -48,6 +69,12 @@ urlpatterns = [
     # URL: /properties/admin/all/
     path('admin/all/', AdminPropertyListView.as_view(), name='admin-property-list'),
     
+    # POST /properties/admin/bulk-approve/  {"items": [slugs]} ya {"filter": {...}}
+    path('admin/bulk-approve/', AdminBulkPropertyStatusView.as_view(target_status=Property.PropertyStatus.APPROVED), name='admin-property-bulk-approve'),
+
+    # POST /properties/admin/bulk-reject/
+    path('admin/bulk-reject/', AdminBulkPropertyStatusView.as_view(target_status=Property.PropertyStatus.REJECTED), name='admin-property-bulk-reject'),
+
     # URL: /properties/admin/<slug>/approve/
     path('admin/<slug:slug>/approve/', AdminApprovePropertyView.as_view(), name='admin-property-approve'),
     
@@ -0,0 +1,19 @@
+import django_filters
+from .models import Review
+
+
+class AdminReviewBulkFilter(django_filters.FilterSet):
+    """
+    Admin bulk review delete ka 'filter' (properties/moderation.py).
+    Jaise {"property": "<slug>", "max_rating": 1} ya {"user": "<user slug>"}
+    """
+    property = django_filters.CharFilter(field_name='property__slug')
+    user = django_filters.CharFilter(field_name='user__slug')
+    min_rating = django_filters.NumberFilter(field_name='rating', lookup_expr='gte')
+    max_rating = django_filters.NumberFilter(field_name='rating', lookup_expr='lte')
+    created_after = django_filters.DateFilter(field_name='created_at', lookup_expr='date__gte')
+    created_before = django_filters.DateFilter(field_name='created_at', lookup_expr='date__lte')
+
+    class Meta:
+        model = Review
+        fields = ['property', 'user', 'min_rating', 'max_rating', 'created_after', 'created_before']
@@ -40,6 +40,18 @@ class Review(models.Model):
     class Meta:
         # Prevents a user from reviewing the same property more than once
         unique_together = ('user', 'property')
+        # Property ke reviews 'naye pehle' (cursor pagination aur detail ke latest reviews)
+        indexes = [
+            models.Index(fields=['property', 'created_at', 'id'], name='review_property_created_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Load hui rating yaad rakhein, taaki edit par Property stats mein sirf farq jode (reviews/signals.py)
+        instance._loaded_rating = instance.__dict__.get('rating')
+        instance._loaded_property_id = instance.__dict__.get('property_id')
+        return instance
 
     def __str__(self):
         return f"Review for {self.property.title} by {self.user.full_name} ({self.rating} stars)"
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from .models import *
 from users.models import CustomUser
+from properties.imaging import AVATAR_WIDTH, best_url
+from uploads.models import Upload
+from uploads.serializers import FinishedUploadField
 
 
 class ReviewListSerializer(serializers.ModelSerializer):
@@ -9,7 +12,8 @@ class ReviewListSerializer(serializers.ModelSerializer):
     '''
 
     user_name = serializers.CharField(source = 'user.full_name', read_only = True)
-    user_image = serializers.ImageField(source='users.profile_picture', read_only=True)
+    # Avatar chhota dikhta hai - original ki jagah 320px wala version (bana ho to)
+    user_image = serializers.SerializerMethodField()
     user_city = serializers.CharField(source='user.city',read_only=True)
 
     class Meta:
@@ -18,6 +22,10 @@ class ReviewListSerializer(serializers.ModelSerializer):
             'id','rating','comment','created_at','user_name','user_image','user_city'
         ]
 
+    def get_user_image(self, obj):
+        user = obj.user
+        return best_url(self.context.get('request'), user.profile_picture, user.profile_picture_derivatives, AVATAR_WIDTH)
+
 
 class ReviewCreateSerializer(serializers.ModelSerializer):
     '''
@@ -40,15 +48,15 @@ class VideoTestimonialCreateSerializer(serializers.ModelSerializer):
     """
     property_slug = serializers.SlugField(write_only=True)
 
+    # Video pehle /uploads/ par chunks mein upload hota hai; yahaan sirf poori upload ki id
+    video_upload = FinishedUploadField(kind=Upload.Kind.VIDEO, write_only=True)
+
     user_city = serializers.CharField(write_only=True, required=False)
     user_state = serializers.CharField(write_only=True, required=False)
     
     class Meta:
         model = VideoTestimonial
-        fields = ['property_slug', 'video_file', 'rating', 'user_city', 'user_state'] #'comment'
-        extra_kwargs = {
-            'video_file': {'required': False}
-        }
+        fields = ['property_slug', 'video_upload', 'rating', 'user_city', 'user_state'] #'comment'
 
     def validate_rating(self, value):
         if not (1 <= value <= 5):
@@ -0,0 +1,74 @@
+import threading
+from contextlib import contextmanager
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from properties.detail import touch_properties
+from properties.models import Property
+from properties.ratings import apply_rating_delta, rebuild_rating_stats
+from .models import Review
+
+# Bulk delete (AdminBulkDeleteReviewView) stats baad mein ek saath dobara banata hai - tab
+# har row ka delete delta nahi chalta. Thread-local, taaki doosri requests par asar na ho.
+_suspended = threading.local()
+
+
+@contextmanager
+def rating_sync_suspended():
+    """
+    Is block ke andar Review delete par rating stats/detail version update nahi hote -
+    caller baad mein rebuild_rating_stats aur touch_properties khud chalaye.
+    """
+    previous = getattr(_suspended, 'active', False)
+    _suspended.active = True
+    try:
+        yield
+    finally:
+        _suspended.active = previous
+
+
+@receiver(post_save, sender=Review)
+def sync_rating_stats_on_save(sender, instance, created, **kwargs):
+    """
+    Review bana ya edit hua -> Property ke rating stats update karein.
+    (API, AdminManageReviewView aur Django admin - sab yahin se guzarte hain)
+    """
+    if created:
+        apply_rating_delta(instance.property_id, instance.rating, 1, {instance.rating: 1})
+        touched = [instance.property_id]
+    else:
+        old_rating = getattr(instance, '_loaded_rating', None)
+        old_property_id = getattr(instance, '_loaded_property_id', None)
+        touched = [instance.property_id]
+
+        if old_rating is None or old_property_id is None:
+            # Purani value pata nahi hai (DB se load nahi hua tha), delta safe nahi hai
+            rebuild_rating_stats(Property.objects.filter(pk=instance.property_id))
+        elif old_property_id != instance.property_id:
+            # Review dusri property par shift hua
+            apply_rating_delta(old_property_id, -old_rating, -1, {old_rating: -1})
+            apply_rating_delta(instance.property_id, instance.rating, 1, {instance.rating: 1})
+            touched.append(old_property_id)
+        elif old_rating != instance.rating:
+            apply_rating_delta(
+                instance.property_id, instance.rating - old_rating, 0, {old_rating: -1, instance.rating: 1}
+            )
+
+    # Detail page ke 'latest reviews' badle - stats same reh sakte hain (ek 5* gaya, doosra
+    # 5* aaya; ya sirf comment badla), isliye version ke liye updated_at hamesha aage
+    touch_properties(touched)
+
+    # Agli baar save hone par yahi 'purani' value hogi
+    instance._loaded_rating = instance.rating
+    instance._loaded_property_id = instance.property_id
+
+
+@receiver(post_delete, sender=Review)
+def sync_rating_stats_on_delete(sender, instance, **kwargs):
+    """
+    Review delete hua (Admin ne ya cascade se) -> stats se uski rating hata dein.
+    """
+    if getattr(_suspended, 'active', False):
+        return
+    rating = getattr(instance, '_loaded_rating', None) or instance.rating
+    apply_rating_delta(instance.property_id, -rating, -1, {rating: -1})
+    touch_properties([instance.property_id])
@@ -1,3 +1,135 @@
+import datetime
+from decimal import Decimal
 from django.test import TestCase
+from rest_framework.test import APIClient
+from properties.models import RATING_STARS, Property
+from properties.ratings import rebuild_rating_stats
+from users.models import CustomUser
+from .models import Review
 
-# Create your tests here.
+STAT_FIELDS = (
+    'rating_sum', 'rating_count', *(f'rating_{star}_count' for star in RATING_STARS),
+    'average_rating', 'is_guest_favourite',
+)
+
+
+def make_user(email, role='guest'):
+    return CustomUser.objects.create_user(
+        email, 'pw', first_name='Test', last_name=role, phone_number=email,
+        role=role, status='active', is_active=True,
+    )
+
+
+def make_property(owner, title):
+    return Property.objects.create(
+        owner=owner, title=title, property_type='farmhouse', status=Property.PropertyStatus.APPROVED,
+        state='Rajasthan', city='Jaipur', area='Amer', pin_code='302001',
+        short_description='s', full_description='f', base_price=Decimal('1000'),
+        check_in_time=datetime.time(12), check_out_time=datetime.time(11), max_guests=4,
+    )
+
+
+class RatingStatsSyncTests(TestCase):
+    """
+    Har review path ke baad signals wale incremental stats == shuru se bane stats.
+    """
+
+    def setUp(self):
+        vendor = make_user('vendor@example.com', role='vendor')
+        self.first = make_property(vendor, 'First')
+        self.second = make_property(vendor, 'Second')
+        self.guests = [make_user(f'guest{number}@example.com') for number in range(4)]
+
+    def stored_stats(self):
+        return {row['pk']: row for row in Property.objects.order_by('pk').values('pk', *STAT_FIELDS)}
+
+    def assertStatsMatchRebuild(self):
+        incremental = self.stored_stats()
+        rebuild_rating_stats()
+        self.assertEqual(incremental, self.stored_stats())
+        return incremental
+
+    def review(self, guest, property_obj, rating):
+        return Review.objects.create(user=guest, property=property_obj, rating=rating, comment='c')
+
+    def test_create(self):
+        self.review(self.guests[0], self.first, 5)
+        self.review(self.guests[1], self.first, 3)
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual(stats[self.first.pk]['rating_count'], 2)
+        self.assertEqual(stats[self.first.pk]['rating_sum'], 8)
+
+    def test_rating_edit(self):
+        review = self.review(self.guests[0], self.first, 2)
+        review = Review.objects.get(pk=review.pk)
+        review.rating = 5
+        review.save()
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual((stats[self.first.pk]['rating_2_count'], stats[self.first.pk]['rating_5_count']), (0, 1))
+
+    def test_edit_of_instance_not_loaded_from_db(self):
+        review = self.review(self.guests[0], self.first, 2)
+        detached = Review(
+            pk=review.pk, user=self.guests[0], property=self.first, rating=4, comment='c', created_at=review.created_at,
+        )
+        detached.save(force_update=True)
+        self.assertStatsMatchRebuild()
+
+    def test_move_between_properties(self):
+        review = self.review(self.guests[0], self.first, 4)
+        self.review(self.guests[1], self.second, 5)
+        review = Review.objects.get(pk=review.pk)
+        review.property = self.second
+        review.rating = 1
+        review.save()
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual(stats[self.first.pk]['rating_count'], 0)
+        self.assertEqual(stats[self.second.pk]['rating_count'], 2)
+
+    def test_delete(self):
+        self.review(self.guests[0], self.first, 5)
+        review = self.review(self.guests[1], self.first, 1)
+        Review.objects.get(pk=review.pk).delete()
+        stats = self.assertStatsMatchRebuild()
+        self.assertTrue(stats[self.first.pk]['is_guest_favourite'])
+
+    def test_cascade_delete_of_user(self):
+        self.review(self.guests[0], self.first, 5)
+        self.review(self.guests[0], self.second, 2)
+        self.review(self.guests[1], self.second, 4)
+        self.guests[0].delete()
+        self.assertStatsMatchRebuild()
+
+    def test_bulk_delete(self):
+        admin = make_user('admin@example.com', role='admin')
+        doomed = [
+            self.review(self.guests[0], self.first, 5),
+            self.review(self.guests[1], self.second, 3),
+        ]
+        self.review(self.guests[2], self.first, 2)
+        self.review(self.guests[3], self.second, 4)
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.post(
+            '/reviews/admin/bulk-delete/', {'items': [str(review.pk) for review in doomed]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        stats = self.assertStatsMatchRebuild()
+        self.assertEqual((stats[self.first.pk]['rating_count'], stats[self.first.pk]['rating_sum']), (1, 2))
+        self.assertEqual((stats[self.second.pk]['rating_count'], stats[self.second.pk]['rating_sum']), (1, 4))
+
+    def test_single_delete_after_bulk_delete_still_applies_delta(self):
+        # Bulk delete ka suspend flag request ke baad khula na reh jaye
+        admin = make_user('admin@example.com', role='admin')
+        bulk = self.review(self.guests[0], self.first, 5)
+        single = self.review(self.guests[1], self.first, 3)
+        client = APIClient()
+        client.force_authenticate(admin)
+        client.post('/reviews/admin/bulk-delete/', {'items': [str(bulk.pk)]}, format='json')
+
+        Review.objects.get(pk=single.pk).delete()
+
+        self.assertEqual(Property.objects.get(pk=self.first.pk).rating_count, 0)
+        self.assertStatsMatchRebuild()
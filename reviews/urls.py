@@ -9,6 +9,8 @@ urlpatterns = [
     # --- Admin APIs ---
     # GET /reviews/admin/all/
     path('admin/all/', views.AdminReviewListView.as_view(), name='admin-review-list'),
+    # POST /reviews/admin/bulk-delete/  {"items": [ids]} ya {"filter": {...}}
+    path('admin/bulk-delete/', views.AdminBulkDeleteReviewView.as_view(), name='admin-review-bulk-delete'),
     # DELETE /reviews/admin/1/delete/
     path('admin/<uuid:id>/delete/', views.AdminManageReviewView.as_view(), name='admin-review-delete'),
 
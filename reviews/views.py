@@ -2,26 +2,38 @@ from rest_framework import generics, permissions, status , serializers
 from rest_framework.response import Response
 from .models import Review, VideoTestimonial
 from properties.models import Property
+from properties.pagination import KeysetPagination
 from .serializers import *
 from .permissions import HasCompletedBooking
 from users.permissions import IsAdminRole
 from rest_framework.views import APIView
 from django.utils.decorators import method_decorator # File upload krne liye
 from django.views.decorators.csrf import csrf_exempt
+from django.db import transaction
+from uploads.serializers import attach_upload, claim_uploads
+from properties.moderation import BulkSelectionSerializer, bulk_response, select_items
+from properties.detail import touch_properties
+from properties.ratings import rebuild_rating_stats
+from .filters import AdminReviewBulkFilter
+from .signals import rating_sync_suspended
+from drf_spectacular.utils import extend_schema, OpenApiTypes
 
 
 
 class PropertyReviewListView(generics.ListAPIView):
     '''
     API to list all the review for the particular specific property 
+    Naye reviews pehle, cursor pagination ke saath (?cursor=..., ?page_size=...)
+    (property, created_at, id) index par seek hota hai, OFFSET nahi
     '''
 
     serializer_class= ReviewListSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         slug = self.kwargs.get('slug')
-        return Review.objects.filter(property__slug=slug).order_by('-created_at')
+        return Review.objects.filter(property__slug=slug).select_related('user').order_by('-created_at')
     
 
 class ReviewCreateView(generics.CreateAPIView):
@@ -72,7 +84,7 @@ class VendorReviewListView(generics.ListAPIView):
     def get_queryset(self):
         user = self.request.user
         # Sirf woh reviews jo vendor ki properties par hain
-        return Review.objects.filter(property__owner=user).order_by('-created_at')
+        return Review.objects.filter(property__owner=user).select_related('user').order_by('-created_at')
     
 
 
@@ -81,7 +93,7 @@ class AdminReviewListView(generics.ListAPIView):
     """
     Admin ke liye: Platform ke saare reviews.
     """
-    queryset = Review.objects.all().order_by('-created_at')
+    queryset = Review.objects.select_related('user').order_by('-created_at')
     serializer_class = ReviewListSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminRole]
 
@@ -97,6 +109,36 @@ class AdminManageReviewView(generics.DestroyAPIView):
         
         
 
+class AdminBulkDeleteReviewView(APIView):
+    """
+    Admin ke liye: kai reviews ek saath delete karna.
+    POST {"items": [review ids]} ya {"filter": {...}} (AdminReviewBulkFilter).
+    Ek DELETE, fir jin properties ke reviews gaye unke rating stats ek hi baar dobara
+    bante hain (har review ke signal wala delta nahi). Result: 'deleted' ya 'not_found'.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminRole]
+
+    @extend_schema(request=BulkSelectionSerializer, responses={200: OpenApiTypes.OBJECT})
+    def post(self, request, *args, **kwargs):
+        serializer = BulkSelectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            rows, missing, more = select_items(
+                Review.objects.all(), 'id', serializer.validated_data, AdminReviewBulkFilter, fields=('property_id',)
+            )
+            # Per-row rating delta band - stats neeche saari affected properties ke liye ek saath bante hain
+            with rating_sync_suspended():
+                Review.objects.filter(pk__in=[row['pk'] for row in rows]).delete()
+            property_ids = {row['property_id'] for row in rows}
+            rebuild_rating_stats(Property.objects.filter(pk__in=property_ids))
+            # Latest reviews badle - detail version (updated_at) bhi aage
+            touch_properties(property_ids)
+
+        results = [(row, 'deleted') for row in rows]
+        return Response(bulk_response('id', results, missing, more), status=status.HTTP_200_OK)
+
+
 class ContactMessageCreateView(generics.CreateAPIView):
     """
     API to send a message via the contact form.
@@ -150,13 +192,10 @@ class VideoTestimonialCreateView(generics.CreateAPIView):
                 user.state = user_state
             user.save()
         
-        if 'video_file' not in self.request.FILES:
-            raise serializers.ValidationError({'video_file': 'Video file is required.'})
-
-        serializer.save(user=user,
-                        property=property_obj,
-                        video_file=self.request.FILES['video_file']
-                        )
+        upload = serializer.validated_data.pop('video_upload')
+        with transaction.atomic():
+            claim_uploads([upload], 'video_upload')
+            attach_upload(upload, lambda file: serializer.save(user=user, property=property_obj, video_file=file))
     
     # Media file upload ke liye zaroori
     @method_decorator(csrf_exempt)
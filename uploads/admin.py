@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import Upload
+
+
+@admin.register(Upload)
+class UploadAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'kind', 'filename', 'size', 'received_chunks', 'status', 'created_at')
+    list_filter = ('kind', 'status')
+    search_fields = ('filename', 'user__email')
+    readonly_fields = ('received_chunks', 'sha256', 'created_at', 'updated_at')
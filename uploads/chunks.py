@@ -0,0 +1,66 @@
+import hashlib
+import os
+from PIL import Image
+from .models import Upload
+
+# Chunk likhna aur aakhri jaanch (uploads/views.py se).
+
+# Request body ko itne-itne bytes mein padh kar disk par likhte hain
+BLOCK_SIZE = 64 * 1024
+
+# Har kind ke liye sabse badi file aur allowed extensions
+MAX_SIZE = {
+    Upload.Kind.IMAGE: 20 * 1024 * 1024,
+    Upload.Kind.VIDEO: 500 * 1024 * 1024,
+    Upload.Kind.DATA: 200 * 1024 * 1024,
+}
+EXTENSIONS = {
+    Upload.Kind.IMAGE: ('.jpg', '.jpeg', '.png', '.webp', '.gif'),
+    Upload.Kind.VIDEO: ('.mp4', '.mov', '.m4v', '.webm'),
+    Upload.Kind.DATA: ('.csv', '.jsonl', '.ndjson'),
+}
+
+
+def write_chunk(upload, index, stream):
+    """
+    Chunk ko stream se padh kar part file mein uski jagah (index * chunk_size) par likhta hai.
+    Poora chunk mila to True; beech mein connection toota to False (client wahi chunk dobara bheje).
+    """
+    expected = upload.chunk_length(index)
+    os.makedirs(os.path.dirname(upload.part_path), exist_ok=True)
+    # O_TRUNC nahi - pehle likhe chunks bane rehne chahiye
+    descriptor = os.open(upload.part_path, os.O_WRONLY | os.O_CREAT, 0o600)
+    written = 0
+    with os.fdopen(descriptor, 'wb') as part:
+        part.seek(index * upload.chunk_size)
+        while written < expected:
+            block = stream.read(min(BLOCK_SIZE, expected - written))
+            if not block:
+                break
+            part.write(block)
+            written += len(block)
+    return written == expected
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as part:
+        for block in iter(lambda: part.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_valid_image(path):
+    try:
+        with Image.open(path) as image:
+            image.verify()
+        return True
+    except Exception:
+        return False
+
+
+def discard_part(upload):
+    try:
+        os.remove(upload.part_path)
+    except FileNotFoundError:
+        pass
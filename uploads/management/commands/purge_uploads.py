@@ -0,0 +1,27 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from uploads.chunks import discard_part
+from uploads.models import Upload
+
+
+class Command(BaseCommand):
+    """
+    Purane uploads hatata hai: adhoore/kabhi istemal na hue (part file ke saath) aur
+    jude hue uploads ki bachi rows. Cron se chalayein.
+    Usage: python manage.py purge_uploads [--hours 24]
+    """
+    help = "Delete uploads (and their partial files) not touched for the given number of hours."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help='Itne ghante se na chhui uploads (default 24).')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = Upload.objects.filter(updated_at__lt=cutoff)
+        total = 0
+        for upload in stale.iterator():
+            discard_part(upload)
+            total += 1
+        stale.delete()
+        self.stdout.write(self.style.SUCCESS(f"Purged {total} uploads."))
@@ -0,0 +1,70 @@
+import os
+import uuid
+from django.conf import settings
+from django.core.files import File
+from django.db import models
+
+# Resumable (tukdon mein) uploads. Client pehle Upload banata hai (naam, size, sha256),
+# fir fixed-size chunks ek-ek karke PUT karta hai jo seedhe disk par (UPLOAD_TEMP_DIR) likhe
+# jate hain - poori file kabhi memory/ek request mein nahi hoti. Connection toot jaye to
+# GET se 'received_chunks' dekh kar wahin se aage bhejta hai. Aakhri step par sha256 milaya
+# jata hai; tab Upload 'complete' hota hai aur property/testimonial banate waqt uski id di jati hai.
+
+
+class Upload(models.Model):
+
+    class Kind(models.TextChoices):
+        IMAGE = 'image', 'Image'
+        VIDEO = 'video', 'Video'
+        DATA = 'data', 'Data file'     # CSV/JSONL (jaise property bulk import)
+
+    class Status(models.TextChoices):
+        UPLOADING = 'uploading', 'Uploading'
+        COMPLETE = 'complete', 'Complete'   # Digest mil gaya, istemal ke liye taiyar
+        USED = 'used', 'Used'               # Kisi property/testimonial se jud chuka
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='uploads')
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    # Shuru se lagatar kitne chunks likhe ja chuke hain (resume yahin se hota hai)
+    received_chunks = models.PositiveIntegerField(default=0)
+    sha256 = models.CharField(max_length=64)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.UPLOADING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.get_status_display()})"
+
+    @property
+    def total_chunks(self):
+        return max(1, -(-self.size // self.chunk_size))
+
+    def chunk_length(self, index):
+        """
+        Is chunk mein kitne bytes hone chahiye (aakhri chunk chhota ho sakta hai).
+        """
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+    @property
+    def part_path(self):
+        return os.path.join(settings.UPLOAD_TEMP_DIR, f'{self.pk}.part')
+
+    def open_file(self, path=None):
+        """
+        Poori hui file (ya 'path' par uski link/copy), model ki FileField mein assign karne
+        ke liye (naam original wala).
+        """
+        return AssembledFile(open(path or self.part_path, 'rb'), name=os.path.basename(self.filename))
+
+
+class AssembledFile(File):
+    """
+    Disk par jud chuki upload. 'temporary_file_path' hone se FileSystemStorage
+    ise copy karne ki jagah seedhe move kar deta hai (TemporaryUploadedFile jaisa).
+    """
+    def temporary_file_path(self):
+        return self.file.name
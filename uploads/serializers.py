@@ -0,0 +1,110 @@
+import os
+import shutil
+import uuid
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+from .chunks import EXTENSIONS, MAX_SIZE, discard_part
+from .models import Upload
+
+
+class UploadSerializer(serializers.ModelSerializer):
+    """
+    Upload shuru karna (kind, filename, size, sha256) aur uska status dikhana.
+    Response ke 'chunk_size' aur 'received_chunks' se client agla chunk tay karta hai.
+    """
+    total_chunks = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Upload
+        fields = [
+            'id', 'kind', 'filename', 'size', 'sha256',
+            'chunk_size', 'total_chunks', 'received_chunks', 'status', 'created_at',
+        ]
+        read_only_fields = ['id', 'chunk_size', 'received_chunks', 'status', 'created_at']
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if len(value) != 64 or any(char not in '0123456789abcdef' for char in value):
+            raise serializers.ValidationError("sha256 must be a 64 character hex digest.")
+        return value
+
+    def validate(self, data):
+        kind = data['kind']
+        if not data['filename'].lower().endswith(EXTENSIONS[kind]):
+            raise serializers.ValidationError(
+                {'filename': f"Allowed {kind} types: {', '.join(EXTENSIONS[kind])}"}
+            )
+        if not 0 < data['size'] <= MAX_SIZE[kind]:
+            raise serializers.ValidationError(
+                {'size': f"{kind.capitalize()} must be between 1 byte and {MAX_SIZE[kind] // (1024 * 1024)} MB."}
+            )
+        # Sirf naam rakhein, client ka path nahi
+        data['filename'] = os.path.basename(data['filename'].replace('\\', '/'))
+        return data
+
+    def create(self, validated_data):
+        validated_data['chunk_size'] = settings.UPLOAD_CHUNK_SIZE
+        return super().create(validated_data)
+
+
+class FinishedUploadField(serializers.PrimaryKeyRelatedField):
+    """
+    Poori (digest check ho chuki) upload ki id - sirf request karne wale user ki
+    aur diye gaye kind ki. Property/testimonial serializers file ki jagah yahi lete hain.
+    """
+    default_error_messages = {
+        'does_not_exist': 'Upload "{pk_value}" not found or not finished.',
+    }
+
+    def __init__(self, kind, **kwargs):
+        self.kind = kind
+        kwargs.setdefault('queryset', Upload.objects.all())
+        super().__init__(**kwargs)
+
+    def get_queryset(self):
+        request = self.context.get('request')
+        user = request.user if request is not None else None
+        return super().get_queryset().filter(
+            user_id=getattr(user, 'pk', None), kind=self.kind, status=Upload.Status.COMPLETE
+        )
+
+
+def validate_distinct(uploads):
+    if len({upload.pk for upload in uploads}) != len(uploads):
+        raise serializers.ValidationError("The same upload is listed more than once.")
+    return uploads
+
+
+def claim_uploads(uploads, field_name):
+    """
+    Uploads ko 'used' mark karta hai taaki ek file do jagah na jude.
+    Caller ke transaction ke andar bulayein - baad mein kuch fail ho to claim bhi wapas.
+    """
+    ids = {upload.pk for upload in uploads}
+    claimed = Upload.objects.filter(pk__in=ids, status=Upload.Status.COMPLETE).update(status=Upload.Status.USED)
+    if claimed != len(ids):
+        raise serializers.ValidationError({field_name: "Upload has already been used."})
+
+
+def attach_upload(upload, create):
+    """
+    Upload ki file se object banata hai: create(file). Storage ko part file ki hard link
+    (usi directory mein - koi copy nahi; link na bane to copy) di jati hai, jise woh move
+    kar leta hai. Asli part file caller ke commit ke baad hatti hai: transaction rollback ho
+    to upload COMPLETE rehti hai aur usi id se dobara try ho sakta hai.
+    """
+    attach_path = f'{upload.part_path}.{uuid.uuid4().hex}.attach'
+    try:
+        os.link(upload.part_path, attach_path)
+    except OSError:
+        shutil.copyfile(upload.part_path, attach_path)
+    try:
+        with upload.open_file(attach_path) as file:
+            obj = create(file)
+    finally:
+        # Storage ne move nahi kiya (copy karne wala backend, ya error) to link yahin hatayein
+        if os.path.exists(attach_path):
+            os.remove(attach_path)
+    transaction.on_commit(lambda: discard_part(upload))
+    return obj
@@ -0,0 +1,17 @@
+# uploads/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # POST /uploads/  - naya upload shuru
+    path('', views.UploadCreateView.as_view(), name='upload-create'),
+
+    # GET/DELETE /uploads/<id>/  - status (resume) / chhod dena
+    path('<uuid:id>/', views.UploadDetailView.as_view(), name='upload-detail'),
+
+    # PUT /uploads/<id>/chunks/<index>/  - ek chunk (raw bytes)
+    path('<uuid:id>/chunks/<int:index>/', views.UploadChunkView.as_view(), name='upload-chunk'),
+
+    # POST /uploads/<id>/complete/  - sha256 jaanch
+    path('<uuid:id>/complete/', views.UploadCompleteView.as_view(), name='upload-complete'),
+]
@@ -0,0 +1,120 @@
+from django.utils import timezone
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .chunks import discard_part, file_sha256, is_valid_image, write_chunk
+from .models import Upload
+from .serializers import UploadSerializer
+
+
+class UserUploadMixin:
+    """
+    User sirf apni uploads dekh/badal sakta hai (doosre ki id par 404).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_field = 'id'
+
+    def get_queryset(self):
+        return Upload.objects.filter(user=self.request.user)
+
+
+class UploadCreateView(UserUploadMixin, generics.CreateAPIView):
+    """
+    POST /uploads/  {kind, filename, size, sha256}
+    Naya upload shuru karta hai; response mein id aur chunk_size.
+    """
+    serializer_class = UploadSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class UploadDetailView(UserUploadMixin, generics.RetrieveDestroyAPIView):
+    """
+    GET: status aur 'received_chunks' (toote connection ke baad yahin se resume karein).
+    DELETE: adhoora upload chhod dena (part file bhi hat jati hai).
+    """
+    serializer_class = UploadSerializer
+
+    def perform_destroy(self, instance):
+        if instance.status == Upload.Status.USED:
+            # File ab kisi property/testimonial ki hai
+            return
+        discard_part(instance)
+        instance.delete()
+
+
+class UploadChunkView(UserUploadMixin, generics.GenericAPIView):
+    """
+    PUT /uploads/<id>/chunks/<index>/ - body mein sirf chunk ke raw bytes
+    (Content-Type: application/octet-stream). Body stream se seedhe disk par jati hai.
+    Chunks kram se aate hain: 'received_chunks' se aage wala chunk 409 deta hai,
+    pehle aa chuka chunk dobara bhejna theek hai (resume ke waqt).
+    """
+    serializer_class = UploadSerializer
+
+    def put(self, request, id, index):
+        upload = self.get_object()
+        if upload.status != Upload.Status.UPLOADING:
+            return Response({'error': 'Upload is already finished.'}, status=status.HTTP_409_CONFLICT)
+        if index >= upload.total_chunks:
+            return Response({'error': 'Chunk index out of range.'}, status=status.HTTP_400_BAD_REQUEST)
+        if index > upload.received_chunks:
+            return Response(
+                {'error': 'Chunks must be sent in order.', 'received_chunks': upload.received_chunks},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        expected = upload.chunk_length(index)
+        if int(request.META.get('CONTENT_LENGTH') or 0) != expected:
+            return Response(
+                {'error': f'Chunk {index} must be exactly {expected} bytes.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # request.data nahi - DRF parser poori body memory mein le leta; Django request khud stream hai
+        if not write_chunk(upload, index, request._request):
+            return Response(
+                {'error': 'Chunk was incomplete, send it again.', 'received_chunks': upload.received_chunks},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Do requests ek hi chunk bhejein to bhi ginti ek hi baar badhe
+        Upload.objects.filter(pk=upload.pk, received_chunks=index).update(
+            received_chunks=index + 1, updated_at=timezone.now()
+        )
+        upload.refresh_from_db()
+        return Response(self.get_serializer(upload).data)
+
+
+class UploadCompleteView(UserUploadMixin, generics.GenericAPIView):
+    """
+    POST /uploads/<id>/complete/ - saare chunks aa gaye to poori file ka sha256 milata hai.
+    Na mile to upload shuru se dobara karna hoga (received_chunks 0 ho jata hai).
+    """
+    serializer_class = UploadSerializer
+
+    def post(self, request, id):
+        upload = self.get_object()
+        if upload.status != Upload.Status.UPLOADING:
+            return Response(self.get_serializer(upload).data)
+        if upload.received_chunks < upload.total_chunks:
+            return Response(
+                {'error': 'Upload is missing chunks.', 'received_chunks': upload.received_chunks},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        error = None
+        if file_sha256(upload.part_path) != upload.sha256:
+            error = 'sha256 digest does not match the uploaded file.'
+        elif upload.kind == Upload.Kind.IMAGE and not is_valid_image(upload.part_path):
+            error = 'Upload a valid image.'
+        if error:
+            discard_part(upload)
+            upload.received_chunks = 0
+            upload.save(update_fields=['received_chunks', 'updated_at'])
+            return Response({'error': error, 'received_chunks': 0}, status=status.HTTP_400_BAD_REQUEST)
+
+        upload.status = Upload.Status.COMPLETE
+        upload.save(update_fields=['status', 'updated_at'])
+        return Response(self.get_serializer(upload).data)
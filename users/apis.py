@@ -8,8 +8,7 @@ from django.utils.http import urlsafe_base64_decode
 from django.utils.encoding import force_str
 from django.contrib.auth.tokens import default_token_generator
 from rest_framework_simplejwt.views import TokenObtainPairView
-from django.core.mail import send_mail
-from django.conf import settings
+from notifications import outbox
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -17,6 +16,12 @@ from .permissions import IsAdminRole
 from rest_framework import status
 from properties.models import Property
 from properties.serializers import PropertyListSerializer
+from properties.loaders import prefetch_property_cards
+from properties.detail import touch_properties
+from properties.moderation import BulkSelectionSerializer, bulk_response, select_items
+from .filters import AdminVendorBulkFilter
+from django.db import transaction
+from drf_spectacular.utils import extend_schema, OpenApiTypes
 from django.utils import timezone
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
@@ -117,10 +122,8 @@ class PasswordResetRequestView(generics.GenericAPIView):
         The Farmstay Team
         """
         
-        send_mail(
-            subject, message, settings.DEFAULT_FROM_EMAIL, [user.email],
-            fail_silently=False,
-        )
+        # Outbox mein - 'send_outbox' worker bhejta hai, response SMTP ka intezaar nahi karta
+        outbox.enqueue(subject, message, [user.email])
         
         return Response(
             {'message': 'If an account with this email exists, a password reset link has been sent.'},
@@ -254,6 +257,35 @@ class AdminApproveVendorView(APIView):
         vendor.save()
         return Response({'message': 'Vendor approved successfully.'}, status=status.HTTP_200_OK)
     
+class AdminBulkApproveVendorView(APIView):
+    """
+    Admin ke liye: kai pending vendors ek saath 'verified' karna.
+    POST {"items": [slugs]} ya {"filter": {...}} (AdminVendorBulkFilter).
+    Ek UPDATE; unki properties ka detail cache (owner ka status dikhta hai) ek UPDATE se purana.
+    Har item ka result: 'verified', 'unchanged' ya 'not_found' (vendor nahi hai).
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminRole]
+
+    @extend_schema(request=BulkSelectionSerializer, responses={200: OpenApiTypes.OBJECT})
+    def post(self, request, *args, **kwargs):
+        serializer = BulkSelectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        verified = CustomUser.Status.VERIFIED
+
+        with transaction.atomic():
+            rows, missing, more = select_items(
+                CustomUser.objects.filter(role='vendor'), 'slug', serializer.validated_data,
+                AdminVendorBulkFilter, fields=('status',),
+            )
+            changed_ids = [row['pk'] for row in rows if row['status'] != verified]
+            CustomUser.objects.filter(pk__in=changed_ids).update(status=verified)
+            touch_properties(Property.objects.filter(owner_id__in=changed_ids).values_list('id', flat=True))
+
+        changed_ids = set(changed_ids)
+        results = [(row, verified if row['pk'] in changed_ids else 'unchanged') for row in rows]
+        return Response(bulk_response('slug', results, missing, more), status=status.HTTP_200_OK)
+
+
 class AdminUserGrowthReportView(APIView):
     """
     Admin ke liye: 'User Growth Report' generate karna (date range ke sath).
@@ -329,7 +361,10 @@ class WishlistListView(generics.ListAPIView):
     def get_queryset(self):
         # Logged-in user ki 'wishlist' field se properties nikalna
         user = self.request.user
-        return user.wishlist.all().order_by('-created_at')
+        return prefetch_property_cards(
+            user.wishlist.all().order_by('-created_at'),
+            fields=PropertyListSerializer.resolve_fields(self.request),
+        )
 
     def get_serializer_context(self):
         # Wishlist serializer ko 'request' object pass karna zaroori hai
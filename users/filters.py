@@ -0,0 +1,17 @@
+import django_filters
+from .models import CustomUser
+
+
+class AdminVendorBulkFilter(django_filters.FilterSet):
+    """
+    Admin bulk vendor approve ka 'filter' (properties/moderation.py).
+    Jaise {"status": "pending", "joined_before": "2025-01-31"}
+    """
+    status = django_filters.ChoiceFilter(choices=CustomUser.Status.choices)
+    city = django_filters.CharFilter(lookup_expr='iexact')
+    joined_after = django_filters.DateFilter(field_name='date_joined', lookup_expr='date__gte')
+    joined_before = django_filters.DateFilter(field_name='date_joined', lookup_expr='date__lte')
+
+    class Meta:
+        model = CustomUser
+        fields = ['status', 'city', 'joined_after', 'joined_before']
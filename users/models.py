@@ -53,6 +53,12 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         ACTIVE = 'active', 'Active'
         VERIFIED = 'verified', 'Verified'
 
+    # --- New booking email choices (vendor) ---
+    class EmailMode(models.TextChoices):
+        INSTANT = 'instant', 'Instant'
+        HOURLY = 'hourly', 'Hourly digest'
+        DAILY = 'daily', 'Daily digest'
+
     # random unique slug field
     slug = models.SlugField(unique=True, blank=True, null=True)
 
@@ -91,9 +97,18 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     #profile picture field
     profile_picture = models.ImageField(upload_to='profile_pics/', null=True, blank=True)
+    # Profile picture ke chhote JPEG/WebP versions (properties/imaging.py)
+    profile_picture_derivatives = models.JSONField(default=dict, blank=True, editable=False)
 
     # (Yeh fields sirf Vendor role ke liye relevant hain)
     notify_new_bookings = models.BooleanField(default=True)
+    # Nayi booking ke emails: har booking par turant, ya ghante/din bhar ki ek digest email
+    # (notifications/digests.py)
+    new_booking_email_mode = models.CharField(
+        max_length=10,
+        choices=EmailMode.choices,
+        default=EmailMode.INSTANT
+    )
     notify_guest_messages = models.BooleanField(default=True)
     notify_cancellations = models.BooleanField(default=False)
 
@@ -125,7 +140,24 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
             while CustomUser.objects.filter(slug=random_slug).exists():
                 random_slug = generate_random_slug()
             self.slug = random_slug
+        if kwargs.get('update_fields') is None and not self._state.adding:
+            # Worker ne beech mein derivatives likhe honge (properties/imaging.py) - full save
+            # purane instance ka JSON wapas na likhe
+            try:
+                self.refresh_from_db(fields=['profile_picture_derivatives'])
+            except CustomUser.DoesNotExist:
+                pass
         super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Load hui picture yaad rakhein - derivatives tabhi banein jab picture badle
+        value = instance.__dict__.get('profile_picture')
+        instance._loaded_profile_picture = (
+            getattr(value, 'name', value) or '' if 'profile_picture' in instance.__dict__ else None
+        )
+        return instance
     
     @property
     def full_name(self):
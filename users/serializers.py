@@ -2,14 +2,15 @@ from rest_framework import serializers
 from .models import CustomUser
 
 # --- Imports for Email Verification ---
-from django.core.mail import send_mail
-from django.conf import settings
+from django.db import transaction
+from notifications import outbox
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.contrib.auth.tokens import default_token_generator
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from site_settings.models import SiteSettings
 from decouple import config
+from properties.imaging import build_srcset
 
 # -------------------------------------
 
@@ -51,18 +52,19 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         # 'password' ko alag se nikal lein
         password = validated_data.pop('password')
 
-        # User create karein
-        user = CustomUser.objects.create_user(password=password, **validated_data)
+        # User aur uske emails ek transaction mein - emails outbox se 'send_outbox' worker bhejta hai,
+        # registration SMTP ka intezaar nahi karta
+        with transaction.atomic():
+            # User create karein
+            user = CustomUser.objects.create_user(password=password, **validated_data)
 
-        # --- Email Bhejne ka Logic (UPDATED) ---
-        try:
-            # --- 1. User ko verification email bhejein (Pehle jaisa) ---
+            # --- 1. User ko verification email ---
             token = default_token_generator.make_token(user)
             uid = urlsafe_base64_encode(force_bytes(user.pk))
             verification_url = f"http://127.0.0.1:8000/api/auth/verify-email/{uid}/{token}/"
             subject = 'Verify your email for Farmstay'
             message = f"Hi {user.first_name},\n\nPlease click the link to verify your email:\n{verification_url}"
-            send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email])
+            outbox.enqueue(subject, message, [user.email])
 
             # --- For Admin Notificatio of updation ---
             settings_obj = SiteSettings.objects.first()
@@ -74,10 +76,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
                 # Admin ka email .env file se lein
                 admin_email = config('ADMIN_EMAIL', default=None)
                 if admin_email:
-                    send_mail(admin_subject, admin_message, settings.DEFAULT_FROM_EMAIL, [admin_email])
-
-        except Exception as e:
-            print(f"Error sending email: {e}")
+                    outbox.enqueue(admin_subject, admin_message, [admin_email])
 
         return user
 
@@ -161,6 +160,10 @@ class UserProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for displaying AND updating user profile details.
     """
+    profile_picture_srcset = serializers.SerializerMethodField()
+
+    def get_profile_picture_srcset(self, obj):
+        return build_srcset(self.context.get('request'), obj.profile_picture, obj.profile_picture_derivatives)
 
     def __init__(self, *args, **kwargs):
         # Pehle default __init__ ko run karein
@@ -172,7 +175,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
             if user and user.is_authenticated:
                 # Yeh fields define karein
-                vendor_fields = ['notify_new_bookings', 'notify_guest_messages', 'notify_cancellations']
+                vendor_fields = ['notify_new_bookings', 'new_booking_email_mode', 'notify_guest_messages', 'notify_cancellations']
                 guest_fields = ['notify_booking_confirmations', 'notify_promotional_offers', 'notify_account_activity']
 
                 if user.role == 'guest':
@@ -198,8 +201,10 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'role',              # Read-only
             'status',             # Read-only
             'profile_picture',
+            'profile_picture_srcset',   # Read-only (chhote JPEG/WebP versions)
             # Vendor notification fields
             'notify_new_bookings', 
+            'new_booking_email_mode',
             'notify_guest_messages', 
             'notify_cancellations',
             # USER notification fields
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from properties import imaging
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+def schedule_profile_picture_derivatives(sender, instance, **kwargs):
+    # Nayi/badli profile picture ke chhote versions background mein banein
+    imaging.schedule(instance, 'profile_picture', 'profile_picture_derivatives')
@@ -1,3 +1,57 @@
+from unittest import mock
 from django.test import TestCase
+from properties import imaging
+from .models import CustomUser
 
-# Create your tests here.
+
+def make_user(email='guest@example.com'):
+    return CustomUser.objects.create_user(
+        email, 'pw', first_name='Test', last_name='Guest', phone_number=email,
+        role='guest', status='active', is_active=True,
+    )
+
+
+class ProfilePictureDerivativesTests(TestCase):
+
+    def setUp(self):
+        self.user = make_user()
+        CustomUser.objects.filter(pk=self.user.pk).update(profile_picture='profile_pics/a.jpg')
+
+    def scheduled_jobs(self, save):
+        """
+        save() chala kar commit par worker pool ko gaye jobs lautata hai.
+        """
+        with mock.patch.object(imaging, 'get_executor') as executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                save()
+        return [call.args[1:] for call in executor.return_value.submit.call_args_list]
+
+    def test_save_without_picture_change_schedules_nothing(self):
+        # Derivatives abhi nahi bane, phir bhi naam wahi hai - har save par naya job nahi
+        user = CustomUser.objects.get(pk=self.user.pk)
+        user.first_name = 'Renamed'
+        self.assertEqual(self.scheduled_jobs(user.save), [])
+
+    def test_picture_change_schedules_once(self):
+        user = CustomUser.objects.get(pk=self.user.pk)
+        user.profile_picture = 'profile_pics/b.jpg'
+        self.assertEqual(
+            self.scheduled_jobs(user.save),
+            [('users.CustomUser', user.pk, 'profile_picture', 'profile_picture_derivatives')],
+        )
+        # Usi instance ka agla save dobara nahi bhejta
+        self.assertEqual(self.scheduled_jobs(user.save), [])
+
+    def test_stale_full_save_keeps_derivatives_written_meanwhile(self):
+        stale = CustomUser.objects.get(pk=self.user.pk)
+        derivatives = {'source': 'profile_pics/a.jpg', 'width': 320, 'jpeg': {}, 'webp': {}}
+        # Worker ka likhna (imaging.generate jaisa, source naam par keyed update)
+        CustomUser.objects.filter(pk=self.user.pk, profile_picture='profile_pics/a.jpg').update(
+            profile_picture_derivatives=derivatives
+        )
+
+        stale.first_name = 'Renamed'
+        self.assertEqual(self.scheduled_jobs(stale.save), [])
+
+        fresh = CustomUser.objects.get(pk=self.user.pk)
+        self.assertEqual((fresh.first_name, fresh.profile_picture_derivatives), ('Renamed', derivatives))
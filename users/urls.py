@@ -47,6 +47,9 @@ urlpatterns = [
     # URL: /users/admin/vendors/
     path('admin/vendors/', AdminVendorListView.as_view(), name='admin-vendor-list'),
     
+    # POST /users/admin/vendors/bulk-approve/  {"items": [slugs]} ya {"filter": {...}}
+    path('admin/vendors/bulk-approve/', AdminBulkApproveVendorView.as_view(), name='admin-vendor-bulk-approve'),
+
     # URL: /users/admin/vendors/<id>/approve/
     path('admin/vendors/<slug:slug>/approve/', AdminApproveVendorView.as_view(), name='admin-vendor-approve'),
     